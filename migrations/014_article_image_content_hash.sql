@@ -0,0 +1,11 @@
+-- Migration: Article Image Content Hash
+-- Version: 014
+-- Description: Store a content hash for uploaded article images (deduplication)
+
+SET search_path TO autoseo, public;
+
+ALTER TABLE article_images ADD COLUMN IF NOT EXISTS content_hash VARCHAR(100);
+
+CREATE INDEX IF NOT EXISTS idx_article_images_content_hash ON article_images(content_hash);
+
+COMMENT ON COLUMN article_images.content_hash IS 'Hash of the image bytes as <algorithm>:<hex digest> (blake3 or sha256)';
@@ -0,0 +1,9 @@
+-- Migration: Article Image Storage Path Index
+-- Version: 015
+-- Description: Index storage_path for reference counting of content-addressed images
+
+SET search_path TO autoseo, public;
+
+CREATE INDEX IF NOT EXISTS idx_article_images_storage_path ON article_images(storage_path);
+
+COMMENT ON COLUMN article_images.storage_path IS 'Content-addressed object key; shared by identical images across articles';
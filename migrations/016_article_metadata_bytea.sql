@@ -0,0 +1,19 @@
+-- Migration: Article Metadata as Bytes
+-- Version: 016
+-- Description: Store article generation metadata as orjson-encoded BYTEA; it is
+-- written once per generation and never filtered by JSON path. Skip this
+-- migration when running the content generator with METADATA_QUERYABLE=true.
+
+SET search_path TO autoseo, public;
+
+DO $$
+BEGIN
+    IF (SELECT data_type FROM information_schema.columns
+        WHERE table_schema = 'autoseo' AND table_name = 'articles' AND column_name = 'metadata') = 'jsonb' THEN
+        ALTER TABLE articles ALTER COLUMN metadata DROP DEFAULT;
+        ALTER TABLE articles ALTER COLUMN metadata TYPE BYTEA USING convert_to(metadata::text, 'UTF8');
+        ALTER TABLE articles ALTER COLUMN metadata SET DEFAULT convert_to('{}', 'UTF8');
+    END IF;
+END $$;
+
+COMMENT ON COLUMN articles.metadata IS 'Additional metadata about the generation process (orjson-encoded JSON)';
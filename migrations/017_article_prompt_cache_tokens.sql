@@ -0,0 +1,11 @@
+-- Migration: Article Prompt Cache Tokens
+-- Version: 017
+-- Description: Track prompt-cache usage per generated article, to measure cache hit rates
+
+SET search_path TO autoseo, public;
+
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS cached_input_tokens INTEGER;
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS cache_creation_tokens INTEGER;
+
+COMMENT ON COLUMN articles.cached_input_tokens IS 'Input tokens read from the LLM provider prompt cache';
+COMMENT ON COLUMN articles.cache_creation_tokens IS 'Input tokens written to the LLM provider prompt cache';
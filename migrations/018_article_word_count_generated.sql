@@ -0,0 +1,15 @@
+-- Migration: Article Word Count Generated Column
+-- Version: 018
+-- Description: Let PostgreSQL maintain articles.word_count from content instead of the application
+
+SET search_path TO autoseo, public;
+
+-- Words after removing markdown markup characters: the number of
+-- non-whitespace runs (matches app.models.article.count_words)
+ALTER TABLE articles DROP COLUMN IF EXISTS word_count;
+ALTER TABLE articles ADD COLUMN word_count INTEGER GENERATED ALWAYS AS (
+    length(regexp_replace(regexp_replace(content, '[#*`\[\]()]', '', 'g'), '\S+', 'x', 'g'))
+    - length(regexp_replace(regexp_replace(content, '[#*`\[\]()]', '', 'g'), '\S+', '', 'g'))
+) STORED;
+
+COMMENT ON COLUMN articles.word_count IS 'Words in content, maintained by PostgreSQL';
@@ -0,0 +1,11 @@
+-- Migration: Article Workspace Status Index
+-- Version: 019
+-- Description: Composite index for listing a workspace's articles by status, newest first
+
+SET search_path TO autoseo, public;
+
+-- Serves WHERE workspace_id = ? AND status = ? ORDER BY created_at DESC LIMIT n
+-- as an index range scan instead of a scan + sort of the workspace's rows.
+-- CONCURRENTLY avoids blocking writes; it cannot run inside a transaction.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_articles_workspace_status_created_at
+    ON articles(workspace_id, status, created_at DESC);
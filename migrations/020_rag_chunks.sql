@@ -0,0 +1,28 @@
+-- Migration: RAG Chunks
+-- Version: 020
+-- Description: Store RAG context chunks with pgvector embeddings and an HNSW index
+
+SET search_path TO autoseo, public;
+
+CREATE EXTENSION IF NOT EXISTS vector;
+
+CREATE TABLE IF NOT EXISTS rag_chunks (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    content TEXT NOT NULL,
+    source VARCHAR(500) NOT NULL DEFAULT 'unknown',
+    metadata JSONB NOT NULL DEFAULT '{}',
+    -- OpenAI text-embedding-3-small
+    embedding vector(1536) NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- HNSW graph index for approximate nearest neighbour search by cosine
+-- distance. m/ef_construction suit up to ~100k vectors; for larger tables
+-- rebuild with the values from app.rag.pgvector_store.configure_hnsw_params
+-- (e.g. m = 24, ef_construction = 128). ef_search is set per query.
+CREATE INDEX IF NOT EXISTS idx_rag_chunks_embedding
+ON rag_chunks USING hnsw (embedding vector_cosine_ops)
+WITH (m = 16, ef_construction = 64);
+
+COMMENT ON TABLE rag_chunks IS 'Context snippets (SERP results, articles) indexed for RAG retrieval';
+COMMENT ON COLUMN rag_chunks.embedding IS 'Embedding vector for semantic retrieval';
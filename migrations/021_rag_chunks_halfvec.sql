@@ -0,0 +1,17 @@
+-- Migration: RAG Chunks Half-Precision Embeddings
+-- Version: 021
+-- Description: Store RAG chunk embeddings as halfvec (float16) to halve HNSW memory traffic
+
+SET search_path TO autoseo, public;
+
+-- The HNSW index is built for vector_cosine_ops; drop it before the type change
+DROP INDEX IF EXISTS idx_rag_chunks_embedding;
+
+ALTER TABLE rag_chunks
+    ALTER COLUMN embedding TYPE halfvec(1536) USING embedding::halfvec(1536);
+
+CREATE INDEX IF NOT EXISTS idx_rag_chunks_embedding
+ON rag_chunks USING hnsw (embedding halfvec_cosine_ops)
+WITH (m = 16, ef_construction = 64);
+
+COMMENT ON COLUMN rag_chunks.embedding IS 'Half-precision embedding vector for semantic retrieval';
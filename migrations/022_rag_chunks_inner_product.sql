@@ -0,0 +1,15 @@
+-- Migration: RAG Chunks Inner Product Index
+-- Version: 022
+-- Description: Normalize RAG chunk embeddings and search them by inner product
+
+SET search_path TO autoseo, public;
+
+-- Embeddings are stored at unit length, so cosine similarity equals the
+-- inner product and needs no per-row norms
+UPDATE rag_chunks SET embedding = l2_normalize(embedding);
+
+DROP INDEX IF EXISTS idx_rag_chunks_embedding;
+
+CREATE INDEX IF NOT EXISTS idx_rag_chunks_embedding
+ON rag_chunks USING hnsw (embedding halfvec_ip_ops)
+WITH (m = 16, ef_construction = 64);
@@ -1,30 +1,43 @@
 """Articles API endpoints."""
 
-import json
 import logging
-import os
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
-from sqlalchemy import text
+import orjson
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    Header,
+    HTTPException,
+    Request,
+    UploadFile,
+    status,
+)
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import CurrentUser, get_current_user
-from app.db.session import get_db
+from app.db.session import AsyncSessionLocal, get_db
+from app.models.content_plan import content_plans
 from app.schemas.article import (
     ArticleCreate,
     ArticleGenerateRequest,
     ArticleImageResponse,
     ArticleListResponse,
     ArticleResponse,
+    ArticleStatusResponse,
     ArticleUpdate,
     PaginatedArticleResponse,
 )
 from app.services.article_service import ArticleService
 from app.services.content_generator import content_generator
 from app.services.event_publisher import event_publisher
-from app.services.image_storage import image_storage
+from app.services.image_storage import format_content_hash, image_storage, new_content_hasher
 
 logger = logging.getLogger(__name__)
 
@@ -33,11 +46,119 @@ router = APIRouter(prefix="/articles", tags=["Articles"])
 # Allowed image content types
 ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp"}
 MAX_IMAGE_SIZE = 10 * 1024 * 1024  # 10MB
+UPLOAD_CHUNK_SIZE = 64 * 1024  # 64KB
+
+# Content plan lookup; the schema is resolved by the engine's schema_translate_map
+_PLAN_QUERY = select(
+    content_plans.c.id,
+    content_plans.c.workspace_id,
+    content_plans.c.title,
+    content_plans.c.target_keywords,
+    content_plans.c.estimated_word_count,
+).where(content_plans.c.id == bindparam("plan_id"))
+
+# Built once so each response reuses the compiled validators
+_article_adapter = TypeAdapter(ArticleResponse)
+_image_adapter = TypeAdapter(ArticleImageResponse)
+_list_adapter = TypeAdapter(List[ArticleListResponse])
+
 
+def _to_article_response(article) -> ArticleResponse:
+    """Map an Article ORM object (with images loaded) to its response model."""
+    return _article_adapter.validate_python(article, from_attributes=True)
 
-@router.post("/generate", response_model=ArticleResponse, status_code=status.HTTP_201_CREATED)
+
+async def _release_stored_image(service: ArticleService, storage_path: str) -> None:
+    """Delete a stored image once no image record references it anymore.
+
+    Counts and deletes under the path's lock, so an upload of the same
+    content cannot add a reference in between and lose its object.
+    """
+    try:
+        async with service.lock_storage_path(storage_path):
+            if await service.count_images_by_path(storage_path) == 0:
+                await image_storage.delete_image(storage_path)
+    except Exception as e:
+        logger.warning(f"Failed to delete image from storage: {e}")
+
+
+async def _publish_generated(article, plan_id) -> None:
+    """Publish the article.generated event, logging (not raising) failures."""
+    try:
+        await event_publisher.publish(
+            "article.generated",
+            {
+                "article_id": article.id,
+                "title": article.title,
+                "word_count": article.word_count,
+                "cost": article.cost_usd,
+                "model": article.ai_model_used,
+                "plan_id": str(plan_id),
+            },
+            workspace_id=article.workspace_id,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to publish event: {e}")
+
+
+async def _run_generation_job(
+    article_id: UUID,
+    plan_id,
+    title: str,
+    keywords: List[str],
+    estimated_word_count: Optional[int],
+) -> None:
+    """Generate content for a pending article outside the request cycle.
+
+    Uses its own database session, since the request's session is closed
+    by the time background tasks run. Any failure marks the article
+    "failed", so it never stays "generating" because of an error.
+
+    BackgroundTasks run in the API process and are not durable: if the
+    process stops mid-generation, the article stays "generating".
+    """
+    async with AsyncSessionLocal() as db:
+        article_service = ArticleService(db)
+        try:
+            generation_result = await content_generator.generate_article(
+                title=title,
+                target_keywords=keywords,
+                estimated_word_count=estimated_word_count,
+            )
+            article = await article_service.complete_generation(
+                article_id=article_id,
+                content=generation_result.content,
+                model=generation_result.model,
+                cost_usd=generation_result.cost_usd,
+                cached_input_tokens=generation_result.cached_input_tokens,
+                cache_creation_tokens=generation_result.cache_creation_tokens,
+                metadata={
+                    "tokens_used": generation_result.tokens_used,
+                    "generated_from_plan": str(plan_id),
+                },
+            )
+            if article:
+                await _publish_generated(article, plan_id)
+        except Exception as e:
+            logger.error(f"Content generation failed for article {article_id}: {e}")
+            try:
+                await db.rollback()
+                await article_service.fail_generation(article_id, str(e))
+            except Exception as fail_error:
+                logger.error(f"Could not mark article {article_id} as failed: {fail_error}")
+
+
+@router.post(
+    "/generate",
+    response_model=ArticleResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={202: {"model": ArticleStatusResponse, "description": "Generation accepted (Prefer: respond-async)"}},
+)
 async def generate_article(
     request: ArticleGenerateRequest,
+    http_request: Request,
+    background_tasks: BackgroundTasks,
+    prefer: Optional[str] = Header(None),
     current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
@@ -45,29 +166,14 @@ async def generate_article(
 
     This endpoint takes a content plan ID, retrieves the plan details,
     and uses OpenAI GPT-3.5 to generate SEO-optimized content.
-    """
-    # Determine schema based on database type
-    db_url = os.environ.get("DATABASE_URL", "")
-    is_sqlite = "sqlite" in db_url
-
-    # Query content plan - handle different databases
-    if is_sqlite:
-        # SQLite test database - content_plans table should exist without schema
-        query = text("""
-            SELECT id, workspace_id, title, target_keywords, estimated_word_count
-            FROM content_plans
-            WHERE id = :plan_id
-        """)
-    else:
-        # PostgreSQL with schema
-        query = text("""
-            SELECT id, workspace_id, title, target_keywords, estimated_word_count
-            FROM autoseo.content_plans
-            WHERE id = :plan_id
-        """)
 
+    By default the article is generated before responding (201). Send
+    ``Prefer: respond-async`` to get 202 immediately with a ``Location``
+    header; the article has status "generating" until it becomes "draft"
+    (or "failed"), which can be polled via ``GET /articles/{id}/status``.
+    """
     try:
-        result = await db.execute(query, {"plan_id": str(request.plan_id)})
+        result = await db.execute(_PLAN_QUERY, {"plan_id": str(request.plan_id)})
         plan_row = result.fetchone()
     except Exception as e:
         # Handle case where content_plans table doesn't exist (test environment)
@@ -85,14 +191,37 @@ async def generate_article(
     # Parse target_keywords - it could be JSON or array
     if isinstance(target_keywords, str):
         try:
-            keywords = json.loads(target_keywords)
-        except (json.JSONDecodeError, TypeError):
+            keywords = orjson.loads(target_keywords)
+        except orjson.JSONDecodeError:
             keywords = []
     elif isinstance(target_keywords, list):
         keywords = target_keywords
     else:
         keywords = []
 
+    # Long-running generation on request: reply 202 and generate in the background
+    if "respond-async" in (prefer or ""):
+        article_service = ArticleService(db)
+        article = await article_service.create_pending(
+            workspace_id=UUID(str(workspace_id)),
+            plan_id=UUID(str(plan_id)),
+            title=title,
+            metadata={"generated_from_plan": str(plan_id)},
+        )
+        background_tasks.add_task(
+            _run_generation_job,
+            article_id=article.id,
+            plan_id=plan_id,
+            title=title,
+            keywords=keywords,
+            estimated_word_count=estimated_word_count,
+        )
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={"id": str(article.id), "status": article.status},
+            headers={"Location": http_request.url_for("get_article", article_id=str(article.id)).path},
+        )
+
     try:
         # Generate content using OpenAI
         generation_result = await content_generator.generate_article(
@@ -110,45 +239,17 @@ async def generate_article(
             content=generation_result.content,
             model=generation_result.model,
             cost_usd=generation_result.cost_usd,
-            word_count=generation_result.word_count,
+            cached_input_tokens=generation_result.cached_input_tokens,
+            cache_creation_tokens=generation_result.cache_creation_tokens,
             metadata={
                 "tokens_used": generation_result.tokens_used,
                 "generated_from_plan": str(plan_id),
             },
         )
 
-        # Publish event
-        try:
-            await event_publisher.publish(
-                "article.generated",
-                {
-                    "article_id": article.id,
-                    "title": article.title,
-                    "word_count": article.word_count,
-                    "cost": article.cost_usd,
-                    "model": article.ai_model_used,
-                    "plan_id": str(plan_id),
-                },
-                workspace_id=article.workspace_id,
-            )
-        except Exception as e:
-            logger.warning(f"Failed to publish event: {e}")
+        await _publish_generated(article, plan_id)
 
-        return ArticleResponse(
-            id=article.id,
-            workspace_id=article.workspace_id,
-            plan_id=article.plan_id,
-            title=article.title,
-            content=article.content,
-            status=article.status,
-            ai_model_used=article.ai_model_used,
-            cost_usd=article.cost_usd,
-            word_count=article.word_count,
-            metadata=article.generation_metadata,
-            images=[],
-            created_at=article.created_at,
-            updated_at=article.updated_at,
-        )
+        return _to_article_response(article)
 
     except ValueError as e:
         raise HTTPException(
@@ -173,21 +274,7 @@ async def create_article(
     service = ArticleService(db)
     article = await service.create(data)
 
-    return ArticleResponse(
-        id=article.id,
-        workspace_id=article.workspace_id,
-        plan_id=article.plan_id,
-        title=article.title,
-        content=article.content,
-        status=article.status,
-        ai_model_used=article.ai_model_used,
-        cost_usd=article.cost_usd,
-        word_count=article.word_count,
-        metadata=article.generation_metadata,
-        images=[],
-        created_at=article.created_at,
-        updated_at=article.updated_at,
-    )
+    return _to_article_response(article)
 
 
 @router.get("", response_model=PaginatedArticleResponse)
@@ -218,26 +305,8 @@ async def list_articles(
         page_size=page_size,
     )
 
-    data = []
-    for article in articles:
-        data.append(
-            ArticleListResponse(
-                id=article.id,
-                workspace_id=article.workspace_id,
-                plan_id=article.plan_id,
-                title=article.title,
-                status=article.status,
-                ai_model_used=article.ai_model_used,
-                cost_usd=article.cost_usd,
-                word_count=article.word_count,
-                image_count=len(article.images) if article.images else 0,
-                created_at=article.created_at,
-                updated_at=article.updated_at,
-            )
-        )
-
     return PaginatedArticleResponse(
-        data=data,
+        data=_list_adapter.validate_python(articles, from_attributes=True),
         total=total,
         page=page,
         page_size=page_size,
@@ -260,35 +329,26 @@ async def get_article(
             detail="Article not found",
         )
 
-    images = [
-        ArticleImageResponse(
-            id=img.id,
-            article_id=img.article_id,
-            filename=img.filename,
-            original_filename=img.original_filename,
-            content_type=img.content_type,
-            size_bytes=img.size_bytes,
-            storage_path=img.storage_path,
-            created_at=img.created_at,
+    return _to_article_response(article)
+
+
+@router.get("/{article_id}/status", response_model=ArticleStatusResponse)
+async def get_article_status(
+    article_id: UUID,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get an article's status (for polling asynchronous generation)."""
+    service = ArticleService(db)
+    article_status = await service.get_status(article_id)
+
+    if not article_status:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Article not found",
         )
-        for img in (article.images or [])
-    ]
-
-    return ArticleResponse(
-        id=article.id,
-        workspace_id=article.workspace_id,
-        plan_id=article.plan_id,
-        title=article.title,
-        content=article.content,
-        status=article.status,
-        ai_model_used=article.ai_model_used,
-        cost_usd=article.cost_usd,
-        word_count=article.word_count,
-        metadata=article.generation_metadata,
-        images=images,
-        created_at=article.created_at,
-        updated_at=article.updated_at,
-    )
+
+    return ArticleStatusResponse.model_validate(article_status)
 
 
 @router.put("/{article_id}", response_model=ArticleResponse)
@@ -308,35 +368,7 @@ async def update_article(
             detail="Article not found",
         )
 
-    images = [
-        ArticleImageResponse(
-            id=img.id,
-            article_id=img.article_id,
-            filename=img.filename,
-            original_filename=img.original_filename,
-            content_type=img.content_type,
-            size_bytes=img.size_bytes,
-            storage_path=img.storage_path,
-            created_at=img.created_at,
-        )
-        for img in (article.images or [])
-    ]
-
-    return ArticleResponse(
-        id=article.id,
-        workspace_id=article.workspace_id,
-        plan_id=article.plan_id,
-        title=article.title,
-        content=article.content,
-        status=article.status,
-        ai_model_used=article.ai_model_used,
-        cost_usd=article.cost_usd,
-        word_count=article.word_count,
-        metadata=article.generation_metadata,
-        images=images,
-        created_at=article.created_at,
-        updated_at=article.updated_at,
-    )
+    return _to_article_response(article)
 
 
 @router.delete("/{article_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -356,12 +388,7 @@ async def delete_article(
             detail="Article not found",
         )
 
-    # Delete images from storage
-    for img in (article.images or []):
-        try:
-            await image_storage.delete_image(img.storage_path)
-        except Exception as e:
-            logger.warning(f"Failed to delete image from storage: {e}")
+    storage_paths = {img.storage_path for img in (article.images or [])}
 
     # Delete article from database (cascade will delete image records)
     deleted = await service.delete(article_id)
@@ -372,6 +399,10 @@ async def delete_article(
             detail="Article not found",
         )
 
+    # Delete stored images no other article still references
+    for storage_path in storage_paths:
+        await _release_stored_image(service, storage_path)
+
 
 @router.post("/{article_id}/images", response_model=ArticleImageResponse, status_code=status.HTTP_201_CREATED)
 async def upload_image(
@@ -401,55 +432,78 @@ async def upload_image(
             detail=f"Invalid image type. Allowed types: {', '.join(ALLOWED_IMAGE_TYPES)}",
         )
 
-    # Read file content
-    content = await file.read()
-
-    # Validate file size
-    if len(content) > MAX_IMAGE_SIZE:
+    # Reject early when the multipart parser already knows the size
+    if file.size is not None and file.size > MAX_IMAGE_SIZE:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Image too large. Maximum size: {MAX_IMAGE_SIZE // (1024 * 1024)}MB",
         )
 
-    try:
-        # Upload to storage
-        storage_path = await image_storage.upload_image(
-            article_id=article_id,
-            file_content=content,
-            original_filename=file.filename or "image.jpg",
-            content_type=file.content_type or "image/jpeg",
-        )
-
-        # Extract filename from storage path
-        filename = storage_path.split("/")[-1]
-
-        # Save image record to database
-        image = await service.add_image(
-            article_id=article_id,
-            filename=filename,
-            original_filename=file.filename or "image.jpg",
-            content_type=file.content_type or "image/jpeg",
-            size_bytes=len(content),
-            storage_path=storage_path,
-        )
-
-        if not image:
+    # First pass: hash and measure the upload, enforcing the size limit.
+    # UploadFile is spooled by the multipart parser, so this does not hold
+    # the whole image in memory.
+    size_bytes = 0
+    hasher = new_content_hasher()
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        size_bytes += len(chunk)
+        if size_bytes > MAX_IMAGE_SIZE:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to save image record",
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Image too large. Maximum size: {MAX_IMAGE_SIZE // (1024 * 1024)}MB",
             )
+        hasher.update(memoryview(chunk))
+    content_hash = format_content_hash(hasher)
+
+    async def read_chunks():
+        """Re-read the spooled upload in chunks for the storage upload."""
+        await file.seek(0)
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            yield chunk
 
-        return ArticleImageResponse(
-            id=image.id,
-            article_id=image.article_id,
-            filename=image.filename,
-            original_filename=image.original_filename,
-            content_type=image.content_type,
-            size_bytes=image.size_bytes,
-            storage_path=image.storage_path,
-            created_at=image.created_at,
+    try:
+        # Identical images share one content-addressed object
+        storage_path = image_storage.build_content_path(
+            content_hash, file.filename or "image.jpg"
         )
 
+        # Add the reference and store the object in one locked transaction:
+        # a release of the same object waits for it and then sees the
+        # reference, or finishes its delete first so the object is stored
+        # again. A failed upload rolls the record back.
+        async with service.lock_storage_path(storage_path):
+            image = await service.add_image(
+                article_id=article_id,
+                filename=storage_path.split("/")[-1],
+                original_filename=file.filename or "image.jpg",
+                content_type=file.content_type or "image/jpeg",
+                size_bytes=size_bytes,
+                storage_path=storage_path,
+                content_hash=content_hash,
+                commit=False,
+            )
+
+            if not image:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Failed to save image record",
+                )
+
+            if await image_storage.exists(storage_path):
+                logger.info(f"Reusing stored image {storage_path} ({content_hash})")
+            else:
+                await image_storage.upload_stream(
+                    article_id=article_id,
+                    chunks=read_chunks(),
+                    original_filename=file.filename or "image.jpg",
+                    content_type=file.content_type or "image/jpeg",
+                    storage_path=storage_path,
+                )
+                logger.info(f"Stored image {storage_path} ({size_bytes} bytes, {content_hash})")
+
+        return _image_adapter.validate_python(image, from_attributes=True)
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Image upload failed: {e}")
         raise HTTPException(
@@ -468,38 +522,11 @@ async def delete_image(
     """Delete an image from an article."""
     service = ArticleService(db)
 
-    # Get article to verify it exists
-    article = await service.get_by_id(article_id)
-    if not article:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Article not found",
-        )
-
-    # Find the image
-    image = None
-    for img in (article.images or []):
-        if img.id == image_id:
-            image = img
-            break
-
-    if not image:
+    storage_path = await service.pop_image(article_id, image_id)
+    if storage_path is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Image not found",
         )
 
-    # Delete from storage
-    try:
-        await image_storage.delete_image(image.storage_path)
-    except Exception as e:
-        logger.warning(f"Failed to delete image from storage: {e}")
-
-    # Delete from database
-    deleted = await service.delete_image(image_id)
-
-    if not deleted:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Image not found",
-        )
+    await _release_stored_image(service, storage_path)
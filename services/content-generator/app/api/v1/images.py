@@ -2,10 +2,10 @@
 
 import logging
 from decimal import Decimal
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 from app.api.deps import CurrentUser, get_current_user
 from app.services.image_generator import ImageService
@@ -23,17 +23,24 @@ class ImageSearchRequest(BaseModel):
     orientation: str = Field(default="landscape")
 
 
+# DALL-E 3 options, validated by the request model before the handler runs
+ImageSize = Literal["1024x1024", "1024x1792", "1792x1024"]
+ImageQuality = Literal["standard", "hd"]
+
+
 class ImageGenerateRequest(BaseModel):
     """Request for AI image generation."""
 
     prompt: str = Field(..., min_length=1, max_length=4000)
-    size: str = Field(default="1024x1024")
-    quality: str = Field(default="standard")
+    size: ImageSize = "1024x1024"
+    quality: ImageQuality = "standard"
 
 
 class ImageResponse(BaseModel):
     """Response for a single image."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     url: str
     source: str
     width: int
@@ -42,7 +49,8 @@ class ImageResponse(BaseModel):
     photographer: Optional[str] = None
     photographer_url: Optional[str] = None
     download_url: Optional[str] = None
-    cost_usd: str
+    # Kept as Decimal end to end; pydantic writes it as a JSON string
+    cost_usd: Decimal
 
 
 class ImageSearchResponse(BaseModel):
@@ -53,6 +61,9 @@ class ImageSearchResponse(BaseModel):
     total: int
 
 
+_image_list_adapter = TypeAdapter(List[ImageResponse])
+
+
 @router.post("/search", response_model=ImageSearchResponse)
 async def search_free_images(
     request: ImageSearchRequest,
@@ -71,20 +82,7 @@ async def search_free_images(
             orientation=request.orientation,
         )
 
-        images = [
-            ImageResponse(
-                url=img.url,
-                source=img.source,
-                width=img.width,
-                height=img.height,
-                alt_text=img.alt_text,
-                photographer=img.photographer,
-                photographer_url=img.photographer_url,
-                download_url=img.download_url,
-                cost_usd=str(img.cost_usd),
-            )
-            for img in results
-        ]
+        images = _image_list_adapter.validate_python(results, from_attributes=True)
 
         return ImageSearchResponse(
             images=images,
@@ -112,22 +110,6 @@ async def generate_ai_image(
     - Standard quality: $0.04 for 1024x1024, $0.08 for larger sizes
     - HD quality: $0.08 for 1024x1024, $0.12 for larger sizes
     """
-    # Validate size
-    valid_sizes = ["1024x1024", "1024x1792", "1792x1024"]
-    if request.size not in valid_sizes:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid size. Valid sizes: {', '.join(valid_sizes)}",
-        )
-
-    # Validate quality
-    valid_qualities = ["standard", "hd"]
-    if request.quality not in valid_qualities:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid quality. Valid qualities: {', '.join(valid_qualities)}",
-        )
-
     image_service = ImageService()
 
     try:
@@ -143,17 +125,7 @@ async def generate_ai_image(
                 detail="AI image generation failed",
             )
 
-        return ImageResponse(
-            url=result.url,
-            source=result.source,
-            width=result.width,
-            height=result.height,
-            alt_text=result.alt_text,
-            photographer=result.photographer,
-            photographer_url=result.photographer_url,
-            download_url=result.download_url,
-            cost_usd=str(result.cost_usd),
-        )
+        return ImageResponse.model_validate(result)
 
     except HTTPException:
         raise
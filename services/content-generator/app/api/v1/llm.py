@@ -1,13 +1,16 @@
 """LLM Gateway API endpoints."""
 
 import logging
-from typing import List, Optional
+from decimal import Decimal
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.api.deps import CurrentUser, get_current_user
 from app.llm_gateway import LLMGateway, CostRouter
+from app.llm_gateway.gateway import llm_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -28,13 +31,15 @@ class GenerateRequest(BaseModel):
 class GenerateResponse(BaseModel):
     """Response from LLM generation."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     content: str
     model: str
     provider: str
     input_tokens: int
     output_tokens: int
     total_tokens: int
-    cost_usd: str
+    cost_usd: Decimal
 
 
 class ModelSelectionRequest(BaseModel):
@@ -48,6 +53,9 @@ class ModelSelectionRequest(BaseModel):
 class ModelSelectionResponse(BaseModel):
     """Response from model selection."""
 
+    # Frozen: cached instances are shared across requests
+    model_config = ConfigDict(frozen=True)
+
     provider: str
     model: str
     estimated_cost_per_1k_tokens: float
@@ -57,9 +65,11 @@ class ModelSelectionResponse(BaseModel):
 class ProviderInfo(BaseModel):
     """Provider information."""
 
+    model_config = ConfigDict(frozen=True)
+
     name: str
     available: bool
-    models: List[str]
+    models: Tuple[str, ...]
     default_model: str
 
 
@@ -84,15 +94,7 @@ async def generate_content(
             max_tokens=request.max_tokens,
         )
 
-        return GenerateResponse(
-            content=response.content,
-            model=response.model,
-            provider=response.provider,
-            input_tokens=response.input_tokens,
-            output_tokens=response.output_tokens,
-            total_tokens=response.total_tokens,
-            cost_usd=str(response.cost_usd),
-        )
+        return GenerateResponse.model_validate(response)
 
     except ValueError as e:
         raise HTTPException(
@@ -116,14 +118,33 @@ async def select_optimal_model(
 
     Uses Cost Router to choose the best model for the task.
     """
-    cost_router = CostRouter()
+    return _select_model(request.priority, request.word_count, request.max_budget_usd)
 
-    selection = cost_router.get_model_selection(
-        priority=request.priority,
-        word_count=request.word_count,
-        max_budget_usd=request.max_budget_usd,
-    )
 
+@router.get("/providers", response_model=List[ProviderInfo])
+async def list_providers(
+    response: Response,
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """List all available LLM providers and their models."""
+    # Providers and models only change on deploy; private, as the endpoint
+    # requires authentication and shared caches must not serve it to others
+    response.headers["Cache-Control"] = "private, max-age=300"
+    return list(_providers_snapshot())
+
+
+@lru_cache(maxsize=1024)
+def _select_model(
+    priority: str,
+    word_count: Optional[int],
+    max_budget_usd: Optional[float],
+) -> ModelSelectionResponse:
+    """Select a model; a pure function of its inputs, so results are cached."""
+    selection = CostRouter().get_model_selection(
+        priority=priority,
+        word_count=word_count,
+        max_budget_usd=max_budget_usd,
+    )
     return ModelSelectionResponse(
         provider=selection.provider,
         model=selection.model,
@@ -132,24 +153,19 @@ async def select_optimal_model(
     )
 
 
-@router.get("/providers", response_model=List[ProviderInfo])
-async def list_providers(
-    current_user: CurrentUser = Depends(get_current_user),
-):
-    """List all available LLM providers and their models."""
-    gateway = LLMGateway()
-
+@lru_cache(maxsize=1)
+def _providers_snapshot() -> Tuple[ProviderInfo, ...]:
+    """Build the provider list once; availability is fixed by startup config."""
     providers = []
-    for name in gateway.get_all_providers():
-        provider = gateway.get_provider(name)
+    for name in llm_gateway.get_all_providers():
+        provider = llm_gateway.get_provider(name)
         if provider:
             providers.append(
                 ProviderInfo(
                     name=name,
                     available=provider.is_available,
-                    models=provider.get_available_models(),
+                    models=tuple(provider.get_available_models()),
                     default_model=provider.get_default_model(),
                 )
             )
-
-    return providers
+    return tuple(providers)
@@ -7,7 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 
 from app.api.deps import CurrentUser, get_current_user
-from app.rag import RAGEngine
+from app.rag.engine import serp_documents
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +29,7 @@ class RetrievedContextResponse(BaseModel):
     source: str
     relevance_score: float
     metadata: Dict[str, Any]
+    doc_id: str
 
 
 class EnrichContextResponse(BaseModel):
@@ -38,6 +39,7 @@ class EnrichContextResponse(BaseModel):
     enriched_prompt: str
     context_snippets: List[RetrievedContextResponse]
     total_context_tokens: int
+    doc_ids: List[str]
 
 
 class IndexContentRequest(BaseModel):
@@ -65,7 +67,8 @@ async def enrich_context(
     Retrieves relevant context from indexed SERP data and knowledge base
     to enhance content generation.
     """
-    rag_engine = RAGEngine()
+    # The global engine is created on first use
+    from app.rag.engine import rag_engine
 
     try:
         enriched = await rag_engine.enrich_context(
@@ -83,10 +86,12 @@ async def enrich_context(
                     source=ctx.source,
                     relevance_score=ctx.relevance_score,
                     metadata=ctx.metadata,
+                    doc_id=ctx.doc_id,
                 )
                 for ctx in enriched.context_snippets
             ],
             total_context_tokens=enriched.total_context_tokens,
+            doc_ids=enriched.doc_ids,
         )
 
     except Exception as e:
@@ -106,10 +111,11 @@ async def index_content(
 
     Adds content to the vector store for semantic search.
     """
-    rag_engine = RAGEngine()
+    from app.rag.buffered_indexer import rag_indexer
 
     try:
-        success = await rag_engine.index_content(
+        # Buffered: concurrent index calls share one batched embed + upsert
+        success = await rag_indexer.index_content(
             content=request.content,
             source=request.source,
             metadata=request.metadata,
@@ -142,12 +148,11 @@ async def index_serp_data(
 
     Indexes search engine results for use in content generation.
     """
-    rag_engine = RAGEngine()
+    from app.rag.buffered_indexer import rag_indexer
 
     try:
-        count = await rag_engine.index_serp_data(
-            query=request.query,
-            serp_results=request.results,
+        count = await rag_indexer.index_documents(
+            serp_documents(request.query, request.results)
         )
 
         return {"message": f"Indexed {count} SERP results", "count": count}
@@ -6,7 +6,7 @@ from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 from app.api.deps import CurrentUser, get_current_user
 from app.scheduler.scheduler import ContentScheduler
@@ -16,6 +16,13 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/scheduler", tags=["Scheduler"])
 
 
+async def get_scheduler() -> ContentScheduler:
+    """Get the process-wide content scheduler (created on first use)."""
+    from app.scheduler.scheduler import content_scheduler
+
+    return content_scheduler
+
+
 class ScheduleJobRequest(BaseModel):
     """Request for scheduling a content generation job."""
 
@@ -28,9 +35,11 @@ class ScheduleJobRequest(BaseModel):
 class ScheduledJobResponse(BaseModel):
     """Response for a scheduled job."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
-    plan_id: str
-    workspace_id: str
+    plan_id: UUID
+    workspace_id: UUID
     scheduled_at: datetime
     priority: str
     status: str
@@ -53,17 +62,21 @@ class TrafficPatternRequest(BaseModel):
     patterns: List[Dict[str, Any]]
 
 
+# Built once; each list is validated in one call
+_jobs_adapter = TypeAdapter(List[ScheduledJobResponse])
+_times_adapter = TypeAdapter(List[OptimalTimeResponse])
+
+
 @router.post("/jobs", response_model=ScheduledJobResponse, status_code=status.HTTP_201_CREATED)
 async def schedule_job(
     request: ScheduleJobRequest,
+    scheduler: ContentScheduler = Depends(get_scheduler),
     current_user: CurrentUser = Depends(get_current_user),
 ):
     """Schedule a content generation job.
 
     Jobs are processed by Celery workers based on their scheduled time.
     """
-    scheduler = ContentScheduler()
-
     try:
         job = await scheduler.schedule_generation(
             plan_id=request.plan_id,
@@ -72,15 +85,7 @@ async def schedule_job(
             priority=request.priority,
         )
 
-        return ScheduledJobResponse(
-            id=job.id,
-            plan_id=str(job.plan_id),
-            workspace_id=str(job.workspace_id),
-            scheduled_at=job.scheduled_at,
-            priority=job.priority,
-            status=job.status,
-            created_at=job.created_at,
-        )
+        return ScheduledJobResponse.model_validate(job)
 
     except Exception as e:
         logger.error(f"Failed to schedule job: {e}")
@@ -94,29 +99,17 @@ async def schedule_job(
 async def list_pending_jobs(
     workspace_id: Optional[UUID] = None,
     limit: int = 100,
+    scheduler: ContentScheduler = Depends(get_scheduler),
     current_user: CurrentUser = Depends(get_current_user),
 ):
     """List pending scheduled jobs."""
-    scheduler = ContentScheduler()
-
     try:
         jobs = await scheduler.get_pending_jobs(
             workspace_id=workspace_id,
             limit=limit,
         )
 
-        return [
-            ScheduledJobResponse(
-                id=job.id,
-                plan_id=str(job.plan_id),
-                workspace_id=str(job.workspace_id),
-                scheduled_at=job.scheduled_at,
-                priority=job.priority,
-                status=job.status,
-                created_at=job.created_at,
-            )
-            for job in jobs
-        ]
+        return _jobs_adapter.validate_python(jobs)
 
     except Exception as e:
         logger.error(f"Failed to list jobs: {e}")
@@ -129,11 +122,10 @@ async def list_pending_jobs(
 @router.delete("/jobs/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def cancel_job(
     job_id: str,
+    scheduler: ContentScheduler = Depends(get_scheduler),
     current_user: CurrentUser = Depends(get_current_user),
 ):
     """Cancel a scheduled job."""
-    scheduler = ContentScheduler()
-
     cancelled = await scheduler.cancel_job(job_id)
     if not cancelled:
         raise HTTPException(
@@ -146,6 +138,7 @@ async def cancel_job(
 async def get_optimal_times(
     workspace_id: UUID,
     days_ahead: int = 7,
+    scheduler: ContentScheduler = Depends(get_scheduler),
     current_user: CurrentUser = Depends(get_current_user),
 ):
     """Get optimal publishing times based on traffic patterns.
@@ -153,24 +146,13 @@ async def get_optimal_times(
     Returns recommended times for publishing content based on
     historical traffic data and engagement patterns.
     """
-    scheduler = ContentScheduler()
-
     try:
         times = await scheduler.get_optimal_times(
             workspace_id=workspace_id,
             days_ahead=days_ahead,
         )
 
-        return [
-            OptimalTimeResponse(
-                datetime=t["datetime"],
-                day_of_week=t["day_of_week"],
-                hour=t["hour"],
-                engagement_score=t["engagement_score"],
-                recommended=t["recommended"],
-            )
-            for t in times
-        ]
+        return _times_adapter.validate_python(times)
 
     except Exception as e:
         logger.error(f"Failed to get optimal times: {e}")
@@ -184,6 +166,7 @@ async def get_optimal_times(
 async def update_traffic_patterns(
     workspace_id: UUID,
     request: TrafficPatternRequest,
+    scheduler: ContentScheduler = Depends(get_scheduler),
     current_user: CurrentUser = Depends(get_current_user),
 ):
     """Update traffic patterns for a workspace.
@@ -191,8 +174,6 @@ async def update_traffic_patterns(
     Traffic patterns are used for smart scheduling to optimize
     content publication times.
     """
-    scheduler = ContentScheduler()
-
     try:
         count = await scheduler.update_traffic_patterns(
             workspace_id=workspace_id,
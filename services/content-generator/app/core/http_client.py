@@ -0,0 +1,86 @@
+"""Process-wide HTTP client for outbound API calls.
+
+One pooled httpx.AsyncClient is shared by the LLM providers, the image
+service and the WordPress publisher, so connections (and TLS sessions) to
+api.openai.com, api.pexels.com etc. are reused instead of being set up on
+every call. HTTP/2 is used when the optional h2 package is installed, which
+lets concurrent requests to the same host share one connection.
+
+OpenAI SDK clients (also used for OpenAI-compatible APIs such as xAI) are
+shared per base URL and API key on top of that pool.
+"""
+
+import hashlib
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+HTTP_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=100)
+
+# LLM SDK clients sharing the pool keep their own long per-request timeout,
+# since article generation can run well past HTTP_TIMEOUT
+LLM_TIMEOUT = httpx.Timeout(600.0, connect=10.0)
+
+_client: Optional[httpx.AsyncClient] = None
+
+# (base_url, API key hash) -> AsyncOpenAI
+_openai_clients: Dict[Tuple[Optional[str], str], Any] = {}
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=HTTP_TIMEOUT,
+            limits=HTTP_LIMITS,
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client (on application shutdown)."""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+        logger.info("Closed shared HTTP client")
+    _client = None
+    _openai_clients.clear()
+
+
+def get_openai_client(api_key: str, base_url: Optional[str] = None):
+    """Get the shared AsyncOpenAI client for an API key and base URL.
+
+    Args:
+        api_key: API key
+        base_url: API base URL (default: OpenAI)
+
+    Returns:
+        An AsyncOpenAI client on the shared HTTP pool
+    """
+    from openai import AsyncOpenAI
+
+    key = (base_url, hashlib.sha256(api_key.encode()).hexdigest())
+    client = _openai_clients.get(key)
+    # A client whose pool was closed on shutdown is replaced
+    if client is None or client.is_closed():
+        client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=get_http_client(),
+            timeout=LLM_TIMEOUT,
+        )
+        _openai_clients[key] = client
+    return client
@@ -0,0 +1,61 @@
+"""ASGI middleware."""
+
+import re
+from typing import Pattern, Union
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class ContentLengthLimitMiddleware:
+    """Reject oversized request bodies from the Content-Length header.
+
+    Runs before routing, so an oversized upload gets 413 without the
+    multipart body being parsed or the auth dependency running. Requests
+    without a Content-Length (chunked uploads) pass through; handlers
+    still enforce their own limit while streaming.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_body_size: int,
+        path_pattern: Union[str, Pattern[str]],
+        methods: frozenset = frozenset({"POST", "PUT"}),
+    ):
+        """Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI application
+            max_body_size: Maximum allowed Content-Length in bytes
+            path_pattern: Regex matched against the request path
+            methods: HTTP methods the limit applies to
+        """
+        self.app = app
+        self.max_body_size = max_body_size
+        self.path_pattern = re.compile(path_pattern)
+        self.methods = methods
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] == "http"
+            and scope["method"] in self.methods
+            and self.path_pattern.match(scope["path"])
+        ):
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    if value.isdigit() and int(value) > self.max_body_size:
+                        response = JSONResponse(
+                            status_code=413,
+                            content={
+                                "detail": (
+                                    "Request body too large. Maximum size: "
+                                    f"{self.max_body_size // (1024 * 1024)}MB"
+                                )
+                            },
+                        )
+                        await response(scope, receive, send)
+                        return
+                    break
+
+        await self.app(scope, receive, send)
@@ -1,25 +1,58 @@
 """Database session configuration."""
 
+import asyncio
+import logging
+
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import get_settings
 
+logger = logging.getLogger(__name__)
 settings = get_settings()
 
+
+def get_async_database_url(url: str) -> str:
+    """Ensure a PostgreSQL URL uses the asyncpg driver."""
+    for prefix in ("postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+def get_schema_translate_map(url: str) -> dict:
+    """Map the "autoseo" schema to the default schema on SQLite (testing)."""
+    return {"autoseo": None if url.startswith("sqlite") else "autoseo"}
+
+
+database_url = get_async_database_url(settings.DATABASE_URL)
+
 # Configure engine based on database type
 engine_kwargs = {
     "echo": settings.DEBUG,
     "pool_pre_ping": True,
+    # Tables declared in the "autoseo" schema resolve per dialect at compile time
+    "execution_options": {"schema_translate_map": get_schema_translate_map(database_url)},
 }
 
 # Only add pool settings for PostgreSQL
-if "postgresql" in settings.DATABASE_URL:
-    engine_kwargs["pool_size"] = 5
-    engine_kwargs["max_overflow"] = 10
+if "postgresql" in database_url:
+    engine_kwargs["pool_size"] = settings.DB_POOL_SIZE
+    engine_kwargs["max_overflow"] = settings.DB_MAX_OVERFLOW
+    engine_kwargs["pool_timeout"] = settings.DB_POOL_TIMEOUT
+    engine_kwargs["pool_recycle"] = settings.DB_POOL_RECYCLE
+
+if database_url.startswith("postgresql+asyncpg"):
+    engine_kwargs["connect_args"] = {
+        # SQLAlchemy's cache of asyncpg prepared statements
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        # asyncpg's own statement cache
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
 
 engine = create_async_engine(
-    settings.DATABASE_URL,
+    database_url,
     **engine_kwargs,
 )
 
@@ -32,6 +65,27 @@ AsyncSessionLocal = sessionmaker(
 )
 
 
+async def warm_up_pool(connections: int = settings.DB_POOL_WARMUP) -> None:
+    """Open pooled connections ahead of the first requests (PostgreSQL only).
+
+    The connections are checked out concurrently, so the pool really holds
+    ``connections`` of them, and returned to the pool idle.
+    """
+    connections = min(connections, settings.DB_POOL_SIZE)
+    if "postgresql" not in database_url or connections <= 0:
+        return
+
+    async def _checkout() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    try:
+        await asyncio.gather(*[_checkout() for _ in range(connections)])
+        logger.info(f"Warmed up {connections} database connections")
+    except Exception as e:
+        logger.warning(f"Database pool warm-up failed: {e}")
+
+
 async def get_db() -> AsyncSession:
     """Dependency that provides a database session."""
     async with AsyncSessionLocal() as session:
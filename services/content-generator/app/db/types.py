@@ -0,0 +1,25 @@
+"""Custom SQLAlchemy column types."""
+
+from typing import Any, Optional
+
+import orjson
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+
+class OrJSON(TypeDecorator):
+    """JSON document stored as orjson-encoded bytes.
+
+    For write-mostly documents that are never filtered by JSON path:
+    orjson serializes straight to bytes, and the database stores them
+    without parsing.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[Any], dialect) -> Optional[bytes]:
+        return orjson.dumps(value) if value is not None else None
+
+    def process_result_value(self, value: Optional[bytes], dialect) -> Optional[Any]:
+        return orjson.loads(value) if value else None
@@ -1,10 +1,87 @@
 """AI-powered anchor text rewriter."""
 
+import asyncio
+import hashlib
 import logging
-from typing import Any, Dict, List, Optional
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# LLM results are cached in process: the inputs (a published article's title,
+# keywords and opening content) rarely change, so repeat calls skip the LLM
+LLM_CACHE_TTL_SECONDS = 24 * 60 * 60
+LLM_CACHE_MAX_ENTRIES = 1024
+
+_llm_cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+# Opening tag of an HTML link, capturing the href (other attributes may come
+# first; either quote style and any tag case)
+_HREF_RE = re.compile(r"""<a\b[^>]*\bhref\s*=\s*["']([^"']+)["']""", re.IGNORECASE)
+
+# Static instructions go in the system prompt so every request shares the
+# same prefix (which providers can cache); the user prompt carries only
+# the per-call values
+REWRITE_SYSTEM_PROMPT = """You rewrite a sentence to naturally include a link with the given anchor text.
+
+Requirements:
+- Keep the original meaning intact
+- Make the link placement feel natural
+- Use the given anchor text exactly
+- Return only the rewritten sentence with HTML link
+
+Example output format: 'This is a sentence with <a href="url">anchor text</a> in it.'"""
+
+BATCH_REWRITE_SYSTEM_PROMPT = """You rewrite sentences to naturally include a link with the given anchor text and URL.
+
+Requirements:
+- Keep the original meaning of each sentence intact
+- Make the link placement feel natural
+- Use each sentence's anchor text exactly
+- Return only a JSON array of the rewritten sentences with HTML links, one per input sentence, in the same order
+
+Example output format: ["This is a sentence with <a href=\\"url\\">anchor text</a> in it."]"""
+
+SUGGEST_SYSTEM_PROMPT = """You suggest 5 appropriate anchor texts for internal links to an article.
+
+Requirements:
+- Anchor texts should be concise (2-5 words)
+- They should accurately describe the article
+- Include variations for natural linking
+- List them in order of preference
+
+Return only the anchor texts, one per line."""
+
+
+def _cache_key(*parts: str) -> str:
+    """Build a compact cache key from the inputs of an LLM call."""
+    return hashlib.blake2b("\x1f".join(parts).encode(), digest_size=16).hexdigest()
+
+
+def _cache_get(key: str) -> Optional[Any]:
+    """Get a cached LLM result, or None if missing or expired."""
+    entry = _llm_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, value = entry
+    if expires_at < time.monotonic():
+        del _llm_cache[key]
+        return None
+    _llm_cache.move_to_end(key)
+    return value
+
+
+def _cache_set(key: str, value: Any) -> None:
+    """Cache an LLM result, evicting the least recently used entries."""
+    _llm_cache[key] = (time.monotonic() + LLM_CACHE_TTL_SECONDS, value)
+    _llm_cache.move_to_end(key)
+    while len(_llm_cache) > LLM_CACHE_MAX_ENTRIES:
+        _llm_cache.popitem(last=False)
+
 
 class AnchorTextRewriter:
     """Service for AI-powered anchor text rewriting.
@@ -80,44 +157,41 @@ class AnchorTextRewriter:
             # Fallback: simple replacement with link
             return self._simple_link_insertion(sentence, keyword, target_url)
 
-        try:
-            prompt = f"""Rewrite this sentence to naturally include a link with anchor text "{keyword}":
-
-Original: {sentence}
-
-Requirements:
-- Keep the original meaning intact
-- Make the link placement feel natural
-- Use "{keyword}" as the anchor text exactly
-- Return only the rewritten sentence with HTML link
-
-Example output format: 'This is a sentence with <a href="url">anchor text</a> in it.'
-"""
+        key = _cache_key("rewrite", self._provider, self._model, sentence, keyword, target_url)
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
 
+        try:
             response = await self._llm_gateway.generate(
-                prompt=prompt,
+                prompt=f'Anchor text: "{keyword}"\nURL: {target_url}\nOriginal: {sentence}',
                 provider=self._provider,
                 model=self._model,
+                system_prompt=REWRITE_SYSTEM_PROMPT,
                 temperature=0.3,
                 max_tokens=500,
             )
 
-            rewritten = response.content.strip()
-
-            # Verify the link is properly formatted
-            if f'<a href="{target_url}">' not in rewritten:
-                # If the model forgot the URL, fix it
-                rewritten = rewritten.replace(
-                    f'<a href="url">{keyword}</a>',
-                    f'<a href="{target_url}">{keyword}</a>',
-                )
-
+            rewritten = self._fix_link_url(response.content.strip(), target_url)
+            # Only keep usable rewrites; _fix_link_url already pointed any
+            # link at target_url, so a link means the rewrite is usable
+            if _HREF_RE.search(rewritten):
+                _cache_set(key, rewritten)
             return rewritten
 
         except Exception as e:
             logger.error(f"Failed to rewrite sentence: {e}")
             return self._simple_link_insertion(sentence, keyword, target_url)
 
+    @staticmethod
+    def _fix_link_url(rewritten: str, target_url: str) -> str:
+        """Point the first link at target_url if the model used another URL."""
+        match = _HREF_RE.search(rewritten)
+        if match and match.group(1) != target_url:
+            # Only the URL changes; the tag's other attributes and quotes stay
+            rewritten = f"{rewritten[:match.start(1)]}{target_url}{rewritten[match.end(1):]}"
+        return rewritten
+
     def _simple_link_insertion(
         self,
         sentence: str,
@@ -173,20 +247,79 @@ Example output format: 'This is a sentence with <a href="url">anchor text</a> in
         Returns:
             List of dicts with original and rewritten sentences
         """
-        results = []
-        for item in sentences:
-            rewritten = await self.rewrite_sentence_with_link(
-                sentence=item["sentence"],
-                keyword=item["keyword"],
-                target_url=item["target_url"],
-            )
-            results.append({
+        rewritten_sentences = None
+        if not self._mock_mode and self._llm_gateway and len(sentences) > 1:
+            rewritten_sentences = await self._rewrite_batch(sentences)
+
+        if rewritten_sentences is None:
+            # One call per sentence, run concurrently
+            rewritten_sentences = await asyncio.gather(*[
+                self.rewrite_sentence_with_link(
+                    sentence=item["sentence"],
+                    keyword=item["keyword"],
+                    target_url=item["target_url"],
+                )
+                for item in sentences
+            ])
+
+        return [
+            {
                 "original": item["sentence"],
                 "keyword": item["keyword"],
                 "target_url": item["target_url"],
                 "rewritten": rewritten,
-            })
-        return results
+            }
+            for item, rewritten in zip(sentences, rewritten_sentences)
+        ]
+
+    async def _rewrite_batch(
+        self,
+        sentences: List[Dict[str, Any]],
+    ) -> Optional[List[str]]:
+        """Rewrite all sentences in a single LLM call.
+
+        Args:
+            sentences: List of dicts with 'sentence', 'keyword', 'target_url'
+
+        Returns:
+            Rewritten sentences in input order, or None if the response
+            could not be used (callers then rewrite sentence by sentence)
+        """
+        items = "\n".join(
+            f'{i}. Sentence: {item["sentence"]}\n'
+            f'   Anchor text: "{item["keyword"]}"\n'
+            f'   URL: {item["target_url"]}'
+            for i, item in enumerate(sentences, start=1)
+        )
+
+        try:
+            response = await self._llm_gateway.generate(
+                prompt=items,
+                provider=self._provider,
+                model=self._model,
+                system_prompt=BATCH_REWRITE_SYSTEM_PROMPT,
+                temperature=0.3,
+                max_tokens=min(8000, 500 * len(sentences)),
+            )
+            content = response.content.strip()
+            # Tolerate a markdown code fence around the array
+            rewritten = orjson.loads(content[content.find("["):content.rfind("]") + 1])
+        except Exception as e:
+            logger.warning(f"Batch rewrite failed, rewriting sentences one by one: {e}")
+            return None
+
+        if (
+            not isinstance(rewritten, list)
+            or len(rewritten) != len(sentences)
+            or not all(isinstance(sentence, str) for sentence in rewritten)
+        ):
+            logger.warning("Batch rewrite returned an unexpected shape, rewriting one by one")
+            return None
+
+        return [
+            self._fix_link_url(sentence.strip(), item["target_url"])
+            for sentence, item in zip(rewritten, sentences)
+        ]
 
     async def suggest_anchor_text(
         self,
@@ -218,25 +351,28 @@ Example output format: 'This is a sentence with <a href="url">anchor text</a> in
                 suggestions.insert(0, article_title)
             return suggestions[:5]
 
-        try:
-            prompt = f"""Based on this article, suggest 5 appropriate anchor texts for internal links to this article.
+        key = _cache_key(
+            "suggest",
+            self._provider,
+            self._model,
+            article_title,
+            ",".join(target_keywords or []),
+            article_content[:500],
+        )
+        cached = _cache_get(key)
+        if cached is not None:
+            return list(cached)
 
-Title: {article_title}
+        try:
+            prompt = f"""Title: {article_title}
 Target Keywords: {', '.join(target_keywords) if target_keywords else 'None'}
-Content Preview: {article_content[:500]}...
-
-Requirements:
-- Anchor texts should be concise (2-5 words)
-- They should accurately describe the article
-- Include variations for natural linking
-- List them in order of preference
-
-Return only the anchor texts, one per line."""
+Content Preview: {article_content[:500]}..."""
 
             response = await self._llm_gateway.generate(
                 prompt=prompt,
                 provider=self._provider,
                 model=self._model,
+                system_prompt=SUGGEST_SYSTEM_PROMPT,
                 temperature=0.3,
                 max_tokens=200,
             )
@@ -245,8 +381,12 @@ Return only the anchor texts, one per line."""
                 line.strip().strip("-").strip("•").strip()
                 for line in response.content.strip().split("\n")
                 if line.strip()
-            ]
-            return suggestions[:5]
+            ][:5]
+            # A reply that parses to nothing is not kept, so the next call
+            # asks again instead of serving no suggestions until it expires
+            if suggestions:
+                _cache_set(key, tuple(suggestions))
+            return suggestions
 
         except Exception as e:
             logger.error(f"Failed to suggest anchor texts: {e}")
@@ -1,20 +1,119 @@
 """Basic Internal Linker using string matching."""
 
+import asyncio
 import logging
+import multiprocessing
+import os
 import re
-from typing import Any, Dict, List, Optional, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncGenerator, AsyncIterator, Deque, Dict, List, Optional, Pattern, Tuple
 from uuid import UUID
 
 from app.internal_linker.models import InternalLinkOpportunity
 
 logger = logging.getLogger(__name__)
 
+# Aho-Corasick finds every keyword in one pass over the content; fall back
+# to one regex scan per keyword when the optional package is not installed.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+def _is_word_char(char: str) -> bool:
+    """Check whether a character counts as a word character for ``\\b``."""
+    return char.isalnum() or char == "_"
+
+
+def _at_word_boundary(text: str, index: int) -> bool:
+    """Check whether ``\\b`` would match at ``index`` in ``text``."""
+    before = index > 0 and _is_word_char(text[index - 1])
+    after = index < len(text) and _is_word_char(text[index])
+    return before != after
+
+
+# Default cap on opportunities per direction in get_all_link_opportunities
+MAX_LINK_OPPORTUNITIES = 200
+
+# Below this many articles the scan runs inline; process hand-off costs more
+PARALLEL_SCAN_MIN_ARTICLES = 50
+# Chunks per pool worker: smaller chunks let a scan stopped early skip more
+SCAN_CHUNKS_PER_WORKER = 4
+
+_scan_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_scan_pool() -> ProcessPoolExecutor:
+    """Get the shared process pool for keyword scans, creating it on first use."""
+    global _scan_pool
+    if _scan_pool is None:
+        # The pool starts inside a running, multithreaded server; forking
+        # such a process can deadlock, so start workers from a clean process
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context(
+            "forkserver" if "forkserver" in methods else "spawn"
+        )
+        _scan_pool = ProcessPoolExecutor(mp_context=context)
+    return _scan_pool
+
+
+def shutdown_scan_pool() -> None:
+    """Shut down the keyword scan process pool (on application shutdown)."""
+    global _scan_pool
+    if _scan_pool is not None:
+        _scan_pool.shutdown(cancel_futures=True)
+        _scan_pool = None
+
+
+def _scan_article_chunk(
+    articles: List[Tuple[Any, str]],
+    keywords: List[str],
+) -> List[Tuple[Any, Dict[str, List[Dict[str, Any]]]]]:
+    """Find keyword matches in a chunk of articles.
+
+    Top-level so it can run in a worker process.
+
+    Args:
+        articles: (article_id, content) pairs
+        keywords: Keywords to search for
+
+    Returns:
+        (article_id, matches keyed by lowercased keyword) pairs, in input order
+    """
+    linker = BasicInternalLinker()
+    automaton = linker._build_automaton(keywords)
+    return [
+        (article_id, linker._find_all_matches(content, keywords, automaton))
+        for article_id, content in articles
+    ]
+
+
+async def _collect(
+    opportunities: AsyncGenerator[InternalLinkOpportunity, None],
+    limit: Optional[int],
+) -> List[InternalLinkOpportunity]:
+    """Collect opportunities from an iterator, stopping after ``limit``."""
+    collected: List[InternalLinkOpportunity] = []
+    if limit is not None and limit <= 0:
+        return collected
+    try:
+        async for opportunity in opportunities:
+            collected.append(opportunity)
+            if limit is not None and len(collected) >= limit:
+                break
+    finally:
+        # Stop the scan behind the generator rather than leaving it to GC
+        await opportunities.aclose()
+    return collected
+
 
 def _get_target_keywords(article) -> List[str]:
     """Extract target keywords from an article.
 
     Args:
-        article: Article model instance
+        article: Article model instance or row with generation_metadata
 
     Returns:
         List of target keywords
@@ -41,6 +140,8 @@ class BasicInternalLinker:
         self.db = db
         self._mock_mode = mock_mode
         self._mock_articles: List[Dict[str, Any]] = []
+        # Compiled word-boundary pattern per lowercased keyword
+        self._pattern_cache: Dict[str, Pattern[str]] = {}
 
     @property
     def mock_mode(self) -> bool:
@@ -73,40 +174,94 @@ class BasicInternalLinker:
         if not self.db:
             return []
 
-        from sqlalchemy import select, text
+        from sqlalchemy import select
         from app.models.article import Article
         from app.models.published_post import PublishedPost
 
         try:
-            # Get articles that have been published
+            # Get articles that have been published; only the columns the
+            # linker needs, as plain rows rather than ORM instances
             query = (
-                select(Article)
+                select(
+                    Article.id,
+                    Article.title,
+                    Article.content,
+                    Article.generation_metadata,
+                )
                 .join(PublishedPost, Article.id == PublishedPost.article_id)
                 .where(Article.workspace_id == workspace_id)
                 .where(Article.status == "published")
             )
-            result = await self.db.execute(query)
-            articles = result.scalars().all()
+            result = await self.db.stream(query)
 
             return [
                 {
-                    "id": article.id,
-                    "title": article.title,
-                    "content": article.content,
-                    "target_keywords": _get_target_keywords(article),
+                    "id": row.id,
+                    "title": row.title,
+                    "content": row.content,
+                    "target_keywords": _get_target_keywords(row),
                 }
-                for article in articles
+                async for row in result
             ]
         except Exception as e:
             logger.error(f"Failed to get published articles: {e}")
             return []
 
+    async def iter_link_opportunities(
+        self,
+        new_article_id: UUID,
+        target_keywords: List[str],
+        old_articles: List[Dict[str, Any]],
+    ) -> AsyncIterator[InternalLinkOpportunity]:
+        """Yield link opportunities from existing articles to a new article.
+
+        Opportunities are produced article by article, so a caller that
+        stops early skips materializing (and, for small workspaces,
+        scanning) the rest.
+
+        Args:
+            new_article_id: ID of the new article
+            target_keywords: Keywords to search for
+            old_articles: Published articles to search
+
+        Yields:
+            Link opportunities, in article then keyword order
+        """
+        # Skip self and articles without content
+        articles = [
+            (old["id"], old["content"])
+            for old in old_articles
+            if old["id"] != new_article_id and old.get("content")
+        ]
+
+        contents = dict(articles)
+
+        scan = self._scan_articles(articles, target_keywords)
+        try:
+            async for old_id, all_matches in scan:
+                for keyword in target_keywords:
+                    for match in all_matches.get(keyword.lower(), []):
+                        yield InternalLinkOpportunity(
+                            from_article_id=old_id,
+                            to_article_id=new_article_id,
+                            keyword=keyword,
+                            position=match["position"],
+                            context_start=match["context_start"],
+                            context_end=match["context_end"],
+                            source_content=contents[old_id],
+                        )
+        finally:
+            # Stop the scan's pending chunks when the consumer stops early
+            await scan.aclose()
+
     async def find_link_opportunities(
         self,
         new_article_id: UUID,
         new_article_content: str,
         target_keywords: List[str],
         workspace_id: UUID,
+        old_articles: Optional[List[Dict[str, Any]]] = None,
+        limit: Optional[int] = None,
     ) -> List[InternalLinkOpportunity]:
         """Find internal link opportunities for a new article.
 
@@ -118,43 +273,171 @@ class BasicInternalLinker:
             new_article_content: Content of the new article
             target_keywords: Keywords to search for
             workspace_id: The workspace ID
+            old_articles: Published articles, if already fetched
+            limit: Stop after this many opportunities (default: no limit)
 
         Returns:
             List of link opportunities
         """
-        old_articles = await self.get_published_articles(workspace_id)
-        opportunities = []
-
-        for old in old_articles:
-            old_id = old["id"]
-            old_content = old.get("content", "")
-
-            # Skip self
-            if old_id == new_article_id:
-                continue
+        if old_articles is None:
+            old_articles = await self.get_published_articles(workspace_id)
 
-            if not old_content:
-                continue
-
-            # Search for keyword matches
-            for keyword in target_keywords:
-                matches = self._find_keyword_matches(old_content, keyword)
-                for match in matches:
-                    opportunities.append(
-                        InternalLinkOpportunity(
-                            from_article_id=old_id,
-                            to_article_id=new_article_id,
-                            keyword=keyword,
-                            position=match["position"],
-                            context=match["context"],
-                        )
-                    )
+        opportunities = await _collect(
+            self.iter_link_opportunities(new_article_id, target_keywords, old_articles),
+            limit,
+        )
 
         logger.info(
             f"Found {len(opportunities)} link opportunities for article {new_article_id}"
         )
         return opportunities
 
+    async def _scan_articles(
+        self,
+        articles: List[Tuple[Any, str]],
+        keywords: List[str],
+    ) -> AsyncIterator[Tuple[Any, Dict[str, List[Dict[str, Any]]]]]:
+        """Find keyword matches across many articles.
+
+        Small workspaces are scanned inline, one article per step. Large
+        ones are sharded across the process pool so the scan uses every
+        core and stays off the event loop. At most one chunk per worker is
+        in flight, and chunks are yielded in order as they finish, so a
+        consumer that stops early leaves the remaining chunks unscanned.
+
+        Args:
+            articles: (article_id, content) pairs
+            keywords: Keywords to search for
+
+        Yields:
+            (article_id, matches keyed by lowercased keyword) pairs, in input order
+        """
+        if len(articles) < PARALLEL_SCAN_MIN_ARTICLES:
+            automaton = self._build_automaton(keywords)
+            for article_id, content in articles:
+                yield article_id, self._find_all_matches(content, keywords, automaton)
+            return
+
+        workers = os.cpu_count() or 1
+        chunk_size = -(-len(articles) // (workers * SCAN_CHUNKS_PER_WORKER))
+        chunks = (
+            articles[i:i + chunk_size] for i in range(0, len(articles), chunk_size)
+        )
+
+        loop = asyncio.get_running_loop()
+        pool = get_scan_pool()
+        pending: Deque[asyncio.Future] = deque()
+
+        def submit_next() -> None:
+            chunk = next(chunks, None)
+            if chunk is not None:
+                pending.append(
+                    loop.run_in_executor(pool, _scan_article_chunk, chunk, keywords)
+                )
+
+        for _ in range(workers):
+            submit_next()
+        try:
+            while pending:
+                chunk_result = await pending.popleft()
+                submit_next()
+                for item in chunk_result:
+                    yield item
+        finally:
+            for future in pending:
+                future.cancel()
+
+    @staticmethod
+    def _build_automaton(keywords: List[str]):
+        """Build an Aho-Corasick automaton over the lowercased keywords.
+
+        Args:
+            keywords: Keywords to search for
+
+        Returns:
+            The automaton, or None if pyahocorasick is not installed or
+            there are no keywords
+        """
+        keywords_lower = {keyword.lower() for keyword in keywords if keyword}
+        if ahocorasick is None or not keywords_lower:
+            return None
+
+        automaton = ahocorasick.Automaton()
+        for keyword_lower in keywords_lower:
+            automaton.add_word(keyword_lower, keyword_lower)
+        automaton.make_automaton()
+        return automaton
+
+    def _find_all_matches(
+        self,
+        content: str,
+        keywords: List[str],
+        automaton=None,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Find all occurrences of several keywords in content.
+
+        Matches follow the same rules as ``_find_keyword_matches``: word
+        boundaries on both sides and no overlapping matches of the same
+        keyword.
+
+        Args:
+            content: The content to search
+            keywords: The keywords to find
+            automaton: Automaton from ``_build_automaton`` for these keywords;
+                without one, each keyword is scanned separately
+
+        Returns:
+            Matches with position and context offsets, keyed by lowercased keyword
+        """
+        # The automaton holds lowercased keywords, so it needs lowercased
+        # content; one copy per article covers every keyword
+        content_lower = content.lower() if automaton is not None else None
+
+        # Automaton offsets index the content only if lowercasing kept its
+        # length (e.g. "İ" lowercases to two code points); otherwise, and
+        # without an automaton, case-insensitive regexes scan the original
+        # content for each keyword, with no copy
+        if content_lower is None or len(content_lower) != len(content):
+            return {
+                keyword_lower: self._find_keyword_matches(content, keyword_lower)
+                for keyword_lower in {keyword.lower() for keyword in keywords if keyword}
+            }
+
+        matches: Dict[str, List[Dict[str, Any]]] = {}
+        last_end: Dict[str, int] = {}
+        for end_index, keyword_lower in automaton.iter(content_lower):
+            end = end_index + 1
+            position = end - len(keyword_lower)
+            if position < last_end.get(keyword_lower, 0):
+                continue
+            if not (
+                _at_word_boundary(content_lower, position)
+                and _at_word_boundary(content_lower, end)
+            ):
+                continue
+
+            last_end[keyword_lower] = end
+            matches.setdefault(keyword_lower, []).append({
+                "position": position,
+                # Surrounding context (100 chars before and after), as offsets
+                "context_start": max(0, position - 100),
+                "context_end": min(len(content), end + 100),
+            })
+
+        return matches
+
+    def _get_pattern(self, keyword_lower: str) -> Pattern[str]:
+        """Get the compiled word-boundary pattern for a lowercased keyword."""
+        pattern = self._pattern_cache.get(keyword_lower)
+        if pattern is None:
+            # Use word boundary matching for more accurate results; matching
+            # case-insensitively avoids a lowercased copy of the content
+            pattern = re.compile(
+                r"\b" + re.escape(keyword_lower) + r"\b", re.IGNORECASE
+            )
+            self._pattern_cache[keyword_lower] = pattern
+        return pattern
+
     def _find_keyword_matches(
         self,
         content: str,
@@ -167,34 +450,70 @@ class BasicInternalLinker:
             keyword: The keyword to find
 
         Returns:
-            List of matches with position and context
+            List of matches with position and context offsets
         """
         matches = []
-        content_lower = content.lower()
-        keyword_lower = keyword.lower()
-
-        # Use word boundary matching for more accurate results
-        pattern = r"\b" + re.escape(keyword_lower) + r"\b"
+        pattern = self._get_pattern(keyword.lower())
 
-        for match in re.finditer(pattern, content_lower):
+        for match in pattern.finditer(content):
             position = match.start()
-            # Get surrounding context (100 chars before and after)
-            start = max(0, position - 100)
-            end = min(len(content), position + len(keyword) + 100)
-            context = content[start:end]
-
+            # Surrounding context (100 chars before and after), as offsets
+            # into content so no substring is copied per match
             matches.append({
                 "position": position,
-                "context": context,
+                "context_start": max(0, position - 100),
+                "context_end": min(len(content), position + len(keyword) + 100),
             })
 
         return matches
 
+    async def iter_reverse_link_opportunities(
+        self,
+        new_article_id: UUID,
+        new_article_content: str,
+        old_articles: List[Dict[str, Any]],
+    ) -> AsyncIterator[InternalLinkOpportunity]:
+        """Yield opportunities to link FROM the new article TO existing ones.
+
+        Args:
+            new_article_id: ID of the new article
+            new_article_content: Content of the new article
+            old_articles: Published articles to link to
+
+        Yields:
+            Link opportunities, in article then keyword order
+        """
+        candidates = [old for old in old_articles if old["id"] != new_article_id]
+
+        # Scan the new article once for the keywords of every existing article
+        all_keywords = [
+            keyword for old in candidates for keyword in old.get("target_keywords", [])
+        ]
+        all_matches = self._find_all_matches(
+            new_article_content, all_keywords, self._build_automaton(all_keywords)
+        )
+
+        for old in candidates:
+            old_id = old["id"]
+            for keyword in old.get("target_keywords", []):
+                for match in all_matches.get(keyword.lower(), []):
+                    yield InternalLinkOpportunity(
+                        from_article_id=new_article_id,
+                        to_article_id=old_id,
+                        keyword=keyword,
+                        position=match["position"],
+                        context_start=match["context_start"],
+                        context_end=match["context_end"],
+                        source_content=new_article_content,
+                    )
+
     async def find_reverse_link_opportunities(
         self,
         new_article_id: UUID,
         new_article_content: str,
         workspace_id: UUID,
+        old_articles: Optional[List[Dict[str, Any]]] = None,
+        limit: Optional[int] = None,
     ) -> List[InternalLinkOpportunity]:
         """Find opportunities to link FROM the new article TO existing ones.
 
@@ -202,34 +521,21 @@ class BasicInternalLinker:
             new_article_id: ID of the new article
             new_article_content: Content of the new article
             workspace_id: The workspace ID
+            old_articles: Published articles, if already fetched
+            limit: Stop after this many opportunities (default: no limit)
 
         Returns:
             List of link opportunities
         """
-        old_articles = await self.get_published_articles(workspace_id)
-        opportunities = []
-
-        for old in old_articles:
-            old_id = old["id"]
-            old_keywords = old.get("target_keywords", [])
-
-            # Skip self
-            if old_id == new_article_id:
-                continue
-
-            # Search for keywords from old articles in the new article
-            for keyword in old_keywords:
-                matches = self._find_keyword_matches(new_article_content, keyword)
-                for match in matches:
-                    opportunities.append(
-                        InternalLinkOpportunity(
-                            from_article_id=new_article_id,
-                            to_article_id=old_id,
-                            keyword=keyword,
-                            position=match["position"],
-                            context=match["context"],
-                        )
-                    )
+        if old_articles is None:
+            old_articles = await self.get_published_articles(workspace_id)
+
+        opportunities = await _collect(
+            self.iter_reverse_link_opportunities(
+                new_article_id, new_article_content, old_articles
+            ),
+            limit,
+        )
 
         logger.info(
             f"Found {len(opportunities)} reverse link opportunities for article {new_article_id}"
@@ -242,6 +548,7 @@ class BasicInternalLinker:
         new_article_content: str,
         target_keywords: List[str],
         workspace_id: UUID,
+        limit: Optional[int] = MAX_LINK_OPPORTUNITIES,
     ) -> Tuple[List[InternalLinkOpportunity], List[InternalLinkOpportunity]]:
         """Get all link opportunities (both directions) for a new article.
 
@@ -250,21 +557,29 @@ class BasicInternalLinker:
             new_article_content: Content of the new article
             target_keywords: Keywords for the new article
             workspace_id: The workspace ID
+            limit: Maximum opportunities per direction (None for no limit)
 
         Returns:
             Tuple of (to_opportunities, from_opportunities)
         """
+        # Query the published articles once for both directions
+        old_articles = await self.get_published_articles(workspace_id)
+
         to_opportunities = await self.find_link_opportunities(
             new_article_id=new_article_id,
             new_article_content=new_article_content,
             target_keywords=target_keywords,
             workspace_id=workspace_id,
+            old_articles=old_articles,
+            limit=limit,
         )
 
         from_opportunities = await self.find_reverse_link_opportunities(
             new_article_id=new_article_id,
             new_article_content=new_article_content,
             workspace_id=workspace_id,
+            old_articles=old_articles,
+            limit=limit,
         )
 
         return to_opportunities, from_opportunities
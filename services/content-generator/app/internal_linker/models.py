@@ -1,9 +1,11 @@
 """Data models for internal linking."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
+import numpy as np
+
 
 @dataclass
 class InternalLinkOpportunity:
@@ -13,8 +15,19 @@ class InternalLinkOpportunity:
     to_article_id: UUID
     keyword: str
     position: Optional[int] = None  # Character position in content
-    context: Optional[str] = None  # Surrounding text context
     similarity_score: Optional[float] = None
+    # Context as offsets into the matched article's content; the content is
+    # shared by reference, so no substring is copied per opportunity
+    context_start: Optional[int] = None
+    context_end: Optional[int] = None
+    source_content: Optional[str] = field(default=None, repr=False, compare=False)
+
+    @property
+    def context(self) -> Optional[str]:
+        """Surrounding text context, sliced from the source content on demand."""
+        if self.source_content is None or self.context_start is None:
+            return None
+        return self.source_content[self.context_start:self.context_end]
 
 
 @dataclass
@@ -25,7 +38,7 @@ class RelatedArticle:
     title: str
     url: Optional[str] = None
     similarity: float = 0.0
-    embedding: Optional[List[float]] = None
+    embedding: Optional[np.ndarray] = field(default=None, repr=False, compare=False)  # float32
     target_keywords: Optional[List[str]] = None
 
 
@@ -1,39 +1,169 @@
 """Semantic Internal Linker using sentence embeddings."""
 
+import asyncio
+import hashlib
 import logging
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Union
 from uuid import UUID
 
+import numpy as np
+
+from app.core.config import get_settings
+from app.internal_linker import quantize
 from app.internal_linker.models import InternalLinkOpportunity, RelatedArticle
 
 logger = logging.getLogger(__name__)
 
-# Maximum content length for embedding to avoid excessive processing
-MAX_CONTENT_LENGTH = 1000
+# The model's tokenizer truncates input to its max_seq_length tokens; texts
+# are first cut to this many characters, a coarse bound well past that limit,
+# so long articles are not tokenized in full
+MAX_ENCODE_CHARS = 4096
+
+# From this many indexed articles, candidates are pre-filtered by the Hamming
+# distance of sign-bit codes and only the survivors are scored exactly
+BINARY_PREFILTER_MIN_ARTICLES = 1000
+# Candidates kept by the pre-filter per requested result
+BINARY_PREFILTER_FACTOR = 4
+
+# Embeddings are cached in process by model and content hash, so unchanged
+# articles skip the transformer on every workspace scan
+EMBEDDING_CACHE_MAX_ENTRIES = 4096
+
+_embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+# Texts per forward pass when encoding several at once
+ENCODE_BATCH_SIZE = 32
+
+# Index rows scored per matrix product when process_workspace compares every
+# article with every other
+WORKSPACE_BLOCK_ROWS = 256
+
+# SimSIMD provides hand-tuned cosine kernels (AVX-512, NEON, ...); fall back
+# to NumPy when the optional package is not installed
+try:
+    import simsimd
+
+    if not (hasattr(simsimd, "cosine") and hasattr(simsimd, "cdist")):
+        simsimd = None
+except ImportError:
+    simsimd = None
 
+if simsimd is not None:
+    _capabilities = simsimd.get_capabilities()
+    logger.debug(
+        "SimSIMD cosine kernels enabled: "
+        + ", ".join(name for name, enabled in _capabilities.items() if enabled)
+    )
 
-def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
+
+Vector = Union[Sequence[float], np.ndarray]
+
+
+class EmbeddingIndex(NamedTuple):
+    """Article embeddings stacked so similarities are computed in one call."""
+
+    matrix: np.ndarray  # One row per indexed article (int8, or L2-normalized float32)
+    ids: np.ndarray  # Article IDs as strings, for excluding an article with NumPy
+    articles: List[Dict[str, Any]]  # Indexed article dicts, in row order
+    bits: Optional[np.ndarray] = None  # Sign-bit codes for the Hamming pre-filter
+
+
+@lru_cache(maxsize=1)
+def _published_articles_stmt():
+    """Published articles of a workspace (bound as ``wsid``), built once and reused.
+
+    The models are imported on first use, so mock mode needs no database setup.
+    """
+    from sqlalchemy import bindparam, select
+    from sqlalchemy.orm import raiseload
+    from app.models.article import Article
+    from app.models.published_post import PublishedPost
+
+    return (
+        select(Article)
+        .join(PublishedPost, Article.id == PublishedPost.article_id)
+        .where(Article.workspace_id == bindparam("wsid"))
+        .where(Article.status == "published")
+        .options(raiseload(Article.images))
+    )
+
+
+def as_vector(vec: Vector) -> np.ndarray:
+    """Convert an embedding (e.g. a list loaded from JSON) to a float32 array."""
+    return np.asarray(vec, dtype=np.float32)
+
+
+def _is_int8(vec: Vector) -> bool:
+    """Check whether a vector is an int8 (quantized) array."""
+    return isinstance(vec, np.ndarray) and vec.dtype == np.int8
+
+
+def cosine_similarity(vec1: Optional[Vector], vec2: Optional[Vector]) -> float:
     """Calculate cosine similarity between two vectors.
 
     Args:
-        vec1: First vector
-        vec2: Second vector
+        vec1: First vector (list, float32 array or int8 quantized array)
+        vec2: Second vector (list, float32 array or int8 quantized array)
 
     Returns:
         Cosine similarity score between 0 and 1
     """
-    if not vec1 or not vec2:
+    if vec1 is None or vec2 is None:
         return 0.0
 
-    # Calculate dot product and magnitudes
-    dot_product = sum(a * b for a, b in zip(vec1, vec2))
-    magnitude1 = sum(a * a for a in vec1) ** 0.5
-    magnitude2 = sum(b * b for b in vec2) ** 0.5
+    if simsimd is not None and _is_int8(vec1) and _is_int8(vec2):
+        # Quantized embeddings: integer dot-product kernels, no float conversion
+        if vec1.size == 0 or vec2.size == 0:
+            return 0.0
+        return 1.0 - float(simsimd.cosine(vec1, vec2))
 
-    if magnitude1 == 0 or magnitude2 == 0:
+    v1 = as_vector(vec1)
+    v2 = as_vector(vec2)
+    if v1.size == 0 or v2.size == 0:
         return 0.0
 
-    return dot_product / (magnitude1 * magnitude2)
+    if simsimd is not None:
+        # SimSIMD returns the cosine distance
+        return 1.0 - float(simsimd.cosine(v1, v2))
+
+    # One sqrt over the product of squared magnitudes
+    denominator = float(np.sqrt(np.vdot(v1, v1) * np.vdot(v2, v2)))
+    if denominator == 0:
+        return 0.0
+
+    return float(np.dot(v1, v2)) / denominator
+
+
+def dot_similarity(vec1: Vector, vec2: Vector) -> float:
+    """Cosine similarity of two L2-normalized vectors (e.g. from ``encode``).
+
+    Normalized vectors have unit magnitude, so the similarity is the plain
+    dot product; use ``cosine_similarity`` for vectors of unknown norm.
+    """
+    return float(np.dot(as_vector(vec1), as_vector(vec2)))
+
+
+def hamming_distances(codes: np.ndarray, query_code: np.ndarray) -> np.ndarray:
+    """Hamming distance between each row of packed binary codes and a query code."""
+    if simsimd is not None:
+        distances = simsimd.cdist(codes, query_code[np.newaxis, :], metric="hamming", dtype="bin8")
+        return np.asarray(distances)[:, 0]
+    return np.unpackbits(np.bitwise_xor(codes, query_code), axis=1).sum(axis=1)
+
+
+def _similarities(matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """Cosine similarity of each matrix row (see EmbeddingIndex) with a query."""
+    if matrix.dtype == np.int8:
+        query_i8, _ = quantize.quantize_int8(query)
+        # The int8 kernel is picked from the arrays' dtype
+        distances = simsimd.cdist(matrix, query_i8[np.newaxis, :], metric="cosine")
+        return 1.0 - np.asarray(distances, dtype=np.float32)[:, 0]
+    if simsimd is not None:
+        distances = simsimd.cdist(matrix, query[np.newaxis, :], metric="cosine")
+        return 1.0 - np.asarray(distances, dtype=np.float32)[:, 0]
+    return matrix @ (query / np.float32(np.linalg.norm(query)))
 
 
 class SemanticInternalLinker:
@@ -48,6 +178,7 @@ class SemanticInternalLinker:
         model_name: str = "all-MiniLM-L6-v2",
         db=None,
         mock_mode: bool = False,
+        precision: Optional[str] = None,
     ):
         """Initialize the Semantic Internal Linker.
 
@@ -55,9 +186,11 @@ class SemanticInternalLinker:
             model_name: Name of the sentence-transformers model to use
             db: Database session for querying articles
             mock_mode: If True, use mock data for testing
+            precision: Stored embedding precision (default: EMBEDDING_PRECISION)
         """
         self.model_name = model_name
         self.db = db
+        self.precision = precision or get_settings().EMBEDDING_PRECISION
         self._mock_mode = mock_mode
         self._model = None
         self._mock_articles: List[Dict[str, Any]] = []
@@ -99,32 +232,107 @@ class SemanticInternalLinker:
             logger.error(f"Failed to load model {self.model_name}: {e}")
             return None
 
-    def encode(self, text: str) -> Optional[List[float]]:
+    def encode(self, text: str) -> Optional[np.ndarray]:
         """Encode text to embedding vector.
 
         Args:
             text: Text to encode
 
         Returns:
-            Embedding vector or None if encoding fails
+            L2-normalized float32 embedding vector or None if encoding fails
         """
+        embeddings = self.encode_batch([text])
+        if embeddings is None:
+            return None
+        return embeddings[0]
+
+    @staticmethod
+    def _mock_embedding(text: str) -> np.ndarray:
+        """Deterministic mock embedding from an RNG seeded by a hash of the text."""
+        seed = int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+        return np.random.default_rng(seed).random(384, dtype=np.float32)
+
+    def encode_batch(self, texts: List[str]) -> Optional[np.ndarray]:
+        """Encode several texts with one model call.
+
+        Cached texts are not re-encoded; the rest go to the model together,
+        so tokenization and inference run over mini-batches.
+
+        Args:
+            texts: Texts to encode
+
+        Returns:
+            float32 array with one L2-normalized embedding per text, or None
+            if encoding fails
+        """
+        texts = [text[:MAX_ENCODE_CHARS] for text in texts]
+
         if self._mock_mode:
-            # Return a simple mock embedding based on text length
-            import hashlib
+            embeddings = np.array(
+                [self._mock_embedding(text) for text in texts], dtype=np.float32
+            ).reshape(len(texts), 384)
+            if embeddings.size:
+                embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+            return embeddings
+
+        keys = [
+            hashlib.blake2b(f"{self.model_name}\x1f{text}".encode(), digest_size=16).hexdigest()
+            for text in texts
+        ]
+        embeddings: List[Optional[np.ndarray]] = []
+        for key in keys:
+            cached = _embedding_cache.get(key)
+            if cached is not None:
+                _embedding_cache.move_to_end(key)
+            embeddings.append(cached)
+
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            model = self._get_model()
+            if not model:
+                return None
+
+            try:
+                encoded = np.asarray(
+                    model.encode(
+                        [texts[i] for i in missing],
+                        batch_size=ENCODE_BATCH_SIZE,
+                        convert_to_numpy=True,
+                        normalize_embeddings=True,
+                        show_progress_bar=False,
+                    ),
+                    dtype=np.float32,
+                )
+            except Exception as e:
+                logger.error(f"Failed to encode text: {e}")
+                return None
 
-            hash_val = int(hashlib.sha256(text.encode()).hexdigest(), 16)
-            return [(hash_val >> i) % 256 / 256.0 for i in range(384)]
+            for i, embedding in zip(missing, encoded):
+                embeddings[i] = embedding
+                _embedding_cache[keys[i]] = embedding
+            while len(_embedding_cache) > EMBEDDING_CACHE_MAX_ENTRIES:
+                _embedding_cache.popitem(last=False)
 
-        model = self._get_model()
-        if not model:
-            return None
+        if not embeddings:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.vstack(embeddings)
 
-        try:
-            embedding = model.encode(text)
-            return embedding.tolist()
-        except Exception as e:
-            logger.error(f"Failed to encode text: {e}")
+    def encode_for_storage(self, text: str) -> Optional[Dict[str, Any]]:
+        """Encode text into an embedding for article metadata.
+
+        The embedding is stored at the linker's precision; merge the result
+        into ``generation_metadata``.
+
+        Args:
+            text: Text to encode
+
+        Returns:
+            Metadata entries holding the embedding, or None if encoding fails
+        """
+        embedding = self.encode(text)
+        if embedding is None:
             return None
+        return quantize.to_storage(embedding, self.precision)
 
     async def get_published_articles_with_embeddings(
         self,
@@ -144,42 +352,115 @@ class SemanticInternalLinker:
         if not self.db:
             return []
 
-        from sqlalchemy import select
-        from app.models.article import Article
-        from app.models.published_post import PublishedPost
-
         try:
-            query = (
-                select(Article)
-                .join(PublishedPost, Article.id == PublishedPost.article_id)
-                .where(Article.workspace_id == workspace_id)
-                .where(Article.status == "published")
-            )
-            result = await self.db.execute(query)
+            result = await self.db.execute(_published_articles_stmt(), {"wsid": workspace_id})
             articles = result.scalars().all()
 
+            stored = [quantize.from_storage(article.generation_metadata or {}) for article in articles]
+
+            # If no pre-computed embedding, compute them all in one batch and
+            # store them so each is only computed once
+            missing = [
+                i for i, article in enumerate(articles)
+                if stored[i] is None and article.content
+            ]
+            embeddings = None
+            if missing:
+                embeddings = self.encode_batch(
+                    [articles[i].content for i in missing]
+                )
+                if embeddings is not None:
+                    for i, embedding in zip(missing, embeddings):
+                        entries = quantize.to_storage(embedding, self.precision)
+                        articles[i].generation_metadata = {
+                            **(articles[i].generation_metadata or {}),
+                            **entries,
+                        }
+                        stored[i] = quantize.from_storage(entries)
+
             articles_with_embeddings = []
-            for article in articles:
+            for article, vector in zip(articles, stored):
                 metadata = article.generation_metadata or {}
-                embedding = metadata.get("embedding")
-
-                # If no pre-computed embedding, compute it
-                if not embedding and article.content:
-                    embedding = self.encode(article.content[:MAX_CONTENT_LENGTH])
+                quantized = vector is not None and vector.dtype == np.int8
 
                 articles_with_embeddings.append({
                     "id": article.id,
                     "title": article.title,
                     "content": article.content,
-                    "embedding": embedding,
+                    "embedding": None if quantized else vector,
+                    "embedding_i8": vector if quantized else None,
                     "target_keywords": metadata.get("target_keywords", []),
                 })
 
+            if missing and embeddings is not None:
+                try:
+                    await self.db.commit()
+                except Exception as e:
+                    logger.warning(f"Failed to store computed embeddings: {e}")
+                    await self.db.rollback()
+
             return articles_with_embeddings
         except Exception as e:
             logger.error(f"Failed to get articles with embeddings: {e}")
             return []
 
+    @staticmethod
+    def build_embedding_index(articles: List[Dict[str, Any]]) -> EmbeddingIndex:
+        """Stack article embeddings into one matrix.
+
+        When every embedding is int8 quantized and SimSIMD is available the
+        matrix is kept as int8 for its integer kernels; otherwise it is an
+        L2-normalized float32 matrix. Articles without an embedding, or whose
+        embedding size differs from the first one (e.g. computed by another
+        model), are left out.
+
+        Args:
+            articles: Article dicts with an 'embedding' (float list or array)
+                or 'embedding_i8' (int8 array) entry
+
+        Returns:
+            The embedding index, with binary codes for the Hamming pre-filter
+            from BINARY_PREFILTER_MIN_ARTICLES articles on
+        """
+        indexed = []
+        vectors = []
+        for article in articles:
+            vector = article.get("embedding_i8")
+            if vector is None and article.get("embedding") is not None:
+                vector = as_vector(article["embedding"])
+            if vector is not None and vector.size:
+                indexed.append(article)
+                vectors.append(vector)
+
+        if vectors:
+            dimension = vectors[0].shape[0]
+            keep = [vector.shape[0] == dimension for vector in vectors]
+            if not all(keep):
+                logger.warning(
+                    f"Skipping {keep.count(False)} articles with embeddings of unexpected size"
+                )
+                indexed = [a for a, k in zip(indexed, keep) if k]
+                vectors = [v for v, k in zip(vectors, keep) if k]
+
+        if not indexed:
+            return EmbeddingIndex(np.empty((0, 0), dtype=np.float32), np.empty(0, dtype=str), [])
+
+        ids = np.array([str(article["id"]) for article in indexed])
+        if simsimd is not None and all(_is_int8(vector) for vector in vectors):
+            matrix = np.vstack(vectors)
+        else:
+            # Quantized rows keep their direction when cast, so need no scale
+            matrix = np.vstack(vectors).astype(np.float32)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            matrix /= norms
+
+        bits = None
+        if len(indexed) >= BINARY_PREFILTER_MIN_ARTICLES:
+            bits = quantize.pack_binary(matrix)
+
+        return EmbeddingIndex(matrix, ids, indexed, bits)
+
     async def find_related_articles(
         self,
         new_article_id: UUID,
@@ -187,6 +468,7 @@ class SemanticInternalLinker:
         workspace_id: UUID,
         threshold: float = 0.7,
         max_results: int = 5,
+        articles: Optional[List[Dict[str, Any]]] = None,
     ) -> List[RelatedArticle]:
         """Find semantically related articles.
 
@@ -196,48 +478,104 @@ class SemanticInternalLinker:
             workspace_id: The workspace ID
             threshold: Minimum similarity score (0-1)
             max_results: Maximum number of results to return
+            articles: Already-fetched workspace articles; fetched if omitted
 
         Returns:
             List of related articles sorted by similarity
         """
         # Encode the new article
-        new_embedding = self.encode(new_article_content[:MAX_CONTENT_LENGTH])
-        if not new_embedding:
+        new_embedding = self.encode(new_article_content)
+        if new_embedding is None:
             logger.warning("Failed to encode new article content")
             return []
 
         # Get existing articles with embeddings
-        old_articles = await self.get_published_articles_with_embeddings(workspace_id)
-
-        related = []
-        for old in old_articles:
-            old_id = old["id"]
-
-            # Skip self
-            if old_id == new_article_id:
-                continue
-
-            old_embedding = old.get("embedding")
-            if not old_embedding:
-                continue
-
-            # Calculate similarity
-            similarity = cosine_similarity(new_embedding, old_embedding)
-
-            if similarity >= threshold:
-                related.append(
-                    RelatedArticle(
-                        article_id=old_id,
-                        title=old.get("title", ""),
-                        similarity=similarity,
-                        embedding=old_embedding,
-                        target_keywords=old.get("target_keywords", []),
-                    )
-                )
+        if articles is None:
+            articles = await self.get_published_articles_with_embeddings(workspace_id)
 
-        # Sort by similarity and limit results
-        related.sort(key=lambda x: x.similarity, reverse=True)
-        return related[:max_results]
+        return self.find_related_articles_precomputed(
+            new_article_id=new_article_id,
+            new_embedding=new_embedding,
+            index=self.build_embedding_index(articles),
+            threshold=threshold,
+            max_results=max_results,
+        )
+
+    def find_related_articles_precomputed(
+        self,
+        new_article_id: UUID,
+        new_embedding: Vector,
+        index: EmbeddingIndex,
+        threshold: float = 0.7,
+        max_results: int = 5,
+    ) -> List[RelatedArticle]:
+        """Find articles related to an already-encoded article.
+
+        Args:
+            new_article_id: ID of the new article (excluded from the results)
+            new_embedding: Embedding of the new article
+            index: Index of the candidate articles (see build_embedding_index)
+            threshold: Minimum similarity score (0-1)
+            max_results: Maximum number of results to return
+
+        Returns:
+            List of related articles sorted by similarity
+        """
+        if max_results <= 0 or not index.articles:
+            return []
+
+        query = as_vector(new_embedding)
+        if not np.any(query) or query.shape[0] != index.matrix.shape[1]:
+            logger.warning("New article embedding cannot be compared with stored embeddings")
+            return []
+
+        rows = None
+        candidates = BINARY_PREFILTER_FACTOR * max_results + 1  # +1: self may be among them
+        if index.bits is not None and len(index.articles) > candidates:
+            # Keep the closest candidates by sign-bit Hamming distance
+            distances = hamming_distances(index.bits, quantize.pack_binary(query))
+            rows = np.sort(np.argpartition(distances, candidates - 1)[:candidates])
+
+        # Cosine similarity with every (remaining) article in one call
+        if rows is None:
+            rows = np.arange(len(index.articles))
+            similarities = _similarities(index.matrix, query)
+        else:
+            similarities = _similarities(index.matrix[rows], query)
+
+        return self._rank_related(index, rows, similarities, new_article_id, threshold, max_results)
+
+    @staticmethod
+    def _rank_related(
+        index: EmbeddingIndex,
+        rows: np.ndarray,
+        similarities: np.ndarray,
+        new_article_id: UUID,
+        threshold: float,
+        max_results: int,
+    ) -> List[RelatedArticle]:
+        """Build the best-scoring related articles from index rows and their scores."""
+        # Skip self
+        keep = np.flatnonzero(
+            (similarities >= threshold) & (index.ids[rows] != str(new_article_id))
+        )
+        if len(keep) > max_results:
+            # Top-K in linear time; only those K are sorted below
+            top = np.argpartition(-similarities[keep], max_results - 1)[:max_results]
+            keep = keep[np.sort(top)]
+        # Stable, so equal scores keep article order
+        keep = keep[np.argsort(-similarities[keep], kind="stable")]
+
+        return [
+            RelatedArticle(
+                article_id=index.articles[rows[i]]["id"],
+                title=index.articles[rows[i]].get("title", ""),
+                similarity=float(similarities[i]),
+                embedding=index.articles[rows[i]].get("embedding"),
+                target_keywords=index.articles[rows[i]].get("target_keywords", []),
+            )
+            for i in keep
+        ]
 
     async def find_semantic_link_opportunities(
         self,
@@ -246,6 +584,7 @@ class SemanticInternalLinker:
         target_keywords: List[str],
         workspace_id: UUID,
         threshold: float = 0.7,
+        articles: Optional[List[Dict[str, Any]]] = None,
     ) -> List[InternalLinkOpportunity]:
         """Find link opportunities based on semantic similarity.
 
@@ -255,6 +594,7 @@ class SemanticInternalLinker:
             target_keywords: Keywords for anchor text
             workspace_id: The workspace ID
             threshold: Minimum similarity threshold
+            articles: Already-fetched workspace articles; fetched if omitted
 
         Returns:
             List of link opportunities with similarity scores
@@ -264,8 +604,23 @@ class SemanticInternalLinker:
             new_article_content=new_article_content,
             workspace_id=workspace_id,
             threshold=threshold,
+            articles=articles,
+        )
+
+        opportunities = self._to_opportunities(new_article_id, related_articles)
+
+        logger.info(
+            f"Found {len(opportunities)} semantic link opportunities "
+            f"for article {new_article_id}"
         )
+        return opportunities
 
+    @staticmethod
+    def _to_opportunities(
+        new_article_id: UUID,
+        related_articles: List[RelatedArticle],
+    ) -> List[InternalLinkOpportunity]:
+        """Turn related articles into link opportunities from the new article."""
         opportunities = []
         for related in related_articles:
             # Use the first target keyword or the article title as anchor
@@ -283,43 +638,65 @@ class SemanticInternalLinker:
                     similarity_score=related.similarity,
                 )
             )
-
-        logger.info(
-            f"Found {len(opportunities)} semantic link opportunities "
-            f"for article {new_article_id}"
-        )
         return opportunities
 
     async def process_workspace(
         self,
         workspace_id: UUID,
         threshold: float = 0.7,
+        max_results: int = 5,
     ) -> Dict[str, Any]:
         """Process all articles in a workspace for internal linking.
 
         Args:
             workspace_id: The workspace ID
             threshold: Similarity threshold
+            max_results: Maximum related articles per article
 
         Returns:
             Dict with processing results
         """
         articles = await self.get_published_articles_with_embeddings(workspace_id)
-
-        total_opportunities = []
-
-        for article in articles:
-            opportunities = await self.find_semantic_link_opportunities(
-                new_article_id=article["id"],
-                new_article_content=article.get("content", ""),
-                target_keywords=article.get("target_keywords", []),
-                workspace_id=workspace_id,
-                threshold=threshold,
+        index = self.build_embedding_index(articles)
+
+        # Indexed articles are compared from their stored embeddings, each
+        # block of rows against the whole index in one matrix product
+        results: List[List[InternalLinkOpportunity]] = []
+        all_rows = np.arange(len(index.articles))
+        for start in range(0, len(index.articles), WORKSPACE_BLOCK_ROWS):
+            block = index.matrix[start:start + WORKSPACE_BLOCK_ROWS]
+            # Float rows are normalized, so the product is the cosine
+            scores = block @ index.matrix.T if index.matrix.dtype == np.float32 else None
+            for offset, article in enumerate(index.articles[start:start + len(block)]):
+                if scores is not None:
+                    related = self._rank_related(
+                        index, all_rows, scores[offset], article["id"], threshold, max_results
+                    )
+                else:
+                    related = self.find_related_articles_precomputed(
+                        article["id"], block[offset], index, threshold, max_results
+                    )
+                results.append(self._to_opportunities(article["id"], related))
+
+        # Articles without a usable stored embedding are encoded in one batch,
+        # off the event loop, and searched against the index built above
+        indexed_ids = set(index.ids.tolist())
+        unindexed = [article for article in articles if str(article["id"]) not in indexed_ids]
+        if unindexed:
+            embeddings = await asyncio.to_thread(
+                self.encode_batch, [article.get("content", "") for article in unindexed]
             )
-            total_opportunities.extend(opportunities)
+            if embeddings is None:
+                logger.warning(f"Failed to encode {len(unindexed)} articles without embeddings")
+            else:
+                for article, embedding in zip(unindexed, embeddings):
+                    related = self.find_related_articles_precomputed(
+                        article["id"], embedding, index, threshold, max_results
+                    )
+                    results.append(self._to_opportunities(article["id"], related))
 
         return {
             "workspace_id": str(workspace_id),
             "articles_processed": len(articles),
-            "opportunities_found": len(total_opportunities),
+            "opportunities_found": sum(len(opportunities) for opportunities in results),
         }
@@ -3,10 +3,14 @@
 import logging
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, Tuple
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Provider order for the availability bitmask in selection cache keys
+_PROVIDER_BITS = ("openai", "anthropic", "google", "xai")
+
 
 class Priority(Enum):
     """Content generation priority levels."""
@@ -16,9 +20,9 @@ class Priority(Enum):
     LOW = "low"
 
 
-@dataclass
+@dataclass(frozen=True)
 class ModelSelection:
-    """Selected model and provider information."""
+    """Selected model and provider information (shared between cached lookups)."""
 
     provider: str
     model: str
@@ -77,6 +81,11 @@ class CostRouter:
         ("xai", "grok-2"): 0.01,
     }
 
+    # ESTIMATED_COSTS entries sorted cheapest first, for budget searches
+    _COSTS_SORTED: Tuple[Tuple[Tuple[str, str], float], ...] = tuple(
+        sorted(ESTIMATED_COSTS.items(), key=lambda kv: kv[1])
+    )
+
     def __init__(self, llm_gateway=None):
         """Initialize the cost router.
 
@@ -120,6 +129,12 @@ class CostRouter:
         Returns:
             ModelSelection with provider, model, and reasoning
         """
+        # Hot path: default route by priority name, no parsing or lookups
+        if self.llm_gateway is None and (max_budget_usd is None or word_count is None):
+            selection = _FAST_DEFAULTS.get(priority.lower())
+            if selection is not None:
+                return selection
+
         # Convert string priority to enum
         try:
             priority_enum = Priority(priority.lower())
@@ -127,52 +142,22 @@ class CostRouter:
             logger.warning(f"Invalid priority '{priority}', defaulting to MEDIUM")
             priority_enum = Priority.MEDIUM
 
-        # Get default route for priority
-        provider, model = self.DEFAULT_ROUTES[priority_enum]
-
-        # Check if we need to respect budget constraints
-        if max_budget_usd is not None and word_count is not None:
-            # Estimate tokens needed (rough: 1.5 tokens per word)
-            estimated_tokens = int(word_count * 1.5)
-            estimated_cost = (estimated_tokens / 1000) * self.ESTIMATED_COSTS.get(
-                (provider, model), 0.01
-            )
-
-            if estimated_cost > max_budget_usd:
-                # Find a cheaper alternative
-                cheaper_selection = self._find_cheaper_model(
-                    priority_enum, estimated_tokens, max_budget_usd
-                )
-                if cheaper_selection:
-                    return cheaper_selection
+        # A budget applies only together with a word count to estimate from
+        if max_budget_usd is None or word_count is None:
+            word_count = max_budget_usd = None
 
-        # Check if provider is available (if gateway is configured)
+        available_mask = -1
         if self.llm_gateway:
             available = self.llm_gateway.get_available_providers()
-            if provider not in available:
-                # Try fallback routes
-                for fallback_provider, fallback_model in self.FALLBACK_ROUTES.get(
-                    priority_enum, []
-                ):
-                    if fallback_provider in available:
-                        return ModelSelection(
-                            provider=fallback_provider,
-                            model=fallback_model,
-                            estimated_cost_per_1k_tokens=self.ESTIMATED_COSTS.get(
-                                (fallback_provider, fallback_model), 0.01
-                            ),
-                            reason=f"Fallback for {priority} priority (primary unavailable)",
-                        )
+            available_mask = sum(
+                1 << bit for bit, name in enumerate(_PROVIDER_BITS) if name in available
+            )
 
-        return ModelSelection(
-            provider=provider,
-            model=model,
-            estimated_cost_per_1k_tokens=self.ESTIMATED_COSTS.get((provider, model), 0.01),
-            reason=f"Default route for {priority} priority",
-        )
+        return _select(priority_enum, word_count, max_budget_usd, available_mask)
 
+    @classmethod
     def _find_cheaper_model(
-        self,
+        cls,
         priority: Priority,
         estimated_tokens: int,
         max_budget_usd: float,
@@ -187,20 +172,22 @@ class CostRouter:
         Returns:
             ModelSelection if found, None otherwise
         """
-        # Sort models by cost
-        sorted_models = sorted(self.ESTIMATED_COSTS.items(), key=lambda x: x[1])
-
-        for (provider, model), cost_per_1k in sorted_models:
-            estimated_cost = (estimated_tokens / 1000) * cost_per_1k
-            if estimated_cost <= max_budget_usd:
-                return ModelSelection(
-                    provider=provider,
-                    model=model,
-                    estimated_cost_per_1k_tokens=cost_per_1k,
-                    reason=f"Budget-optimized selection (max: ${max_budget_usd})",
-                )
+        if not cls._COSTS_SORTED:
+            return None
 
-        return None
+        # Models are sorted by cost, so only the cheapest needs checking: if
+        # it does not fit the budget, none of the others do either
+        (provider, model), cost_per_1k = cls._COSTS_SORTED[0]
+        estimated_cost = (estimated_tokens / 1000) * cost_per_1k
+        if estimated_cost > max_budget_usd:
+            return None
+
+        return ModelSelection(
+            provider=provider,
+            model=model,
+            estimated_cost_per_1k_tokens=cost_per_1k,
+            reason=f"Budget-optimized selection (max: ${max_budget_usd})",
+        )
 
     def estimate_cost(
         self,
@@ -224,5 +211,95 @@ class CostRouter:
         return (estimated_tokens / 1000) * cost_per_1k
 
 
+def _is_available(available_mask: int, provider: str) -> bool:
+    """Check a provider's bit in an availability mask."""
+    if provider not in _PROVIDER_BITS:
+        return available_mask == -1
+    return bool(available_mask & (1 << _PROVIDER_BITS.index(provider)))
+
+
+def _try_budget(
+    priority: Priority,
+    word_count: Optional[int],
+    max_budget_usd: Optional[float],
+) -> Optional[ModelSelection]:
+    """Cheapest model within budget, if the default route would exceed it."""
+    if max_budget_usd is None:
+        return None
+
+    provider, model = CostRouter.DEFAULT_ROUTES[priority]
+    # Estimate tokens needed (rough: 1.5 tokens per word)
+    estimated_tokens = int(word_count * 1.5)
+    cost_per_1k = CostRouter.ESTIMATED_COSTS.get((provider, model), 0.01)
+    if (estimated_tokens / 1000) * cost_per_1k <= max_budget_usd:
+        return None
+    return CostRouter._find_cheaper_model(priority, estimated_tokens, max_budget_usd)
+
+
+def _try_availability(priority: Priority, available_mask: int) -> Optional[ModelSelection]:
+    """First available fallback route, if the default provider is unavailable."""
+    provider, _ = CostRouter.DEFAULT_ROUTES[priority]
+    if _is_available(available_mask, provider):
+        return None
+
+    for fallback_provider, fallback_model in CostRouter.FALLBACK_ROUTES.get(priority, []):
+        if _is_available(available_mask, fallback_provider):
+            return ModelSelection(
+                provider=fallback_provider,
+                model=fallback_model,
+                estimated_cost_per_1k_tokens=CostRouter.ESTIMATED_COSTS.get(
+                    (fallback_provider, fallback_model), 0.01
+                ),
+                reason=f"Fallback for {priority.value} priority (primary unavailable)",
+            )
+    return None
+
+
+def _default_route(priority: Priority) -> ModelSelection:
+    """Default route for a priority."""
+    provider, model = CostRouter.DEFAULT_ROUTES[priority]
+    return ModelSelection(
+        provider=provider,
+        model=model,
+        estimated_cost_per_1k_tokens=CostRouter.ESTIMATED_COSTS.get((provider, model), 0.01),
+        reason=f"Default route for {priority.value} priority",
+    )
+
+
+@lru_cache(maxsize=512)
+def _select(
+    priority: Priority,
+    word_count: Optional[int],
+    max_budget_usd: Optional[float],
+    available_mask: int,
+) -> ModelSelection:
+    """Select a model for exact inputs; a pure function, so results are cached.
+
+    Routing tries, in order: a cheaper model to respect the budget, a
+    fallback when the default provider is unavailable, the default route.
+
+    Args:
+        priority: Priority level
+        word_count: Target word count, or None when no budget applies
+        max_budget_usd: Maximum budget in USD, or None
+        available_mask: Bitmask of available providers (-1: all available)
+
+    Returns:
+        ModelSelection with provider, model, and reasoning
+    """
+    return (
+        _try_budget(priority, word_count, max_budget_usd)
+        or _try_availability(priority, available_mask)
+        or _default_route(priority)
+    )
+
+
+# Default selection per priority name when neither a budget nor provider
+# availability applies
+_FAST_DEFAULTS: Dict[str, ModelSelection] = {
+    priority.value: _select(priority, None, None, -1) for priority in Priority
+}
+
+
 # Global cost router instance
 cost_router = CostRouter()
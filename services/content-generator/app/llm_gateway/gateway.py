@@ -1,16 +1,23 @@
 """LLM Gateway - Multi-provider LLM abstraction layer."""
 
+import importlib
 import logging
-from typing import Dict, List, Optional, Type
+from typing import Dict, List, Optional, Tuple
 
+from app.llm_gateway.limits import get_limiter
 from app.llm_gateway.providers.base import LLMProvider, LLMResponse
-from app.llm_gateway.providers.openai_provider import OpenAIProvider
-from app.llm_gateway.providers.anthropic_provider import AnthropicProvider
-from app.llm_gateway.providers.google_provider import GoogleProvider
-from app.llm_gateway.providers.xai_provider import XAIProvider
 
 logger = logging.getLogger(__name__)
 
+# Provider name -> (module, class). Providers import their SDK and build an
+# API client, so each is only imported and instantiated on first use.
+_PROVIDER_FACTORIES: Dict[str, Tuple[str, str]] = {
+    "openai": ("app.llm_gateway.providers.openai_provider", "OpenAIProvider"),
+    "anthropic": ("app.llm_gateway.providers.anthropic_provider", "AnthropicProvider"),
+    "google": ("app.llm_gateway.providers.google_provider", "GoogleProvider"),
+    "xai": ("app.llm_gateway.providers.xai_provider", "XAIProvider"),
+}
+
 
 class LLMGateway:
     """Gateway for accessing multiple LLM providers.
@@ -20,16 +27,11 @@ class LLMGateway:
     """
 
     def __init__(self):
-        """Initialize the LLM Gateway with all providers."""
-        self.providers: Dict[str, LLMProvider] = {
-            "openai": OpenAIProvider(),
-            "anthropic": AnthropicProvider(),
-            "google": GoogleProvider(),
-            "xai": XAIProvider(),
-        }
+        """Initialize the LLM Gateway; providers are created on first use."""
+        self._providers: Dict[str, LLMProvider] = {}
 
     def get_provider(self, provider_name: str) -> Optional[LLMProvider]:
-        """Get a specific provider by name.
+        """Get a specific provider by name, creating it on first access.
 
         Args:
             provider_name: Name of the provider (openai, anthropic, google, xai)
@@ -37,7 +39,12 @@ class LLMGateway:
         Returns:
             The provider instance or None if not found
         """
-        return self.providers.get(provider_name)
+        provider = self._providers.get(provider_name)
+        if provider is None and provider_name in _PROVIDER_FACTORIES:
+            module_name, class_name = _PROVIDER_FACTORIES[provider_name]
+            provider_class = getattr(importlib.import_module(module_name), class_name)
+            provider = self._providers[provider_name] = provider_class()
+        return provider
 
     def get_available_providers(self) -> List[str]:
         """Get list of available provider names.
@@ -45,7 +52,7 @@ class LLMGateway:
         Returns:
             List of provider names that are configured and available
         """
-        return [name for name, provider in self.providers.items() if provider.is_available]
+        return [name for name in _PROVIDER_FACTORIES if self.get_provider(name).is_available]
 
     def get_all_providers(self) -> List[str]:
         """Get list of all provider names (including unavailable).
@@ -53,7 +60,7 @@ class LLMGateway:
         Returns:
             List of all provider names
         """
-        return list(self.providers.keys())
+        return list(_PROVIDER_FACTORIES)
 
     async def generate(
         self,
@@ -80,19 +87,20 @@ class LLMGateway:
         Raises:
             ValueError: If the provider is not found
         """
-        llm_provider = self.providers.get(provider)
+        llm_provider = self.get_provider(provider)
         if not llm_provider:
-            raise ValueError(f"Provider '{provider}' not found. Available: {list(self.providers.keys())}")
+            raise ValueError(f"Provider '{provider}' not found. Available: {self.get_all_providers()}")
 
         logger.info(f"Generating content using provider: {provider}, model: {model or 'default'}")
 
-        response = await llm_provider.generate(
-            prompt=prompt,
-            model=model,
-            system_prompt=system_prompt,
-            temperature=temperature,
-            max_tokens=max_tokens,
-        )
+        async with get_limiter(provider).slot():
+            response = await llm_provider.generate(
+                prompt=prompt,
+                model=model,
+                system_prompt=system_prompt,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
 
         logger.info(
             f"Generated {response.total_tokens} tokens using {response.model}, "
@@ -110,7 +118,7 @@ class LLMGateway:
         Returns:
             List of available model names
         """
-        llm_provider = self.providers.get(provider)
+        llm_provider = self.get_provider(provider)
         if not llm_provider:
             return []
         return llm_provider.get_available_models()
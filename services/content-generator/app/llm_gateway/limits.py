@@ -0,0 +1,111 @@
+"""Per-provider concurrency limits for LLM API calls.
+
+Each provider gets an adaptive limiter that caps in-flight requests. The
+cap follows AIMD (additive increase, multiplicative decrease): every
+successful call nudges the limit up towards its maximum, and every rate
+limit (HTTP 429) response halves it, so bursts back off before they turn
+into a retry storm against the provider's quota.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Maximum concurrent requests per provider; tune from observed provider RPM
+PROVIDER_CONCURRENCY: Dict[str, int] = {
+    "openai": 16,
+    "anthropic": 8,
+    "google": 8,
+    "xai": 8,
+}
+DEFAULT_CONCURRENCY = 8
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Check whether an SDK error is a rate limit (HTTP 429) response.
+
+    The OpenAI, Anthropic and httpx errors all expose the HTTP status as
+    ``status_code`` (directly or on ``response``).
+    """
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+    return status_code == 429
+
+
+class AdaptiveLimiter:
+    """Concurrency limiter whose limit adapts to rate limit feedback."""
+
+    def __init__(self, max_limit: int, min_limit: int = 1):
+        """Initialize the limiter.
+
+        Args:
+            max_limit: Upper bound (and starting value) for concurrent calls
+            min_limit: Lower bound the limit never drops below
+        """
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self._limit = float(max_limit)
+        self._in_flight = 0
+        self._condition: Optional[asyncio.Condition] = None
+
+    @property
+    def limit(self) -> int:
+        """Current number of calls allowed in flight."""
+        return max(self.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        """Number of calls currently in flight."""
+        return self._in_flight
+
+    @property
+    def condition(self) -> asyncio.Condition:
+        """Get or create the condition (bound to the running event loop on first use)."""
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one in-flight slot for the duration of a provider call."""
+        async with self.condition:
+            await self.condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+
+        try:
+            yield
+        except BaseException as e:
+            if is_rate_limit_error(e):
+                self._on_rate_limited()
+            raise
+        else:
+            self._on_success()
+        finally:
+            async with self.condition:
+                self._in_flight -= 1
+                self.condition.notify_all()
+
+    def _on_success(self) -> None:
+        """Additive increase: about +1 to the limit per limit-many successes."""
+        self._limit = min(float(self.max_limit), self._limit + 1 / self.limit)
+
+    def _on_rate_limited(self) -> None:
+        """Multiplicative decrease: halve the limit."""
+        self._limit = max(float(self.min_limit), self._limit / 2)
+        logger.warning(f"Rate limited, reducing concurrency limit to {self.limit}")
+
+
+_limiters: Dict[str, AdaptiveLimiter] = {}
+
+
+def get_limiter(provider: str) -> AdaptiveLimiter:
+    """Get the shared limiter for a provider, creating it on first use."""
+    limiter = _limiters.get(provider)
+    if limiter is None:
+        limiter = AdaptiveLimiter(PROVIDER_CONCURRENCY.get(provider, DEFAULT_CONCURRENCY))
+        _limiters[provider] = limiter
+    return limiter
@@ -0,0 +1,81 @@
+"""Prometheus metrics for LLM provider calls.
+
+Every provider's ``generate`` is wrapped by ``observe_generate`` (see
+``LLMProvider.__init_subclass__``), so latency, token usage and cost are
+recorded per provider and model without any code in the providers.
+"""
+
+import functools
+import time
+from typing import Any, Awaitable, Callable
+
+from prometheus_client import Counter, Histogram
+
+# LLM calls take from a fraction of a second (short rewrites) to a minute
+# (long articles)
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60)
+
+LLM_LATENCY = Histogram(
+    "llm_request_duration_seconds",
+    "Duration of LLM provider calls",
+    ["provider", "model"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_TIME_TO_FIRST_TOKEN = Histogram(
+    "llm_time_to_first_token_seconds",
+    "Time until the first chunk of a streamed LLM response",
+    ["provider", "model"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_REQUESTS = Counter(
+    "llm_requests_total",
+    "LLM generate calls by outcome (success, error, cache_hit)",
+    ["provider", "outcome"],
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens used by LLM calls; cached is the part of input read from the prompt cache",
+    ["provider", "model", "kind"],
+)
+LLM_COST_USD = Counter(
+    "llm_cost_usd_total",
+    "Cost of LLM calls in USD",
+    ["provider", "model"],
+)
+
+
+def record_response(response: Any, duration: float) -> None:
+    """Record the latency, tokens and cost of a completed provider call."""
+    provider, model = response.provider, response.model
+    LLM_REQUESTS.labels(provider, "success").inc()
+    LLM_LATENCY.labels(provider, model).observe(duration)
+    LLM_TOKENS.labels(provider, model, "input").inc(response.input_tokens)
+    LLM_TOKENS.labels(provider, model, "output").inc(response.output_tokens)
+    if response.cached_tokens:
+        LLM_TOKENS.labels(provider, model, "cached").inc(response.cached_tokens)
+    LLM_COST_USD.labels(provider, model).inc(float(response.cost_usd))
+
+
+def observe_generate(generate: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Wrap a provider's ``generate`` to record metrics for each call.
+
+    Responses served from the response cache only count as cache hits; they
+    used no provider time, tokens or cost.
+    """
+
+    @functools.wraps(generate)
+    async def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            response = await generate(self, *args, **kwargs)
+        except Exception:
+            LLM_REQUESTS.labels(self.provider_name, "error").inc()
+            raise
+
+        if response.metadata.get("cache_hit"):
+            LLM_REQUESTS.labels(self.provider_name, "cache_hit").inc()
+        else:
+            record_response(response, time.perf_counter() - started)
+        return response
+
+    return wrapper
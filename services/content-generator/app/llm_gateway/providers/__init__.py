@@ -1,14 +1,29 @@
 """LLM Providers module."""
 
-from app.llm_gateway.providers.base import LLMProvider, LLMResponse
-from app.llm_gateway.providers.openai_provider import OpenAIProvider
-from app.llm_gateway.providers.anthropic_provider import AnthropicProvider
-from app.llm_gateway.providers.google_provider import GoogleProvider
-from app.llm_gateway.providers.xai_provider import XAIProvider
+import importlib
+
+from app.llm_gateway.providers.base import LLMProvider, LLMResponse, LLMStream
+
+# Provider classes import their SDKs, so they are loaded on first attribute
+# access (PEP 562) rather than with the package
+_LAZY_PROVIDERS = {
+    "OpenAIProvider": "app.llm_gateway.providers.openai_provider",
+    "AnthropicProvider": "app.llm_gateway.providers.anthropic_provider",
+    "GoogleProvider": "app.llm_gateway.providers.google_provider",
+    "XAIProvider": "app.llm_gateway.providers.xai_provider",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_PROVIDERS:
+        return getattr(importlib.import_module(_LAZY_PROVIDERS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "LLMProvider",
     "LLMResponse",
+    "LLMStream",
     "OpenAIProvider",
     "AnthropicProvider",
     "GoogleProvider",
@@ -5,7 +5,15 @@ from decimal import Decimal
 from typing import Any, Dict, List, Optional
 
 from app.core.config import get_settings
-from app.llm_gateway.providers.base import LLMProvider, LLMResponse
+from app.core.http_client import LLM_TIMEOUT, get_http_client
+from app.llm_gateway.providers.base import (
+    TOKENS_PER_PRICE_UNIT,
+    LLMProvider,
+    LLMResponse,
+    price_per_million_micro,
+)
+from app.llm_gateway.response_cache import cache_response
+from app.llm_gateway.tokenizers import count_tokens
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -19,6 +27,13 @@ ANTHROPIC_PRICING = {
     "claude-3-haiku-20240307": {"input": Decimal("0.00025"), "output": Decimal("0.00125")},
 }
 
+# (input, output) pricing in microcents per million tokens, so per-request
+# cost is integer math
+_PRICING_MICRO = {
+    model: (price_per_million_micro(prices["input"]), price_per_million_micro(prices["output"]))
+    for model, prices in ANTHROPIC_PRICING.items()
+}
+
 
 class AnthropicProvider(LLMProvider):
     """Anthropic Claude API provider."""
@@ -40,7 +55,11 @@ class AnthropicProvider(LLMProvider):
             try:
                 import anthropic
 
-                self.client = anthropic.AsyncAnthropic(api_key=self.api_key)
+                self.client = anthropic.AsyncAnthropic(
+                    api_key=self.api_key,
+                    http_client=get_http_client(),
+                    timeout=LLM_TIMEOUT,
+                )
             except ImportError:
                 logger.warning("anthropic package not installed")
 
@@ -57,13 +76,33 @@ class AnthropicProvider(LLMProvider):
         """Get default model."""
         return self._default_model
 
-    def calculate_cost(self, input_tokens: int, output_tokens: int, model: str) -> Decimal:
-        """Calculate cost for Anthropic API usage."""
-        pricing = ANTHROPIC_PRICING.get(model, ANTHROPIC_PRICING["claude-3-5-sonnet-20241022"])
-        input_cost = (Decimal(input_tokens) / 1000) * pricing["input"]
-        output_cost = (Decimal(output_tokens) / 1000) * pricing["output"]
-        return input_cost + output_cost
+    def calculate_cost_micro(
+        self,
+        input_tokens: int,
+        output_tokens: int,
+        model: str,
+        cache_read_tokens: int = 0,
+        cache_write_tokens: int = 0,
+    ) -> int:
+        """Calculate cost for Anthropic API usage in microcents.
+
+        ``input_tokens`` includes the prompt-cache tokens, which are billed
+        at 10% (cache reads) and 125% (cache writes) of the input price.
+        """
+        input_rate, output_rate = _PRICING_MICRO.get(
+            model, _PRICING_MICRO["claude-3-5-sonnet-20241022"]
+        )
+        uncached_tokens = input_tokens - cache_read_tokens - cache_write_tokens
+        # In 1/40 of the price unit, so the cache multipliers (4/40, 50/40)
+        # stay integers
+        micro_40 = (
+            40 * (uncached_tokens * input_rate + output_tokens * output_rate)
+            + 4 * cache_read_tokens * input_rate
+            + 50 * cache_write_tokens * input_rate
+        )
+        return micro_40 // (40 * TOKENS_PER_PRICE_UNIT)
 
+    @cache_response
     async def generate(
         self,
         prompt: str,
@@ -87,14 +126,29 @@ class AnthropicProvider(LLMProvider):
                 "messages": [{"role": "user", "content": prompt}],
             }
             if system_prompt:
-                kwargs["system"] = system_prompt
+                # Mark the system prompt as a cache breakpoint: repeated
+                # prompts are then read from the prompt cache at 10% of the
+                # input price. Normalized so equivalent prompts match.
+                kwargs["system"] = [
+                    {
+                        "type": "text",
+                        "text": system_prompt.rstrip(),
+                        "cache_control": {"type": "ephemeral"},
+                    }
+                ]
 
             response = await self.client.messages.create(**kwargs)
 
             content = response.content[0].text if response.content else ""
-            input_tokens = response.usage.input_tokens
-            output_tokens = response.usage.output_tokens
-            cost = self.calculate_cost(input_tokens, output_tokens, model_to_use)
+            usage = response.usage
+            cache_read_tokens = getattr(usage, "cache_read_input_tokens", None) or 0
+            cache_write_tokens = getattr(usage, "cache_creation_input_tokens", None) or 0
+            # Anthropic reports cache tokens separately from input_tokens
+            input_tokens = usage.input_tokens + cache_read_tokens + cache_write_tokens
+            output_tokens = usage.output_tokens
+            cost = self.calculate_cost_micro(
+                input_tokens, output_tokens, model_to_use, cache_read_tokens, cache_write_tokens
+            )
 
             return LLMResponse(
                 content=content,
@@ -103,8 +157,10 @@ class AnthropicProvider(LLMProvider):
                 input_tokens=input_tokens,
                 output_tokens=output_tokens,
                 total_tokens=input_tokens + output_tokens,
-                cost_usd=cost,
+                cost_microcents=cost,
                 metadata={"stop_reason": response.stop_reason},
+                cached_tokens=cache_read_tokens,
+                cache_creation_tokens=cache_write_tokens,
             )
         except Exception as e:
             logger.error(f"Anthropic API error: {e}")
@@ -114,8 +170,8 @@ class AnthropicProvider(LLMProvider):
         """Generate mock response for testing."""
         model_to_use = model or self._default_model
         mock_content = f"Mock Anthropic response for: {prompt[:100]}..."
-        mock_input = len(prompt.split()) * 2
-        mock_output = len(mock_content.split()) * 2
+        mock_input = count_tokens(prompt, model_to_use)
+        mock_output = count_tokens(mock_content, model_to_use)
 
         return LLMResponse(
             content=mock_content,
@@ -124,6 +180,6 @@ class AnthropicProvider(LLMProvider):
             input_tokens=mock_input,
             output_tokens=mock_output,
             total_tokens=mock_input + mock_output,
-            cost_usd=self.calculate_cost(mock_input, mock_output, model_to_use),
+            cost_microcents=self.calculate_cost_micro(mock_input, mock_output, model_to_use),
             metadata={"mock": True},
         )
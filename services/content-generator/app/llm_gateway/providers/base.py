@@ -1,14 +1,34 @@
 """Base LLM Provider interface."""
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 
+from app.llm_gateway.limits import get_limiter
+from app.llm_gateway.metrics import LLM_TIME_TO_FIRST_TOKEN, observe_generate
 
-@dataclass
+# Costs are tracked as integer microcents (10^-8 USD) and converted to
+# Decimal only at the API/DB boundary
+MICROCENTS_PER_USD = 10**8
+# Prices are integer microcents per million tokens
+TOKENS_PER_PRICE_UNIT = 1_000_000
+
+
+def price_per_million_micro(price_per_1k: Decimal) -> int:
+    """Convert a USD price per 1K tokens to microcents per million tokens."""
+    return int(price_per_1k * 1000 * MICROCENTS_PER_USD)
+
+
+@dataclass(slots=True, frozen=True)
 class LLMResponse:
-    """Response from LLM provider."""
+    """Response from LLM provider.
+
+    Slotted (no per-instance ``__dict__``) since batch calls hold thousands
+    of these, and frozen so a response can be shared (e.g. cached) safely.
+    """
 
     content: str
     model: str
@@ -16,8 +36,51 @@ class LLMResponse:
     input_tokens: int
     output_tokens: int
     total_tokens: int
-    cost_usd: Decimal
+    cost_microcents: int
     metadata: Dict[str, Any]
+    # Input tokens read from / written to the provider's prompt cache
+    # (included in input_tokens)
+    cached_tokens: int = 0
+    cache_creation_tokens: int = 0
+
+    @property
+    def cost_usd(self) -> Decimal:
+        """Cost in USD."""
+        return Decimal(self.cost_microcents) / MICROCENTS_PER_USD
+
+
+class LLMStream:
+    """Content of a streamed generation, iterated as text chunks arrive.
+
+    Once iteration finishes, ``response`` holds the complete LLMResponse
+    (full content, token usage and cost) and ``time_to_first_token`` the
+    seconds until the first chunk arrived.
+    """
+
+    def __init__(self, events: AsyncIterator[Union[str, LLMResponse]]):
+        """Initialize the stream.
+
+        Args:
+            events: Text chunks followed by the final LLMResponse
+        """
+        self._events = events
+        self.response: Optional[LLMResponse] = None
+        self.time_to_first_token: Optional[float] = None
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        started = time.perf_counter()
+        async for event in self._events:
+            if isinstance(event, LLMResponse):
+                self.response = event
+                continue
+            if self.time_to_first_token is None:
+                self.time_to_first_token = time.perf_counter() - started
+            yield event
+
+        if self.response is not None and self.time_to_first_token is not None:
+            LLM_TIME_TO_FIRST_TOKEN.labels(self.response.provider, self.response.model).observe(
+                self.time_to_first_token
+            )
 
 
 class LLMProvider(ABC):
@@ -25,6 +88,12 @@ class LLMProvider(ABC):
 
     provider_name: str = "base"
 
+    def __init_subclass__(cls, **kwargs: Any):
+        """Wrap each implementation of ``generate`` to record metrics (see metrics.py)."""
+        super().__init_subclass__(**kwargs)
+        if "generate" in cls.__dict__ and not getattr(cls.generate, "__isabstractmethod__", False):
+            cls.generate = observe_generate(cls.generate)
+
     @abstractmethod
     async def generate(
         self,
@@ -48,6 +117,89 @@ class LLMProvider(ABC):
         """
         pass
 
+    def stream(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+    ) -> LLMStream:
+        """Generate content, yielding text as the provider produces it.
+
+        The stream holds a slot of the provider's shared limiter (see
+        limits.py) from the request until it finishes, and a rate limited
+        request backs the limit off like a generate call does.
+
+        Args are the same as for ``generate``.
+
+        Returns:
+            LLMStream of text chunks; its ``response`` is set once exhausted
+        """
+        return LLMStream(
+            self._limited(
+                self._generate_stream(prompt, model, system_prompt, temperature, max_tokens)
+            )
+        )
+
+    async def _limited(
+        self, events: AsyncIterator[Union[str, LLMResponse]]
+    ) -> AsyncIterator[Union[str, LLMResponse]]:
+        """Yield the events of a stream while holding a limiter slot."""
+        async with get_limiter(self.provider_name).slot():
+            async for event in events:
+                yield event
+
+    async def _generate_stream(
+        self,
+        prompt: str,
+        model: Optional[str],
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: int,
+    ) -> AsyncIterator[Union[str, LLMResponse]]:
+        """Yield text chunks, then the final LLMResponse.
+
+        Providers without streaming support yield the whole content at once.
+        """
+        response = await self.generate(prompt, model, system_prompt, temperature, max_tokens)
+        if response.content:
+            yield response.content
+        yield response
+
+    async def generate_many(
+        self,
+        prompts: List[str],
+        *,
+        concurrency: Optional[int] = None,
+        **kwargs: Any,
+    ) -> List[Union[LLMResponse, BaseException]]:
+        """Generate content for several prompts concurrently.
+
+        Calls share the provider's adaptive limiter (see limits.py) with the
+        gateway, so batches back off on rate limits like single calls do.
+
+        Args:
+            prompts: The user prompts
+            concurrency: Maximum calls in flight for this batch (default: the
+                provider's concurrency limit)
+            **kwargs: Passed to ``generate`` (model, system_prompt, ...)
+
+        Returns:
+            One LLMResponse per prompt, in order; a failed prompt's entry is
+            the exception it raised
+        """
+        limiter = get_limiter(self.provider_name)
+        semaphore = asyncio.Semaphore(concurrency or limiter.max_limit)
+
+        async def generate_one(prompt: str) -> LLMResponse:
+            async with semaphore, limiter.slot():
+                return await self.generate(prompt, **kwargs)
+
+        return await asyncio.gather(
+            *(generate_one(prompt) for prompt in prompts), return_exceptions=True
+        )
+
     @abstractmethod
     def get_available_models(self) -> List[str]:
         """Get list of available models for this provider.
@@ -67,7 +219,7 @@ class LLMProvider(ABC):
         pass
 
     @abstractmethod
-    def calculate_cost(self, input_tokens: int, output_tokens: int, model: str) -> Decimal:
+    def calculate_cost_micro(self, input_tokens: int, output_tokens: int, model: str) -> int:
         """Calculate cost for token usage.
 
         Args:
@@ -76,10 +228,23 @@ class LLMProvider(ABC):
             model: The model used
 
         Returns:
-            Cost in USD as Decimal
+            Cost in microcents (10^-8 USD)
         """
         pass
 
+    def calculate_cost(
+        self, input_tokens: int, output_tokens: int, model: str, *args: Any, **kwargs: Any
+    ) -> Decimal:
+        """Calculate cost for token usage in USD.
+
+        Takes the same arguments as ``calculate_cost_micro``.
+
+        Returns:
+            Cost in USD as Decimal
+        """
+        micro = self.calculate_cost_micro(input_tokens, output_tokens, model, *args, **kwargs)
+        return Decimal(micro) / MICROCENTS_PER_USD
+
     @property
     def is_available(self) -> bool:
         """Check if the provider is available (has valid API key).
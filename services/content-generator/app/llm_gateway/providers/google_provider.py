@@ -1,11 +1,19 @@
 """Google Generative AI (Gemini) LLM Provider implementation."""
 
+import asyncio
 import logging
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.core.config import get_settings
-from app.llm_gateway.providers.base import LLMProvider, LLMResponse
+from app.llm_gateway.providers.base import (
+    TOKENS_PER_PRICE_UNIT,
+    LLMProvider,
+    LLMResponse,
+    price_per_million_micro,
+)
+from app.llm_gateway.response_cache import cache_response
+from app.llm_gateway.tokenizers import count_tokens
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -18,6 +26,18 @@ GOOGLE_PRICING = {
     "gemini-pro": {"input": Decimal("0.0005"), "output": Decimal("0.0015")},
 }
 
+# (input, output) pricing in microcents per million tokens, so per-request
+# cost is integer math
+_PRICING_MICRO = {
+    model: (price_per_million_micro(prices["input"]), price_per_million_micro(prices["output"]))
+    for model, prices in GOOGLE_PRICING.items()
+}
+_DEFAULT_PRICING = _PRICING_MICRO["gemini-1.5-pro"]
+
+# Generation configs kept per provider; callers use a few presets, so the
+# cache is simply reset if it ever grows past this
+GENERATION_CONFIG_CACHE_SIZE = 32
+
 
 class GoogleProvider(LLMProvider):
     """Google Generative AI (Gemini) provider."""
@@ -33,6 +53,9 @@ class GoogleProvider(LLMProvider):
         self.api_key = api_key or getattr(settings, "GOOGLE_API_KEY", "")
         self.client = None
         self._default_model = "gemini-1.5-pro"
+        # Model handles and generation configs, reused across calls
+        self._model_cache: Dict[str, Any] = {}
+        self._config_cache: Dict[Tuple[float, int], Any] = {}
 
         # Only import google-generativeai if we have an API key
         if self.api_key:
@@ -58,13 +81,12 @@ class GoogleProvider(LLMProvider):
         """Get default model."""
         return self._default_model
 
-    def calculate_cost(self, input_tokens: int, output_tokens: int, model: str) -> Decimal:
-        """Calculate cost for Google API usage."""
-        pricing = GOOGLE_PRICING.get(model, GOOGLE_PRICING["gemini-1.5-pro"])
-        input_cost = (Decimal(input_tokens) / 1000) * pricing["input"]
-        output_cost = (Decimal(output_tokens) / 1000) * pricing["output"]
-        return input_cost + output_cost
+    def calculate_cost_micro(self, input_tokens: int, output_tokens: int, model: str) -> int:
+        """Calculate cost for Google API usage in microcents."""
+        input_price, output_price = _PRICING_MICRO.get(model, _DEFAULT_PRICING)
+        return (input_price * input_tokens + output_price * output_tokens) // TOKENS_PER_PRICE_UNIT
 
+    @cache_response
     async def generate(
         self,
         prompt: str,
@@ -81,28 +103,39 @@ class GoogleProvider(LLMProvider):
         model_to_use = model or self._default_model
 
         try:
-            gen_model = self.genai.GenerativeModel(model_to_use)
+            gen_model = self._model_cache.get(model_to_use)
+            if gen_model is None:
+                gen_model = self._model_cache[model_to_use] = self.genai.GenerativeModel(
+                    model_to_use
+                )
 
             # Combine system prompt and user prompt if provided
             full_prompt = prompt
             if system_prompt:
                 full_prompt = f"{system_prompt}\n\n{prompt}"
 
-            generation_config = self.genai.GenerationConfig(
-                temperature=temperature,
-                max_output_tokens=max_tokens,
-            )
-
-            # Use synchronous generate_content and wrap in async
-            import asyncio
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: gen_model.generate_content(
+            generation_config = self._config_cache.get((temperature, max_tokens))
+            if generation_config is None:
+                if len(self._config_cache) >= GENERATION_CONFIG_CACHE_SIZE:
+                    self._config_cache.clear()
+                generation_config = self.genai.GenerationConfig(
+                    temperature=temperature,
+                    max_output_tokens=max_tokens,
+                )
+                self._config_cache[(temperature, max_tokens)] = generation_config
+
+            if hasattr(gen_model, "generate_content_async"):
+                response = await gen_model.generate_content_async(
                     full_prompt,
                     generation_config=generation_config,
-                ),
-            )
+                )
+            else:
+                # Older SDKs are synchronous only
+                response = await asyncio.to_thread(
+                    gen_model.generate_content,
+                    full_prompt,
+                    generation_config=generation_config,
+                )
 
             content = response.text if response.text else ""
 
@@ -112,14 +145,14 @@ class GoogleProvider(LLMProvider):
                 input_tokens = getattr(usage_metadata, "prompt_token_count", None)
                 output_tokens = getattr(usage_metadata, "candidates_token_count", None)
                 if input_tokens is None:
-                    input_tokens = len(full_prompt.split()) * 2
+                    input_tokens = count_tokens(full_prompt, model_to_use)
                 if output_tokens is None:
-                    output_tokens = len(content.split()) * 2
+                    output_tokens = count_tokens(content, model_to_use)
             else:
-                input_tokens = len(full_prompt.split()) * 2
-                output_tokens = len(content.split()) * 2
+                input_tokens = count_tokens(full_prompt, model_to_use)
+                output_tokens = count_tokens(content, model_to_use)
 
-            cost = self.calculate_cost(input_tokens, output_tokens, model_to_use)
+            cost = self.calculate_cost_micro(input_tokens, output_tokens, model_to_use)
 
             return LLMResponse(
                 content=content,
@@ -128,7 +161,7 @@ class GoogleProvider(LLMProvider):
                 input_tokens=input_tokens,
                 output_tokens=output_tokens,
                 total_tokens=input_tokens + output_tokens,
-                cost_usd=cost,
+                cost_microcents=cost,
                 metadata={"finish_reason": "completed"},
             )
         except Exception as e:
@@ -139,8 +172,8 @@ class GoogleProvider(LLMProvider):
         """Generate mock response for testing."""
         model_to_use = model or self._default_model
         mock_content = f"Mock Google Gemini response for: {prompt[:100]}..."
-        mock_input = len(prompt.split()) * 2
-        mock_output = len(mock_content.split()) * 2
+        mock_input = count_tokens(prompt, model_to_use)
+        mock_output = count_tokens(mock_content, model_to_use)
 
         return LLMResponse(
             content=mock_content,
@@ -149,6 +182,6 @@ class GoogleProvider(LLMProvider):
             input_tokens=mock_input,
             output_tokens=mock_output,
             total_tokens=mock_input + mock_output,
-            cost_usd=self.calculate_cost(mock_input, mock_output, model_to_use),
+            cost_microcents=self.calculate_cost_micro(mock_input, mock_output, model_to_use),
             metadata={"mock": True},
         )
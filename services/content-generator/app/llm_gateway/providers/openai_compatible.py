@@ -0,0 +1,263 @@
+"""Base provider for APIs compatible with OpenAI chat completions."""
+
+import hashlib
+import logging
+import time
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from app.core.config import get_settings
+from app.core.http_client import get_openai_client
+from app.llm_gateway.metrics import record_response
+from app.llm_gateway.providers.base import (
+    TOKENS_PER_PRICE_UNIT,
+    LLMProvider,
+    LLMResponse,
+    price_per_million_micro,
+)
+from app.llm_gateway.response_cache import cache_response
+from app.llm_gateway.tokenizers import count_tokens
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+# Distinct system prompts whose message is kept; system prompts are a small
+# set of templates, but may embed user input, so the cache is bounded
+SYSTEM_MESSAGE_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=SYSTEM_MESSAGE_CACHE_SIZE)
+def _system_message(system_prompt: str) -> Tuple[Dict[str, str], str]:
+    """Get the (shared, never mutated) system message and its prompt cache key.
+
+    The system prompt leads every request, so it is the prefix the prompt
+    cache reuses; it is normalized so equivalent prompts share a key.
+    """
+    system_prompt = system_prompt.rstrip()
+    cache_key = hashlib.sha256(system_prompt.encode()).hexdigest()
+    return {"role": "system", "content": system_prompt}, cache_key
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """Provider for an OpenAI-compatible chat completions API.
+
+    Subclasses only describe the API through the class attributes below;
+    requests, streaming, cost calculation and mock responses are shared.
+    """
+
+    # Pricing per 1K tokens: model -> {"input", "output"[, "cached_input"]}.
+    # Prompt tokens served from the provider's prompt cache are billed at
+    # cached_input, or at the input price when it is absent.
+    PRICING: Dict[str, Dict[str, Decimal]] = {}
+    DEFAULT_MODEL: str = ""
+    # API endpoint; None for the OpenAI API itself
+    BASE_URL: Optional[str] = None
+    # Settings attribute holding the API key
+    API_KEY_SETTING: str = ""
+    # Provider name used in logs and mock responses
+    DISPLAY_NAME: str = ""
+    # Whether the API accepts OpenAI's prompt_cache_key routing hint
+    PROMPT_CACHE_KEY: bool = False
+
+    # (input, cached input, output) microcents per million tokens, derived
+    # from PRICING so costs are integer math
+    _pricing_micro: Dict[str, Tuple[int, int, int]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._pricing_micro = {
+            model: (
+                price_per_million_micro(prices["input"]),
+                price_per_million_micro(prices.get("cached_input", prices["input"])),
+                price_per_million_micro(prices["output"]),
+            )
+            for model, prices in cls.PRICING.items()
+        }
+
+    def __init__(self, api_key: Optional[str] = None):
+        """Initialize the provider.
+
+        Args:
+            api_key: API key. If not provided, uses settings.
+        """
+        self.api_key = api_key or getattr(settings, self.API_KEY_SETTING, "")
+        self.client = None
+        if self.api_key:
+            self.client = get_openai_client(self.api_key, base_url=self.BASE_URL)
+        self._default_model = self.DEFAULT_MODEL
+
+    @property
+    def is_available(self) -> bool:
+        """Check if the provider is available."""
+        return bool(self.api_key and self.client)
+
+    def get_available_models(self) -> List[str]:
+        """Get available models."""
+        return list(self.PRICING.keys())
+
+    def get_default_model(self) -> str:
+        """Get default model."""
+        return self._default_model
+
+    def calculate_cost_micro(
+        self,
+        input_tokens: int,
+        output_tokens: int,
+        model: str,
+        cached_tokens: int = 0,
+    ) -> int:
+        """Calculate cost for API usage in microcents.
+
+        ``cached_tokens`` are the part of ``input_tokens`` served from the
+        prompt cache.
+        """
+        input_price, cached_price, output_price = self._pricing_micro.get(
+            model, self._pricing_micro[self.DEFAULT_MODEL]
+        )
+        return (
+            input_price * (input_tokens - cached_tokens)
+            + cached_price * cached_tokens
+            + output_price * output_tokens
+        ) // TOKENS_PER_PRICE_UNIT
+
+    @cache_response
+    async def generate(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+    ) -> LLMResponse:
+        """Generate content using the chat completions API."""
+        if not self.client:
+            logger.warning(f"{self.DISPLAY_NAME} API key not configured, returning mock response")
+            return self._generate_mock_response(prompt, model)
+
+        model_to_use = model or self._default_model
+        messages, extra_body = self._build_messages(prompt, system_prompt)
+
+        try:
+            response = await self.client.chat.completions.create(
+                model=model_to_use,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                extra_body=extra_body or None,
+            )
+
+            return self._build_response(
+                response.choices[0].message.content or "",
+                model_to_use,
+                response.usage,
+                response.choices[0].finish_reason,
+            )
+        except Exception as e:
+            logger.error(f"{self.DISPLAY_NAME} API error: {e}")
+            raise
+
+    async def _generate_stream(
+        self,
+        prompt: str,
+        model: Optional[str],
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: int,
+    ) -> AsyncIterator[Union[str, LLMResponse]]:
+        """Stream content deltas; the final usage chunk drives the cost."""
+        if not self.client:
+            async for event in super()._generate_stream(
+                prompt, model, system_prompt, temperature, max_tokens
+            ):
+                yield event
+            return
+
+        model_to_use = model or self._default_model
+        messages, extra_body = self._build_messages(prompt, system_prompt)
+        parts: List[str] = []
+        usage = None
+        finish_reason = None
+        started = time.perf_counter()
+
+        try:
+            chunks = await self.client.chat.completions.create(
+                model=model_to_use,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                extra_body=extra_body or None,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            async for chunk in chunks:
+                if chunk.usage:
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                finish_reason = choice.finish_reason or finish_reason
+                if choice.delta.content:
+                    parts.append(choice.delta.content)
+                    yield choice.delta.content
+        except Exception as e:
+            logger.error(f"{self.DISPLAY_NAME} API error: {e}")
+            raise
+
+        response = self._build_response("".join(parts), model_to_use, usage, finish_reason)
+        record_response(response, time.perf_counter() - started)
+        yield response
+
+    def _build_messages(
+        self, prompt: str, system_prompt: Optional[str]
+    ) -> Tuple[Tuple[Dict[str, str], ...], Dict[str, Any]]:
+        """Build the chat messages and extra request body for a call."""
+        user_message = {"role": "user", "content": prompt}
+        if not system_prompt:
+            return (user_message,), {}
+
+        system_message, cache_key = _system_message(system_prompt)
+        extra_body = {"prompt_cache_key": cache_key} if self.PROMPT_CACHE_KEY else {}
+        return (system_message, user_message), extra_body
+
+    def _build_response(
+        self, content: str, model: str, usage: Any, finish_reason: Optional[str]
+    ) -> LLMResponse:
+        """Build an LLMResponse from the completion's content and usage."""
+        input_tokens = usage.prompt_tokens if usage else 0
+        output_tokens = usage.completion_tokens if usage else 0
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = (getattr(details, "cached_tokens", None) or 0) if details else 0
+
+        return LLMResponse(
+            content=content,
+            model=model,
+            provider=self.provider_name,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=input_tokens + output_tokens,
+            cost_microcents=self.calculate_cost_micro(
+                input_tokens, output_tokens, model, cached_tokens
+            ),
+            metadata={"finish_reason": finish_reason},
+            cached_tokens=cached_tokens,
+        )
+
+    def _generate_mock_response(self, prompt: str, model: Optional[str]) -> LLMResponse:
+        """Generate mock response for testing."""
+        model_to_use = model or self._default_model
+        mock_content = f"Mock {self.DISPLAY_NAME} response for: {prompt[:100]}..."
+        mock_input = count_tokens(prompt, model_to_use)
+        mock_output = count_tokens(mock_content, model_to_use)
+
+        return LLMResponse(
+            content=mock_content,
+            model=f"{model_to_use}-mock",
+            provider=self.provider_name,
+            input_tokens=mock_input,
+            output_tokens=mock_output,
+            total_tokens=mock_input + mock_output,
+            cost_microcents=self.calculate_cost_micro(mock_input, mock_output, model_to_use),
+            metadata={"mock": True},
+        )
@@ -0,0 +1,130 @@
+"""In-process cache of LLM responses for deterministic calls.
+
+Low-temperature calls (title rewrites, structured SEO fields, ...) often
+repeat the same system prompt and prompt within a run. Their responses are
+kept in an LRU cache with a TTL so repeats skip the provider call entirely.
+High-temperature calls are expected to vary between calls and are never
+cached.
+"""
+
+import functools
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Awaitable, Callable, Optional, Tuple
+
+from app.llm_gateway.providers.base import LLMResponse
+
+logger = logging.getLogger(__name__)
+
+# Calls at or above this temperature are not cached
+MAX_CACHED_TEMPERATURE = 0.7
+RESPONSE_CACHE_SIZE = 10_000
+RESPONSE_CACHE_TTL_SECONDS = 3600.0
+
+
+class ResponseCache:
+    """LRU cache of LLM responses whose entries expire after a TTL."""
+
+    def __init__(
+        self, maxsize: int = RESPONSE_CACHE_SIZE, ttl: float = RESPONSE_CACHE_TTL_SECONDS
+    ):
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of cached responses
+            ttl: Seconds a response stays valid
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, Tuple[float, LLMResponse]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        system_prompt: Optional[str],
+        prompt: str,
+    ) -> bytes:
+        """Build the cache key for a call (a digest, so keys don't hold prompts)."""
+        digest = hashlib.blake2b(digest_size=16)
+        header = f"{provider}|{model or ''}|{temperature!r}|{max_tokens}|"
+        digest.update(header.encode())
+        digest.update((system_prompt or "").strip().encode())
+        digest.update(b"\x00")
+        digest.update(prompt.strip().encode())
+        return digest.digest()
+
+    def get(self, key: bytes) -> Optional[LLMResponse]:
+        """Get a cached response, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    def set(self, key: bytes, response: LLMResponse) -> None:
+        """Cache a response, evicting the least recently used one when full."""
+        self._entries[key] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+response_cache = ResponseCache()
+
+
+def cache_response(
+    generate: Callable[..., Awaitable[LLMResponse]],
+) -> Callable[..., Awaitable[LLMResponse]]:
+    """Decorate a provider's ``generate`` to serve repeats from ``response_cache``.
+
+    A cache hit returns a copy of the original response with zero cost and
+    ``cache_hit`` set in its metadata. Mock responses are not cached.
+    """
+
+    @functools.wraps(generate)
+    async def wrapper(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+    ) -> LLMResponse:
+        if temperature >= MAX_CACHED_TEMPERATURE:
+            return await generate(self, prompt, model, system_prompt, temperature, max_tokens)
+
+        key = ResponseCache.make_key(
+            self.provider_name, model, temperature, max_tokens, system_prompt, prompt
+        )
+        cached = response_cache.get(key)
+        if cached is not None:
+            logger.debug(f"Response cache hit for {self.provider_name}/{cached.model}")
+            return replace(
+                cached,
+                cost_microcents=0,
+                metadata={**cached.metadata, "cache_hit": True},
+            )
+
+        response = await generate(self, prompt, model, system_prompt, temperature, max_tokens)
+        if not response.metadata.get("mock"):
+            response_cache.set(key, response)
+        return response
+
+    return wrapper
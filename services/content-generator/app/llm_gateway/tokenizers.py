@@ -0,0 +1,76 @@
+"""Token counting for cost estimates when a provider reports no usage.
+
+Uses tiktoken's BPE encoders (loaded once per process) when the optional
+package is installed. Models without a public tokenizer (Gemini, Claude,
+Grok) are estimated with the GPT-4o encoding; without tiktoken, the count
+falls back to two tokens per word.
+"""
+
+import logging
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Encoding for models tiktoken does not know
+DEFAULT_ENCODING = "o200k_base"
+# Threads tiktoken encodes a batch of texts with
+BATCH_THREADS = 4
+
+
+@lru_cache(maxsize=8)
+def get_encoder(model: str) -> Optional[Any]:
+    """Get the tiktoken encoder for a model, or None if unavailable."""
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding(DEFAULT_ENCODING)
+    except Exception as e:
+        # Encoder files are downloaded on first use
+        logger.warning(f"Failed to load tokenizer for {model}: {e}")
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    """Count (or estimate) the tokens in a text.
+
+    Args:
+        text: Text to count
+        model: Model whose tokenizer to use
+
+    Returns:
+        Number of tokens
+    """
+    encoder = get_encoder(model)
+    if encoder is None:
+        return len(text.split()) * 2
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+def count_tokens_batch(texts: Sequence[str], model: str = "gpt-4o") -> List[int]:
+    """Count (or estimate) the tokens in several texts.
+
+    tiktoken encodes the batch on several threads, outside the GIL.
+
+    Args:
+        texts: Texts to count
+        model: Model whose tokenizer to use
+
+    Returns:
+        Number of tokens per text
+    """
+    encoder = get_encoder(model)
+    if encoder is None:
+        return [len(text.split()) * 2 for text in texts]
+    encoded = encoder.encode_batch(
+        list(texts), num_threads=BATCH_THREADS, disallowed_special=()
+    )
+    return [len(tokens) for tokens in encoded]
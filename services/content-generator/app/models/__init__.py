@@ -1,7 +1,8 @@
 """Models package."""
 
 from app.models.article import Article, ArticleImage
+from app.models.content_plan import content_plans
 from app.models.internal_link_map import InternalLinkMap
 from app.models.published_post import PublishedPost
 
-__all__ = ["Article", "ArticleImage", "InternalLinkMap", "PublishedPost"]
+__all__ = ["Article", "ArticleImage", "content_plans", "InternalLinkMap", "PublishedPost"]
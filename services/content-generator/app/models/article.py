@@ -1,46 +1,78 @@
 """Article model."""
 
 import os
+import re
 import uuid
 from datetime import datetime
 from decimal import Decimal
 from typing import List, Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer, Numeric, String, Text, func, BigInteger
+from sqlalchemy import (
+    BigInteger,
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    Text,
+    event,
+    func,
+    text,
+)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import JSON
+from sqlalchemy.orm import Mapped, mapped_column, query_expression, relationship
 
+from app.core.config import get_settings
 from app.db.base import Base
-
-
-def is_sqlite():
-    """Check if using SQLite database."""
-    db_url = os.environ.get("DATABASE_URL", "")
-    return "sqlite" in db_url
-
-
-# Use schema for PostgreSQL, skip for SQLite (testing)
-def get_table_args():
-    """Get table args with schema if not using SQLite."""
-    if is_sqlite():
-        return {}
-    return {"schema": "autoseo"}
-
-
-# Use JSONB for PostgreSQL, JSON for SQLite
-def get_json_type():
-    """Get JSON type based on database."""
-    if is_sqlite():
-        return JSON
-    return JSONB
+from app.db.types import OrJSON
+
+
+# Resolved once at import: use schema for PostgreSQL, skip for SQLite (testing).
+# Tests that switch DATABASE_URL must reimport the module.
+_IS_SQLITE = "sqlite" in os.environ.get("DATABASE_URL", "")
+_TABLE_ARGS = {} if _IS_SQLITE else {"schema": "autoseo"}
+# Article generation metadata: queryable JSONB on PostgreSQL when
+# METADATA_QUERYABLE is set; otherwise orjson-encoded bytes, which skip JSON
+# parsing on every write
+_METADATA_TYPE = (
+    JSONB if not _IS_SQLITE and get_settings().METADATA_QUERYABLE else OrJSON
+)
+_ARTICLE_FK_TARGET = "articles.id" if _IS_SQLITE else "autoseo.articles.id"
+
+# Words in the content once markdown markup characters are removed (the same
+# count as ContentGenerator._count_words): the number of non-whitespace runs
+_MARKDOWN_CHARS = re.compile(r"[#*`\[\]()]")
+_CLEAN_CONTENT_SQL = r"regexp_replace(content, '[#*`\[\]()]', '', 'g')"
+_WORD_COUNT_SQL = (
+    rf"length(regexp_replace({_CLEAN_CONTENT_SQL}, '\S+', 'x', 'g'))"
+    rf" - length(regexp_replace({_CLEAN_CONTENT_SQL}, '\S+', '', 'g'))"
+)
+# PostgreSQL maintains word_count as a generated column (migration 018);
+# SQLite (testing) keeps a plain column filled in on flush
+_WORD_COUNT_ARGS = () if _IS_SQLITE else (Computed(_WORD_COUNT_SQL, persisted=True),)
+
+
+def count_words(content: str) -> int:
+    """Count words in article content, ignoring markdown markup characters."""
+    return len(_MARKDOWN_CHARS.sub("", content).split())
 
 
 class Article(Base):
     """Model for generated articles."""
 
     __tablename__ = "articles"
-    __table_args__ = get_table_args()
+    __table_args__ = (
+        # Workspace article listings filtered by status, newest first
+        Index(
+            "idx_articles_workspace_status_created_at",
+            "workspace_id",
+            "status",
+            text("created_at DESC"),
+        ),
+        _TABLE_ARGS,
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -57,12 +89,16 @@ class Article(Base):
     )
     title: Mapped[str] = mapped_column(String(500), nullable=False)
     content: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    status: Mapped[str] = mapped_column(String(50), default="draft")  # 'draft' | 'published' | 'archived'
+    status: Mapped[str] = mapped_column(String(50), default="draft")  # 'generating' | 'draft' | 'published' | 'archived' | 'failed'
     ai_model_used: Mapped[str] = mapped_column(String(100), default="gpt-3.5-turbo")
     cost_usd: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 4), nullable=True)
-    word_count: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Derived from content; never set it directly
+    word_count: Mapped[Optional[int]] = mapped_column(Integer, *_WORD_COUNT_ARGS, nullable=True)
+    # Prompt-cache usage of the generation (part of the input tokens)
+    cached_input_tokens: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    cache_creation_tokens: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     generation_metadata: Mapped[dict] = mapped_column(
-        "metadata", get_json_type(), default=dict, server_default="{}"
+        "metadata", _METADATA_TYPE, default=dict, server_default="{}"
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
@@ -71,33 +107,43 @@ class Article(Base):
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
-    # Relationships
+    # Relationships. Images load with their articles in one batched
+    # "article_id IN (...)" query; queries that don't need them opt out with
+    # raiseload(Article.images). Deletes rely on the FK's ON DELETE CASCADE.
     images: Mapped[List["ArticleImage"]] = relationship(
         "ArticleImage",
         back_populates="article",
         cascade="all, delete-orphan",
+        lazy="selectin",
+        order_by="ArticleImage.created_at",
+        passive_deletes=True,
     )
 
+    # Populated only by queries that request it (see ArticleService.get_by_workspace)
+    image_count: Mapped[Optional[int]] = query_expression()
+
+
+if _IS_SQLITE:
 
-def get_article_fk():
-    """Get foreign key for article_id based on database."""
-    if is_sqlite():
-        return ForeignKey("articles.id", ondelete="CASCADE")
-    return ForeignKey("autoseo.articles.id", ondelete="CASCADE")
+    @event.listens_for(Article, "before_insert")
+    @event.listens_for(Article, "before_update")
+    def _set_word_count(mapper, connection, target: Article) -> None:
+        """Fill in word_count where the database has no generated column."""
+        target.word_count = None if target.content is None else count_words(target.content)
 
 
 class ArticleImage(Base):
     """Model for article images."""
 
     __tablename__ = "article_images"
-    __table_args__ = get_table_args()
+    __table_args__ = _TABLE_ARGS
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
     article_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
-        get_article_fk(),
+        ForeignKey(_ARTICLE_FK_TARGET, ondelete="CASCADE"),
         nullable=False,
         index=True
     )
@@ -105,7 +151,10 @@ class ArticleImage(Base):
     original_filename: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     content_type: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     size_bytes: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
-    storage_path: Mapped[str] = mapped_column(String(1000), nullable=False)
+    # Content-addressed, so identical images across articles share one path
+    storage_path: Mapped[str] = mapped_column(String(1000), nullable=False, index=True)
+    # '<algorithm>:<hex digest>' of the image bytes, used for deduplication
+    content_hash: Mapped[Optional[str]] = mapped_column(String(100), nullable=True, index=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -0,0 +1,27 @@
+"""Content plan table (owned by the SEO strategy service).
+
+Only the columns the content generator reads are declared. The table lives
+on its own MetaData so ``Base.metadata.create_all`` never tries to create
+it, and it is always declared in the "autoseo" schema; the engine's
+``schema_translate_map`` drops the schema on SQLite.
+"""
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, Text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+
+# UUID/TEXT[] on PostgreSQL, plain text on SQLite (testing)
+_uuid_type = String(36).with_variant(UUID(as_uuid=False), "postgresql")
+_keywords_type = Text().with_variant(ARRAY(Text), "postgresql")
+
+metadata = MetaData()
+
+content_plans = Table(
+    "content_plans",
+    metadata,
+    Column("id", _uuid_type, primary_key=True),
+    Column("workspace_id", _uuid_type, nullable=False),
+    Column("title", String(500), nullable=False),
+    Column("target_keywords", _keywords_type),
+    Column("estimated_word_count", Integer),
+    schema="autoseo",
+)
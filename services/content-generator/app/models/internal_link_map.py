@@ -13,24 +13,16 @@ from sqlalchemy.orm import Mapped, mapped_column
 from app.db.base import Base
 
 
-def is_sqlite():
-    """Check if using SQLite database."""
-    db_url = os.environ.get("DATABASE_URL", "")
-    return "sqlite" in db_url
-
-
-def get_table_args():
-    """Get table args with schema if not using SQLite."""
-    if is_sqlite():
-        return {}
-    return {"schema": "autoseo"}
+# Resolved once at import; tests that switch DATABASE_URL must reimport
+_IS_SQLITE = "sqlite" in os.environ.get("DATABASE_URL", "")
+_TABLE_ARGS = {} if _IS_SQLITE else {"schema": "autoseo"}
 
 
 class InternalLinkMap(Base):
     """Model for tracking internal links between published posts."""
 
     __tablename__ = "internal_link_map"
-    __table_args__ = get_table_args()
+    __table_args__ = _TABLE_ARGS
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
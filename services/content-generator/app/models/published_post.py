@@ -12,24 +12,16 @@ from sqlalchemy.orm import Mapped, mapped_column
 from app.db.base import Base
 
 
-def is_sqlite():
-    """Check if using SQLite database."""
-    db_url = os.environ.get("DATABASE_URL", "")
-    return "sqlite" in db_url
-
-
-def get_table_args():
-    """Get table args with schema if not using SQLite."""
-    if is_sqlite():
-        return {}
-    return {"schema": "autoseo"}
+# Resolved once at import; tests that switch DATABASE_URL must reimport
+_IS_SQLITE = "sqlite" in os.environ.get("DATABASE_URL", "")
+_TABLE_ARGS = {} if _IS_SQLITE else {"schema": "autoseo"}
 
 
 class PublishedPost(Base):
     """Model for tracking published articles to external sites."""
 
     __tablename__ = "published_posts"
-    __table_args__ = get_table_args()
+    __table_args__ = _TABLE_ARGS
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -1,5 +1,6 @@
 """RAG (Retrieval-Augmented Generation) module."""
 
+from app.rag.buffered_indexer import BufferedRAGIndexer
 from app.rag.engine import RAGEngine
 
-__all__ = ["RAGEngine"]
+__all__ = ["BufferedRAGIndexer", "RAGEngine"]
@@ -0,0 +1,163 @@
+"""Buffered indexer that coalesces RAG indexing calls into batches."""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.rag.engine import RAGEngine
+
+logger = logging.getLogger(__name__)
+
+# Flush when this many documents are queued...
+DEFAULT_MAX_BATCH_SIZE = 128
+# ...or when the oldest queued document has waited this long
+DEFAULT_MAX_WAIT_SECONDS = 0.1
+
+
+class BufferedRAGIndexer:
+    """Collect documents from concurrent callers and index them in batches.
+
+    Each submitted document gets a future that resolves once the batch
+    containing it has been indexed. A background worker flushes a batch
+    when it reaches max_batch_size documents or max_wait_seconds after
+    its first document arrived, so a burst of index requests costs one
+    embeddings call and one vector-store upsert instead of one per call.
+    """
+
+    def __init__(
+        self,
+        engine: RAGEngine,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_seconds: float = DEFAULT_MAX_WAIT_SECONDS,
+    ):
+        """Initialize the buffered indexer.
+
+        Args:
+            engine: RAG engine that performs the batched indexing
+            max_batch_size: Maximum documents per batch
+            max_wait_seconds: Maximum time a document waits for its batch
+        """
+        self.engine = engine
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        """Start the flush worker on first use (inside the running loop)."""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        return self._queue
+
+    def submit(self, document: Dict[str, Any]) -> asyncio.Future:
+        """Queue a document for indexing.
+
+        Args:
+            document: Dict with 'content', 'source' and optional 'metadata'
+
+        Returns:
+            Future resolving to True once the document has been indexed
+        """
+        queue = self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        queue.put_nowait((document, future))
+        return future
+
+    async def index_content(
+        self,
+        content: str,
+        source: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Index one document, waiting for the batch that includes it."""
+        return await self.submit(
+            {"content": content, "source": source, "metadata": metadata or {}}
+        )
+
+    async def index_documents(self, documents: List[Dict[str, Any]]) -> int:
+        """Index several documents, waiting until all have been indexed."""
+        futures = [self.submit(document) for document in documents]
+        results = await asyncio.gather(*futures)
+        return sum(1 for indexed in results if indexed)
+
+    async def _fill_batch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        """Wait for a first document, then gather more until full or timed out."""
+        batch.append(await self._queue.get())
+        deadline = asyncio.get_running_loop().time() + self.max_wait_seconds
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+    async def _run(self) -> None:
+        """Flush batches until cancelled."""
+        while True:
+            batch: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+            try:
+                await self._fill_batch(batch)
+                await self.engine.index_batch([document for document, _ in batch])
+            except asyncio.CancelledError:
+                self._fail(batch, RuntimeError("RAG indexer closed"))
+                raise
+            except Exception as e:
+                logger.error(f"Batch indexing of {len(batch)} documents failed: {e}")
+                self._fail(batch, e)
+            else:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_result(True)
+
+    @staticmethod
+    def _fail(batch: List[Tuple[Dict[str, Any], asyncio.Future]], error: BaseException) -> None:
+        """Propagate an error to every caller still waiting on the batch."""
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    async def close(self) -> None:
+        """Stop the worker, failing any documents still queued."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        if self._queue is not None:
+            remaining = []
+            while not self._queue.empty():
+                remaining.append(self._queue.get_nowait())
+            self._fail(remaining, RuntimeError("RAG indexer closed"))
+
+
+# Global buffered indexer for the global RAG engine, created on first access
+# of ``rag_indexer`` (which creates the engine too)
+_rag_indexer: Optional[BufferedRAGIndexer] = None
+
+
+def __getattr__(name: str) -> Any:
+    """Create the global ``rag_indexer`` lazily (PEP 562)."""
+    global _rag_indexer
+    if name == "rag_indexer":
+        if _rag_indexer is None:
+            from app.rag.engine import rag_engine
+
+            _rag_indexer = BufferedRAGIndexer(rag_engine)
+        return _rag_indexer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+async def close_rag_indexer() -> None:
+    """Flush and stop the global indexer, if it was created (on shutdown)."""
+    global _rag_indexer
+    if _rag_indexer is not None:
+        await _rag_indexer.close()
+        _rag_indexer = None
@@ -0,0 +1,79 @@
+"""LRU cache of text embeddings.
+
+SERP snippets repeat across queries (the same URL ranks for many of them)
+and content is re-indexed after edits, so the same text is often embedded
+again. Embeddings are cached under a digest of the text, so a repeat skips
+the embeddings request (an HTTP round trip and its tokens).
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 10K float32 embeddings of 1536 dimensions take ~60MB
+EMBEDDING_CACHE_SIZE = 10_000
+
+
+class EmbeddingCache:
+    """Embeddings keyed by a BLAKE2b digest of their text, least recently used evicted."""
+
+    def __init__(self, maxsize: int = EMBEDDING_CACHE_SIZE):
+        """Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of cached embeddings
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(text: str) -> bytes:
+        """Digest of a text, so keys don't hold the text itself."""
+        return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+    def lookup(
+        self, texts: Sequence[str]
+    ) -> Tuple[List[bytes], List[Optional[np.ndarray]], List[int]]:
+        """Look up the embeddings of several texts.
+
+        Returns:
+            Tuple of (keys, cached embedding or None per text, indexes of
+            the first occurrence of each missing text)
+        """
+        keys = [self.make_key(text) for text in texts]
+        found: List[Optional[np.ndarray]] = []
+        missing: Dict[bytes, int] = {}
+        for i, key in enumerate(keys):
+            embedding = self._entries.get(key)
+            if embedding is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+                missing.setdefault(key, i)
+            found.append(embedding)
+        return keys, found, list(missing.values())
+
+    def set(self, key: bytes, embedding: np.ndarray) -> None:
+        """Cache an embedding, evicting the least recently used one when full."""
+        self._entries[key] = embedding
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, float]:
+        """Hit and miss counts and the hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
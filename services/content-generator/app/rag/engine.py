@@ -1,17 +1,56 @@
 """RAG Engine for context-enhanced content generation."""
 
+import asyncio
+import hashlib
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Final, List, Optional, Union
+
+import numpy as np
 
 from app.core.config import get_settings
+from app.core.http_client import get_openai_client
+from app.llm_gateway.limits import get_limiter
+from app.llm_gateway.tokenizers import count_tokens_batch
+from app.rag.embedding_cache import EmbeddingCache
+from app.rag.faiss_index import FaissVectorIndex
+from app.rag.pgvector_store import PgVectorStore
+from app.rag.query_cache import QueryCache
+from app.rag.vector_index import VECTOR_DTYPES, VectorIndex
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Settings read by every engine, bound once
+OPENAI_API_KEY: Final[str] = settings.OPENAI_API_KEY
+RAG_PGVECTOR: Final[bool] = settings.RAG_PGVECTOR
+RAG_VEC_DTYPE: Final[str] = settings.RAG_VEC_DTYPE
+RAG_FAISS_PATH: Final[str] = settings.RAG_FAISS_PATH
+RAG_FAISS_WRITER: Final[bool] = settings.RAG_FAISS_WRITER
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+# Limits of one embeddings request: the API accepts up to 2048 inputs and
+# 300K tokens; tokens are estimated at 4 characters each, with headroom
+EMBEDDING_BATCH_SIZE = 2048
+EMBEDDING_BATCH_CHARS = 800_000
+# Embeddings requests in flight for one call
+EMBEDDING_CONCURRENCY = 8
+
+# Fixed parts of an enriched prompt, around the snippets and original prompt
+_PROMPT_HEADER = "Based on the following relevant context:\n\n"
+_PROMPT_SEPARATOR = "\n\n---\n\n"
+_PROMPT_FOOTER = (
+    "\n\nUse the context above to provide more accurate and comprehensive content."
+)
+
+
+def snippet_id(content: str) -> str:
+    """Stable ID of a context snippet: a BLAKE2b digest of its text."""
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
 
-@dataclass
+
+@dataclass(slots=True)
 class RetrievedContext:
     """Retrieved context from vector search."""
 
@@ -19,9 +58,13 @@ class RetrievedContext:
     source: str
     relevance_score: float
     metadata: Dict[str, Any]
+    doc_id: str = field(init=False)
+
+    def __post_init__(self):
+        self.doc_id = snippet_id(self.content)
 
 
-@dataclass
+@dataclass(slots=True)
 class EnrichedPrompt:
     """Enriched prompt with RAG context."""
 
@@ -29,6 +72,23 @@ class EnrichedPrompt:
     context_snippets: List[RetrievedContext]
     enriched_prompt: str
     total_context_tokens: int
+    # IDs of the snippets in the order the prompt lists them
+    doc_ids: List[str] = field(default_factory=list)
+
+
+def serp_documents(query: str, serp_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Convert SERP results to documents for indexing."""
+    return [
+        {
+            "content": result.get("snippet", ""),
+            "source": result.get("url", "serp"),
+            "metadata": {
+                "query": query,
+                "title": result.get("title", ""),
+            },
+        }
+        for result in serp_results
+    ]
 
 
 class RAGEngine:
@@ -50,8 +110,17 @@ class RAGEngine:
         """
         self._mock_mode = mock_mode
         self._mock_storage: List[Dict[str, Any]] = []
-        self.embeddings = None
-        self.vectorstore = None
+        self._index = self._create_index()
+        # Set when RAG_PGVECTOR stores chunks in PostgreSQL instead of _index
+        self._pg: Optional[PgVectorStore] = None
+        self._query_cache = QueryCache()
+        self._embedding_cache = EmbeddingCache()
+        self._openai_client = None
+        # Serializes saves of the FAISS index, so they land in indexing order,
+        # and keeps batches from being added while a save serializes it
+        self._save_lock = asyncio.Lock()
+        # Background reload of a read-only FAISS index, while one is running
+        self._reload_task: Optional[asyncio.Task] = None
 
         # Try to initialize real embeddings if not in mock mode
         if not mock_mode:
@@ -61,12 +130,14 @@ class RAGEngine:
         """Initialize embedding model and vector store."""
         try:
             # Import optional dependencies
-            openai_key = settings.OPENAI_API_KEY
-            if openai_key:
-                from openai import OpenAI
-
-                self._openai_client = OpenAI(api_key=openai_key)
+            if OPENAI_API_KEY:
+                self._openai_client = get_openai_client(OPENAI_API_KEY)
                 logger.info("RAG Engine initialized with OpenAI embeddings")
+                if RAG_PGVECTOR:
+                    from app.db.session import engine
+
+                    self._pg = PgVectorStore(engine)
+                    logger.info("RAG Engine storing chunks in pgvector")
             else:
                 logger.warning("No OpenAI API key, RAG Engine in mock mode")
                 self._mock_mode = True
@@ -74,6 +145,57 @@ class RAGEngine:
             logger.warning("Required packages not installed for RAG, using mock mode")
             self._mock_mode = True
 
+    @staticmethod
+    def _create_index() -> Union[VectorIndex, FaissVectorIndex]:
+        """Create the in-memory index: FAISS HNSW when RAG_FAISS_PATH is set."""
+        if RAG_FAISS_PATH:
+            try:
+                return FaissVectorIndex(RAG_FAISS_PATH, writer=RAG_FAISS_WRITER)
+            except ImportError:
+                logger.warning("faiss not installed, RAG index will not be persisted")
+        return VectorIndex(VECTOR_DTYPES[RAG_VEC_DTYPE])
+
+    def close(self) -> None:
+        """Persist the FAISS index, if used (on application shutdown)."""
+        if isinstance(self._index, FaissVectorIndex):
+            self._index.save()
+
+    async def _save_index(self) -> None:
+        """Persist the FAISS index after indexing, if this process writes it.
+
+        Both serializing and writing the index run in a thread, so they do
+        not block the event loop; index_batch waits for the save lock before
+        adding to the index, so it is not mutated meanwhile.
+        """
+        if not isinstance(self._index, FaissVectorIndex) or not self._index.writer:
+            return
+        async with self._save_lock:
+            try:
+                await asyncio.to_thread(self._index.save)
+            except OSError as e:
+                logger.error(f"Failed to save RAG index: {e}")
+
+    def _refresh_index(self) -> None:
+        """Start reloading a read-only FAISS index its writer has saved since.
+
+        The reload runs in the background; queries keep searching the loaded
+        index until the new one is swapped in.
+        """
+        if not isinstance(self._index, FaissVectorIndex) or not self._index.changed():
+            return
+        if self._reload_task is None or self._reload_task.done():
+            self._reload_task = asyncio.create_task(self._reload_index(self._index))
+
+    async def _reload_index(self, index: FaissVectorIndex) -> None:
+        """Read the saved FAISS index in a thread, then swap it in."""
+        try:
+            loaded = await asyncio.to_thread(index.read)
+        except Exception as e:
+            logger.warning(f"Could not reload RAG index: {e}")
+            return
+        index.swap(loaded)
+        self._query_cache.clear()
+
     @property
     def mock_mode(self) -> bool:
         """Check if RAG engine is in mock mode."""
@@ -99,73 +221,186 @@ class RAGEngine:
             return self._enrich_mock_context(query, keywords, max_context)
 
         try:
-            # Get relevant context from stored data
-            contexts = await self._retrieve_relevant_context(query, keywords, max_context)
-
-            # Build enriched prompt
-            enriched_prompt = self._build_enriched_prompt(query, contexts)
-
-            # Estimate context tokens
-            context_text = " ".join([c.content for c in contexts])
-            estimated_tokens = len(context_text.split()) * 2
-
-            return EnrichedPrompt(
-                original_prompt=query,
-                context_snippets=contexts,
-                enriched_prompt=enriched_prompt,
-                total_context_tokens=estimated_tokens,
-            )
+            if self._pg is None:
+                self._refresh_index()
+                if not self._index:
+                    return self._build_enriched(query, [])
+
+            # Identical queries, then queries embedding close to a recent one,
+            # reuse earlier results; the cache is cleared whenever documents
+            # are indexed
+            key = self._query_cache.make_key(query, keywords, max_context)
+            cached = self._query_cache.get(key)
+            if cached is not None:
+                # The key is normalized, so the cached prompt may spell the
+                # query differently; rebuild it around this query's text
+                if cached.original_prompt == query:
+                    return cached
+                return self._build_enriched(query, cached.context_snippets)
+
+            query_embedding = await self._embed_query(query, keywords)
+            similar = self._query_cache.get_similar(query_embedding, max_context)
+            if similar is not None:
+                enriched = self._build_enriched(query, similar.context_snippets)
+            else:
+                contexts = await self._retrieve_relevant_context(
+                    query, keywords, max_context, query_embedding
+                )
+                enriched = self._build_enriched(query, contexts)
+                self._query_cache.add_similar(query_embedding, max_context, enriched)
+            self._query_cache.set(key, enriched)
+            return enriched
         except Exception as e:
             logger.error(f"Error enriching context: {e}")
             # Fallback to mock if real RAG fails
             return self._enrich_mock_context(query, keywords, max_context)
 
+    def cache_stats(self) -> Dict[str, Dict[str, float]]:
+        """Hit counts and hit rates of the enrich_context and embedding caches."""
+        return {"query": self._query_cache.stats(), "embedding": self._embedding_cache.stats()}
+
+    def _build_enriched(self, query: str, contexts: List[RetrievedContext]) -> EnrichedPrompt:
+        """Build the EnrichedPrompt for a query and its retrieved contexts."""
+        return EnrichedPrompt(
+            original_prompt=query,
+            context_snippets=contexts,
+            enriched_prompt=self._build_enriched_prompt(query, contexts),
+            total_context_tokens=sum(count_tokens_batch([c.content for c in contexts])),
+            doc_ids=sorted(ctx.doc_id for ctx in contexts),
+        )
+
     async def _retrieve_relevant_context(
         self,
         query: str,
         keywords: Optional[List[str]],
         max_context: int,
+        query_embedding: Optional[np.ndarray] = None,
     ) -> List[RetrievedContext]:
         """Retrieve relevant context using vector search.
 
+        The query (with any keywords) is embedded once, then searched in
+        pgvector's HNSW index or scored against every in-memory document in
+        a single vectorized call.
+
         Args:
             query: The search query
             keywords: Optional keywords to boost
             max_context: Maximum results
+            query_embedding: Embedding of the query and keywords, if already
+                computed
 
         Returns:
             List of retrieved contexts
         """
-        # In a real implementation, this would:
-        # 1. Embed the query using OpenAI embeddings
-        # 2. Search pgvector for similar documents
-        # 3. Return the most relevant results
-
-        # For now, return from mock storage if available
-        if self._mock_storage:
-            results = []
-            search_terms = query.lower().split()
-            if keywords:
-                search_terms.extend([k.lower() for k in keywords])
-
-            for doc in self._mock_storage:
-                content_lower = doc["content"].lower()
-                score = sum(1 for term in search_terms if term in content_lower)
-                if score > 0:
-                    results.append(
-                        RetrievedContext(
-                            content=doc["content"],
-                            source=doc.get("source", "unknown"),
-                            relevance_score=score / len(search_terms),
-                            metadata=doc.get("metadata", {}),
-                        )
-                    )
-
-            # Sort by relevance and return top results
-            results.sort(key=lambda x: x.relevance_score, reverse=True)
-            return results[:max_context]
-
-        return []
+        if self._pg is None and not self._index:
+            return []
+
+        if query_embedding is None:
+            query_embedding = await self._embed_query(query, keywords)
+        if self._pg is not None:
+            hits = await self._pg.search(query_embedding, max_context)
+        else:
+            hits = self._index.search(query_embedding, max_context)
+
+        return [
+            RetrievedContext(
+                content=doc["content"],
+                source=doc.get("source", "unknown"),
+                relevance_score=max(0.0, score),
+                metadata=doc.get("metadata", {}),
+            )
+            for doc, score in hits
+        ]
+
+    async def _embed_query(self, query: str, keywords: Optional[List[str]]) -> np.ndarray:
+        """Embed a query together with its keywords."""
+        query_text = " ".join([query, *keywords]) if keywords else query
+        return (await self._embed_with_cache([query_text]))[0]
+
+    async def _embed_with_cache(self, texts: List[str]) -> np.ndarray:
+        """Embed texts, requesting only those not in the embedding cache.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            float32 array with one row per text, in input order
+        """
+        keys, found, missing = self._embedding_cache.lookup(texts)
+        fresh: Dict[bytes, np.ndarray] = {}
+        if missing:
+            # Each distinct missing text is embedded once
+            embeddings = await self._embed([texts[i] for i in missing])
+            for i, embedding in zip(missing, embeddings):
+                fresh[keys[i]] = embedding.copy()
+                self._embedding_cache.set(keys[i], fresh[keys[i]])
+
+        rows = [row if row is not None else fresh[key] for key, row in zip(keys, found)]
+        return np.stack(rows) if rows else np.empty((0, 0), dtype=np.float32)
+
+    async def _embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts in as few, concurrent, embeddings requests as possible.
+
+        Texts that fit one request are sent together. Larger inputs are
+        sorted by length, so each request packs texts of similar size, split
+        into requests within the API limits and sent concurrently.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            float32 array with one row per text, in input order
+        """
+        if len(texts) <= EMBEDDING_BATCH_SIZE and sum(map(len, texts)) <= EMBEDDING_BATCH_CHARS:
+            return await self._embed_batch(texts)
+
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        batches: List[List[int]] = [[]]
+        batch_chars = 0
+        for i in order:
+            batch = batches[-1]
+            if batch and (
+                len(batch) >= EMBEDDING_BATCH_SIZE
+                or batch_chars + len(texts[i]) > EMBEDDING_BATCH_CHARS
+            ):
+                batch = []
+                batches.append(batch)
+                batch_chars = 0
+            batch.append(i)
+            batch_chars += len(texts[i])
+
+        semaphore = asyncio.Semaphore(EMBEDDING_CONCURRENCY)
+
+        async def embed_one(batch: List[int]) -> np.ndarray:
+            async with semaphore:
+                return await self._embed_batch([texts[i] for i in batch])
+
+        results = await asyncio.gather(*(embed_one(batch) for batch in batches))
+
+        # Scatter rows back to input order
+        embeddings = np.empty((len(texts), results[0].shape[1]), dtype=np.float32)
+        for batch, rows in zip(batches, results):
+            embeddings[batch] = rows
+        return embeddings
+
+    async def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        """Embed texts in one embeddings request.
+
+        The request holds a slot of the shared OpenAI limiter (see
+        llm_gateway/limits.py), so embeddings across requests count towards
+        the same concurrency limit and back off on rate limits.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            float32 array with one row per text
+        """
+        async with get_limiter("openai").slot():
+            response = await self._openai_client.embeddings.create(
+                model=EMBEDDING_MODEL, input=texts
+            )
+        return np.asarray([item.embedding for item in response.data], dtype=np.float32)
 
     def _build_enriched_prompt(
         self,
@@ -174,6 +409,11 @@ class RAGEngine:
     ) -> str:
         """Build enriched prompt with context.
 
+        The snippets come first, ordered by doc_id rather than relevance,
+        and the original prompt last: prompts built from the same snippets
+        then share a prefix the LLM provider's prompt cache can reuse,
+        whatever the query or ranking.
+
         Args:
             original_prompt: The original prompt
             contexts: Retrieved context snippets
@@ -184,22 +424,15 @@ class RAGEngine:
         if not contexts:
             return original_prompt
 
-        context_section = "\n\n".join(
-            [
-                f"[Source: {ctx.source}]\n{ctx.content}"
-                for ctx in contexts
-            ]
-        )
-
-        return f"""Based on the following relevant context:
-
-{context_section}
-
----
-
-{original_prompt}
-
-Use the context above to provide more accurate and comprehensive content."""
+        # One join over all the pieces, without an intermediate string for
+        # the context section or each snippet
+        parts = [_PROMPT_HEADER]
+        for ctx in sorted(contexts, key=lambda ctx: ctx.doc_id):
+            if len(parts) > 1:
+                parts.append("\n\n")
+            parts += ("[Source: ", ctx.source, "]\n", ctx.content)
+        parts += (_PROMPT_SEPARATOR, original_prompt, _PROMPT_FOOTER)
+        return "".join(parts)
 
     def _enrich_mock_context(
         self,
@@ -243,6 +476,7 @@ Use the context above to provide more accurate and comprehensive content."""
             context_snippets=mock_contexts,
             enriched_prompt=enriched,
             total_context_tokens=len(enriched.split()) * 2,
+            doc_ids=sorted(ctx.doc_id for ctx in mock_contexts),
         )
 
     async def index_serp_data(
@@ -259,25 +493,7 @@ Use the context above to provide more accurate and comprehensive content."""
         Returns:
             Number of documents indexed
         """
-        if self._mock_mode:
-            # Store in mock storage
-            for result in serp_results:
-                self._mock_storage.append({
-                    "content": result.get("snippet", ""),
-                    "source": result.get("url", "serp"),
-                    "metadata": {
-                        "query": query,
-                        "title": result.get("title", ""),
-                    },
-                })
-            return len(serp_results)
-
-        # In a real implementation, this would:
-        # 1. Extract text content from SERP results
-        # 2. Generate embeddings using OpenAI
-        # 3. Store in pgvector
-        logger.info(f"Indexed {len(serp_results)} SERP results for query: {query}")
-        return len(serp_results)
+        return await self.index_batch(serp_documents(query, serp_results))
 
     async def index_content(
         self,
@@ -295,22 +511,66 @@ Use the context above to provide more accurate and comprehensive content."""
         Returns:
             True if indexing was successful
         """
-        if self._mock_mode:
-            self._mock_storage.append({
-                "content": content,
-                "source": source,
-                "metadata": metadata or {},
-            })
-            return True
-
-        # In a real implementation, this would embed and store the content
-        logger.info(f"Indexed content from source: {source}")
+        await self.index_batch([
+            {"content": content, "source": source, "metadata": metadata or {}}
+        ])
         return True
 
+    async def index_batch(self, documents: List[Dict[str, Any]]) -> int:
+        """Index several documents at once.
+
+        Batching lets a few concurrent embeddings requests (each accepts
+        many inputs) and one vector-store upsert cover all documents.
+
+        Args:
+            documents: Dicts with 'content', 'source' and optional 'metadata'
+
+        Returns:
+            Number of documents indexed
+        """
+        if self._mock_mode:
+            self._mock_storage.extend(documents)
+            return len(documents)
+
+        if not documents:
+            return 0
+
+        embeddings = await self._embed_with_cache([doc["content"] for doc in documents])
+        if self._pg is not None:
+            await self._pg.add(embeddings, documents)
+        else:
+            async with self._save_lock:
+                self._index.add(embeddings, documents)
+        self._query_cache.clear()
+        await self._save_index()
+        logger.info(f"Indexed batch of {len(documents)} documents")
+        return len(documents)
+
     def clear_storage(self):
-        """Clear mock storage (for testing)."""
+        """Clear stored documents (for testing)."""
         self._mock_storage = []
+        self._index.clear()
+        self._query_cache.clear()
+
+
+# Global RAG engine instance, created on first access of ``rag_engine`` so
+# importing this module does not set up the OpenAI client
+_rag_engine: Optional[RAGEngine] = None
+
+
+def __getattr__(name: str) -> Any:
+    """Create the global ``rag_engine`` lazily (PEP 562)."""
+    global _rag_engine
+    if name == "rag_engine":
+        if _rag_engine is None:
+            _rag_engine = RAGEngine()
+        return _rag_engine
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-# Global RAG engine instance
-rag_engine = RAGEngine()
+def close_rag_engine() -> None:
+    """Close the global engine, if it was created (on shutdown)."""
+    global _rag_engine
+    if _rag_engine is not None:
+        _rag_engine.close()
+        _rag_engine = None
@@ -0,0 +1,209 @@
+"""FAISS HNSW index for RAG retrieval, persisted to disk.
+
+A drop-in alternative to VectorIndex (same add/search/clear interface) for
+corpora too large to scan per query: an HNSW graph visits O(log N) vectors
+per search instead of all N. The index and its documents are saved to one
+file, replaced atomically, and loaded on startup, so they survive restarts.
+
+Processes sharing the file have one writer, which saves after indexing.
+The others open it read-only and reload it when the writer has replaced
+it; documents they index are searchable in that process only, until the
+next reload.
+
+Needs the optional faiss package (faiss-cpu).
+"""
+
+import logging
+import os
+import struct
+import tempfile
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import orjson
+
+from app.rag.vector_index import normalize_rows
+
+logger = logging.getLogger(__name__)
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+# Graph links per vector and build/search beam widths
+HNSW_M = 24
+HNSW_EF_CONSTRUCTION = 128
+HNSW_EF_SEARCH = 100
+
+# Saved file: the serialized index's length, the index, then the documents
+_HEADER = struct.Struct("<Q")
+
+
+class FaissVectorIndex:
+    """Documents and their embeddings in a FAISS HNSW index.
+
+    Embeddings are normalized to unit length and searched by inner product,
+    which is then their cosine similarity. Documents are kept in a list
+    parallel to the index's vector IDs.
+    """
+
+    def __init__(self, path: Optional[str] = None, writer: bool = True):
+        """Initialize the index, loading it from path if saved there.
+
+        Args:
+            path: File the index and its documents are saved to
+            writer: Whether this process saves the index; readers only load it
+        """
+        if faiss is None:
+            raise ImportError("faiss is required for FaissVectorIndex")
+        self.path = path
+        self.writer = writer
+        self.documents: List[Dict[str, Any]] = []
+        self._index: Optional[Any] = None
+        # Modification time of the file last loaded, to spot a newer one
+        self._loaded_mtime: Optional[int] = None
+        if path and os.path.exists(path):
+            try:
+                self.load()
+            except (OSError, RuntimeError, ValueError, struct.error) as e:
+                # e.g. a file in another layout; it is replaced on the next save
+                logger.warning(f"Could not load RAG index from {path}, starting empty: {e}")
+                self.clear()
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def add(self, embeddings: np.ndarray, documents: Sequence[Dict[str, Any]]) -> None:
+        """Add documents with their embeddings (one row per document).
+
+        Args:
+            embeddings: Array of shape [len(documents), dimensions]
+            documents: Dicts with 'content', 'source' and optional 'metadata'
+        """
+        if not documents:
+            return
+        embeddings = normalize_rows(embeddings)
+        if self._index is None:
+            self._index = faiss.IndexHNSWFlat(
+                embeddings.shape[1], HNSW_M, faiss.METRIC_INNER_PRODUCT
+            )
+            self._index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        self._index.add(embeddings)
+        self.documents.extend(documents)
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[Dict[str, Any], float]]:
+        """Find the k documents most similar to a query embedding.
+
+        Returns:
+            (document, cosine similarity) pairs, most similar first
+        """
+        if not self.documents or k <= 0:
+            return []
+
+        # A beam narrower than k would return fewer than k results
+        self._index.hnsw.efSearch = max(HNSW_EF_SEARCH, k)
+        scores, ids = self._index.search(normalize_rows(query), k)
+        return [
+            (self.documents[i], float(score))
+            for score, i in zip(scores[0], ids[0])
+            if i >= 0
+        ]
+
+    def clear(self) -> None:
+        """Remove all documents (the saved file is kept until the next save)."""
+        self.documents = []
+        self._index = None
+
+    def snapshot(self) -> Optional[bytes]:
+        """Serialize the index and its documents (None when empty).
+
+        Takes time proportional to the corpus; callers saving from a thread
+        must keep the index from being mutated meanwhile.
+        """
+        if self._index is None:
+            return None
+        index_bytes = faiss.serialize_index(self._index).tobytes()
+        return b"".join(
+            (_HEADER.pack(len(index_bytes)), index_bytes, orjson.dumps(self.documents))
+        )
+
+    def write(self, data: Optional[bytes]) -> None:
+        """Replace the saved file with a snapshot, atomically.
+
+        The snapshot goes to a temporary file in the same directory, synced,
+        then renamed over the saved file, so readers see the old or the new
+        file whole, never a mix.
+        """
+        if not self.path or not self.writer:
+            return
+        if data is None:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            return
+
+        directory, name = os.path.split(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def save(self) -> None:
+        """Write the index and its documents to disk (replacing them atomically)."""
+        if not self.path or not self.writer:
+            return
+        self.write(self.snapshot())
+        logger.info(f"Saved RAG index with {len(self.documents)} documents to {self.path}")
+
+    def read(self) -> Tuple[Any, List[Dict[str, Any]], int]:
+        """Read the index and its documents saved at path, without installing them.
+
+        Safe to call from another thread; pass the result to swap() on the
+        thread that searches the index.
+
+        Returns:
+            The FAISS index, its documents and the file's modification time
+        """
+        with open(self.path, "rb") as f:
+            mtime = os.fstat(f.fileno()).st_mtime_ns
+            (index_size,) = _HEADER.unpack(f.read(_HEADER.size))
+            index_bytes = np.empty(index_size, dtype=np.uint8)
+            f.readinto(index_bytes)
+            documents = orjson.loads(f.read())
+        return faiss.deserialize_index(index_bytes), documents, mtime
+
+    def swap(self, loaded: Tuple[Any, List[Dict[str, Any]], int]) -> None:
+        """Replace the index and its documents with what read() returned."""
+        self._index, self.documents, self._loaded_mtime = loaded
+        logger.info(f"Loaded RAG index with {len(self.documents)} documents from {self.path}")
+
+    def load(self) -> None:
+        """Read the index and its documents saved at path."""
+        self.swap(self.read())
+
+    def changed(self) -> bool:
+        """Check whether the writer has replaced the saved file (readers only)."""
+        if self.writer or not self.path:
+            return False
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        return mtime != self._loaded_mtime
+
+    def reload_if_changed(self) -> bool:
+        """Load the saved file again if the writer has replaced it (readers only).
+
+        Returns:
+            True if the index was reloaded
+        """
+        if not self.changed():
+            return False
+        self.load()
+        return True
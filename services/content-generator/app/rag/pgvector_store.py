@@ -0,0 +1,117 @@
+"""pgvector-backed document store for RAG retrieval.
+
+Chunks live in ``autoseo.rag_chunks`` (migrations 020-022) with an HNSW
+index on their unit-length embeddings, so a search walks the index graph
+by inner product instead of scanning every row. Embeddings are stored as
+``halfvec`` (float16): half the bytes read per visited node, at negligible
+recall loss for cosine. The HNSW search breadth (``hnsw.ef_search``) is set
+per transaction from the number of stored vectors.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import orjson
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.rag.vector_index import normalize_rows
+
+_INSERT_CHUNK = text(
+    "INSERT INTO autoseo.rag_chunks (content, source, metadata, embedding) "
+    "VALUES (:content, :source, CAST(:metadata AS jsonb), CAST(:embedding AS halfvec))"
+)
+_SET_EF_SEARCH = text("SELECT set_config('hnsw.ef_search', :ef_search, true)")
+# Embeddings are unit length, so cosine similarity is the inner product;
+# <#> is the negative inner product (served by the halfvec_ip_ops index)
+_SEARCH_CHUNKS = text(
+    "SELECT content, source, metadata, -(embedding <#> CAST(:embedding AS halfvec)) AS score "
+    "FROM autoseo.rag_chunks "
+    "ORDER BY embedding <#> CAST(:embedding AS halfvec) "
+    "LIMIT :limit"
+)
+# Planner estimate of the row count; exact counts would scan the table
+_ESTIMATE_COUNT = text(
+    "SELECT greatest(reltuples, 0)::bigint FROM pg_class "
+    "WHERE oid = 'autoseo.rag_chunks'::regclass"
+)
+
+
+def configure_hnsw_params(vector_count: int) -> Dict[str, int]:
+    """Recommended HNSW parameters for an index of ``vector_count`` vectors.
+
+    Larger indexes need more graph links (m) and a wider build/search beam
+    (ef_construction, ef_search) to keep recall around 0.99.
+
+    Returns:
+        Dict with m, ef_construction and ef_search
+    """
+    if vector_count < 100_000:
+        return {"m": 16, "ef_construction": 64, "ef_search": 40}
+    if vector_count < 1_000_000:
+        return {"m": 24, "ef_construction": 128, "ef_search": 100}
+    return {"m": 32, "ef_construction": 200, "ef_search": 200}
+
+
+def to_pgvector(vector: np.ndarray) -> str:
+    """Format an embedding as a pgvector literal of its float16 values."""
+    return "[" + ",".join(map(str, np.asarray(vector, dtype=np.float16).tolist())) + "]"
+
+
+class PgVectorStore:
+    """RAG chunks stored in PostgreSQL and searched through an HNSW index."""
+
+    def __init__(self, engine: AsyncEngine):
+        """Initialize the store.
+
+        Args:
+            engine: Database engine (the application's pooled engine)
+        """
+        self.engine = engine
+        self._vector_count: Optional[int] = None
+
+    async def add(self, embeddings: np.ndarray, documents: Sequence[Dict[str, Any]]) -> None:
+        """Insert documents with their embeddings (one row per document, normalized)."""
+        if not documents:
+            return
+        rows = [
+            {
+                "content": doc["content"],
+                "source": doc.get("source", "unknown"),
+                "metadata": orjson.dumps(doc.get("metadata") or {}).decode(),
+                "embedding": to_pgvector(embedding),
+            }
+            for doc, embedding in zip(documents, normalize_rows(embeddings))
+        ]
+        async with self.engine.begin() as conn:
+            await conn.execute(_INSERT_CHUNK, rows)
+        if self._vector_count is not None:
+            self._vector_count += len(rows)
+
+    async def search(self, query: np.ndarray, k: int) -> List[Tuple[Dict[str, Any], float]]:
+        """Find the k chunks most similar to a query embedding.
+
+        Returns:
+            (document, cosine similarity) pairs, most similar first
+        """
+        if k <= 0:
+            return []
+
+        async with self.engine.begin() as conn:
+            if self._vector_count is None:
+                self._vector_count = (await conn.execute(_ESTIMATE_COUNT)).scalar() or 0
+            # ef_search below k would return fewer than k results
+            ef_search = max(configure_hnsw_params(self._vector_count)["ef_search"], k)
+            await conn.execute(_SET_EF_SEARCH, {"ef_search": str(ef_search)})
+            result = await conn.execute(
+                _SEARCH_CHUNKS, {"embedding": to_pgvector(normalize_rows(query)[0]), "limit": k}
+            )
+            rows = result.all()
+
+        return [
+            (
+                {"content": row.content, "source": row.source, "metadata": row.metadata or {}},
+                float(row.score),
+            )
+            for row in rows
+        ]
@@ -0,0 +1,122 @@
+"""Two-tier cache of enriched prompts for RAG queries.
+
+The exact tier is an LRU keyed on the normalized query, keywords and
+context size. The semantic tier keeps the embeddings of recent queries: a
+query whose embedding is close enough to one of them (cosine similarity at
+or above the threshold) reuses that query's retrieved contexts, so
+rephrasings of a topic skip retrieval too.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from app.rag.engine import EnrichedPrompt
+
+QUERY_CACHE_SIZE = 1024
+SEMANTIC_THRESHOLD = 0.97
+
+
+class QueryCache:
+    """Exact and semantic cache of enriched prompts.
+
+    Semantic entries live in a ring buffer of unit-normalized query
+    embeddings, so a lookup is one matrix-vector product and the oldest
+    entry is overwritten once the buffer is full.
+    """
+
+    def __init__(self, maxsize: int = QUERY_CACHE_SIZE, threshold: float = SEMANTIC_THRESHOLD):
+        """Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum entries per tier
+            threshold: Minimum cosine similarity for a semantic hit
+        """
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self._exact: "OrderedDict[str, EnrichedPrompt]" = OrderedDict()
+        self._embeddings: Optional[np.ndarray] = None
+        self._entries: List[Tuple[int, "EnrichedPrompt"]] = []
+        self._next = 0
+        self._hits = {"exact": 0, "semantic": 0}
+        self._misses = 0
+
+    @staticmethod
+    def make_key(query: str, keywords: Optional[Sequence[str]], max_context: int) -> str:
+        """Build the exact-tier key for a call."""
+        normalized_keywords = sorted({k.strip().lower() for k in keywords or ()})
+        normalized = "\x00".join([query.strip().lower(), *normalized_keywords])
+        return hashlib.sha256(f"{max_context}\x00{normalized}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional["EnrichedPrompt"]:
+        """Get the enriched prompt cached for an exact key."""
+        prompt = self._exact.get(key)
+        if prompt is not None:
+            self._exact.move_to_end(key)
+            self._hits["exact"] += 1
+        return prompt
+
+    def set(self, key: str, prompt: "EnrichedPrompt") -> None:
+        """Cache an enriched prompt under an exact key."""
+        self._exact[key] = prompt
+        self._exact.move_to_end(key)
+        if len(self._exact) > self.maxsize:
+            self._exact.popitem(last=False)
+
+    def get_similar(self, embedding: np.ndarray, max_context: int) -> Optional["EnrichedPrompt"]:
+        """Get the enriched prompt of the most similar recent query, if similar enough.
+
+        Counts a miss when there is none: the semantic tier is the last
+        lookup before retrieval.
+        """
+        if self._entries:
+            similarities = self._embeddings[: len(self._entries)] @ _unit(embedding)
+            best = int(np.argmax(similarities))
+            entry_context, prompt = self._entries[best]
+            if similarities[best] >= self.threshold and entry_context == max_context:
+                self._hits["semantic"] += 1
+                return prompt
+        self._misses += 1
+        return None
+
+    def add_similar(
+        self, embedding: np.ndarray, max_context: int, prompt: "EnrichedPrompt"
+    ) -> None:
+        """Remember a query embedding and its enriched prompt."""
+        if self._embeddings is None:
+            self._embeddings = np.zeros((self.maxsize, len(embedding)), dtype=np.float32)
+        self._embeddings[self._next] = _unit(embedding)
+        if self._next < len(self._entries):
+            self._entries[self._next] = (max_context, prompt)
+        else:
+            self._entries.append((max_context, prompt))
+        self._next = (self._next + 1) % self.maxsize
+
+    def clear(self) -> None:
+        """Drop all entries (when the indexed documents change); keeps the stats."""
+        self._exact.clear()
+        self._embeddings = None
+        self._entries = []
+        self._next = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Hit counts per tier, misses and the overall hit rate."""
+        hits = self._hits["exact"] + self._hits["semantic"]
+        lookups = hits + self._misses
+        return {
+            "exact_hits": self._hits["exact"],
+            "semantic_hits": self._hits["semantic"],
+            "misses": self._misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "size": len(self._exact),
+        }
+
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    """Scale a vector to unit length (zero vectors stay zero)."""
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
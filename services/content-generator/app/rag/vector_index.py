@@ -0,0 +1,143 @@
+"""In-memory vector index for RAG retrieval."""
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# SimSIMD provides hand-tuned float16 and int8 cosine kernels (AVX-512,
+# VNNI, NEON, ...); fall back to NumPy when the optional package is not
+# installed
+try:
+    import simsimd
+
+    if not hasattr(simsimd, "cdist"):
+        simsimd = None
+except ImportError:
+    simsimd = None
+
+# RAG_VEC_DTYPE setting -> dtype embeddings are stored at
+VECTOR_DTYPES = {"fp32": np.float32, "fp16": np.float16, "int8": np.int8}
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length (zero rows stay zero), as float32."""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def quantize_rows_int8(vectors: np.ndarray) -> np.ndarray:
+    """Scalar-quantize each row to int8, scaling its largest component to 127.
+
+    The per-row scale is dropped: it does not change a row's direction, so
+    cosine similarity needs only the int8 values.
+    """
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    peaks = np.max(np.abs(vectors), axis=1, keepdims=True)
+    scales = np.divide(127.0, peaks, out=np.ones_like(peaks), where=peaks > 0)
+    return np.clip(np.rint(vectors * scales), -127, 127).astype(np.int8)
+
+
+class VectorIndex:
+    """Documents and their embeddings, searched by cosine similarity.
+
+    Embeddings are normalized to unit length once, when added, and kept as
+    one matrix (a row per document). Cosine similarity with a normalized
+    query is then a single matrix-vector product over every document, and
+    only the top-k become Python objects.
+
+    A float16 matrix halves the memory read per query and an int8 matrix
+    (scalar-quantized rows) quarters it; SimSIMD scores them with its f16/i8
+    cosine kernels, the NumPy fallback upcasts them to float32.
+    """
+
+    def __init__(self, dtype: Any = np.float32):
+        """Initialize an empty index.
+
+        Args:
+            dtype: Element type embeddings are stored at (float32, float16
+                or int8)
+        """
+        self.dtype = np.dtype(dtype)
+        self.documents: List[Dict[str, Any]] = []
+        self._matrix = np.empty((0, 0), dtype=self.dtype)
+        # 1 / norm of each quantized int8 row (zero rows: 0)
+        self._inv_norms = np.empty(0, dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def add(self, embeddings: np.ndarray, documents: Sequence[Dict[str, Any]]) -> None:
+        """Add documents with their embeddings (one row per document).
+
+        Args:
+            embeddings: Array of shape [len(documents), dimensions]
+            documents: Dicts with 'content', 'source' and optional 'metadata'
+        """
+        if not documents:
+            return
+        embeddings = normalize_rows(embeddings)
+        if self.dtype == np.int8:
+            embeddings = quantize_rows_int8(embeddings)
+            norms = np.linalg.norm(embeddings.astype(np.float32), axis=1)
+            inv_norms = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+            self._inv_norms = np.concatenate([self._inv_norms, inv_norms])
+        else:
+            embeddings = embeddings.astype(self.dtype, copy=False)
+        if self.documents:
+            self._matrix = np.vstack([self._matrix, embeddings])
+        else:
+            self._matrix = embeddings
+        self.documents.extend(documents)
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[Dict[str, Any], float]]:
+        """Find the k documents most similar to a query embedding.
+
+        Args:
+            query: Query embedding
+            k: Maximum number of results
+
+        Returns:
+            (document, cosine similarity) pairs, most similar first
+        """
+        if not self.documents or k <= 0:
+            return []
+
+        similarities = self._similarities(normalize_rows(query)[0])
+        if k < len(similarities):
+            # Top-K in linear time; only those K are sorted below
+            top = np.argpartition(-similarities, k - 1)[:k]
+        else:
+            top = np.arange(len(similarities))
+        # Stable, so equal scores keep indexing order
+        top = top[np.argsort(-similarities[top], kind="stable")]
+        return [(self.documents[i], float(similarities[i])) for i in top]
+
+    def clear(self) -> None:
+        """Remove all documents."""
+        self.documents = []
+        self._matrix = np.empty((0, 0), dtype=self.dtype)
+        self._inv_norms = np.empty(0, dtype=np.float32)
+
+    def _similarities(self, query: np.ndarray) -> np.ndarray:
+        """Cosine similarity of every indexed embedding with a unit-length query."""
+        if self.dtype == np.float32:
+            # Rows and query are unit length: cosine is the dot product (BLAS GEMV)
+            return self._matrix @ query
+
+        if simsimd is not None:
+            # SimSIMD returns cosine distances
+            if self.dtype == np.int8:
+                query = quantize_rows_int8(query)[0]
+            else:
+                query = query.astype(self.dtype)
+            distances = simsimd.cdist(query[np.newaxis, :], self._matrix, metric="cosine")
+            similarities = 1.0 - np.asarray(distances, dtype=np.float32)[0]
+            # Zero vectors have no direction; score them 0
+            return np.nan_to_num(similarities, nan=0.0)
+
+        similarities = self._matrix.astype(np.float32) @ query
+        if self.dtype == np.int8:
+            # Quantized rows are no longer unit length
+            similarities *= self._inv_norms
+        return similarities
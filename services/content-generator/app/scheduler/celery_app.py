@@ -1,15 +1,43 @@
-"""Celery application configuration."""
+"""Celery application configuration.
 
+Generation tasks run for minutes, so workers take one task at a time:
+prefetch is limited to a single message and tasks are acknowledged only
+after they finish. Start workers with fair scheduling so a busy process
+never holds queued tasks an idle one could run::
+
+    celery -A app.scheduler.celery_app worker -Ofair
+
+Each worker process runs one event loop for its whole life, on a
+background thread, and tasks submit their coroutines to it (run_async).
+The shared HTTP client, OpenAI clients and database pool are bound to that
+loop, so their connections stay open from one task to the next.
+"""
+
+import asyncio
 import logging
-from typing import Optional
+import threading
+from typing import Any, Awaitable, Final, Optional, TypeVar
 
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 
 from app.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+CELERY_BROKER_URL: Final[str] = settings.CELERY_BROKER_URL
+CELERY_RESULT_BACKEND: Final[str] = settings.CELERY_RESULT_BACKEND
+
+T = TypeVar("T")
+
+# Hard and soft limits of a task's run time in seconds
+TASK_TIME_LIMIT = 3600
+TASK_SOFT_TIME_LIMIT = 3000
+
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+_worker_loop_lock = threading.Lock()
+
 
 def create_celery_app() -> Celery:
     """Create and configure Celery application.
@@ -17,14 +45,10 @@ def create_celery_app() -> Celery:
     Returns:
         Configured Celery app instance
     """
-    # Get broker URL from settings, default to Redis
-    broker_url = getattr(settings, "CELERY_BROKER_URL", "redis://localhost:6379/0")
-    result_backend = getattr(settings, "CELERY_RESULT_BACKEND", "redis://localhost:6379/0")
-
     app = Celery(
         "content_scheduler",
-        broker=broker_url,
-        backend=result_backend,
+        broker=CELERY_BROKER_URL,
+        backend=CELERY_RESULT_BACKEND,
         include=["app.scheduler.tasks"],
     )
 
@@ -36,11 +60,28 @@ def create_celery_app() -> Celery:
         timezone="UTC",
         enable_utc=True,
         task_track_started=True,
-        task_time_limit=3600,  # 1 hour max task time
-        task_soft_time_limit=3000,  # 50 minutes soft limit
+        task_time_limit=TASK_TIME_LIMIT,  # 1 hour max task time
+        task_soft_time_limit=TASK_SOFT_TIME_LIMIT,  # 50 minutes soft limit
+        # Fair dispatch for long-running tasks: reserve one task per worker
+        # process and acknowledge it only once it has completed
         worker_prefetch_multiplier=1,
         task_acks_late=True,
         task_reject_on_worker_lost=True,
+        # With late acks Redis redelivers unacknowledged tasks after the
+        # visibility timeout; keep it above the hard time limit so a task
+        # still running is never handed to a second worker. Tasks must not
+        # be published with an ETA beyond it (ContentScheduler holds jobs
+        # until they are due instead)
+        broker_transport_options={
+            "visibility_timeout": 3900,
+            # Detect dead connections (idle between long tasks) before use
+            "socket_keepalive": True,
+            "health_check_interval": 30,
+        },
+        # Connections kept open for publishing (apply_async, revoke)
+        broker_pool_limit=10,
+        redis_socket_keepalive=True,
+        redis_backend_health_check_interval=30,
     )
 
     # Configure periodic tasks (Celery Beat)
@@ -58,5 +99,74 @@ def create_celery_app() -> Celery:
     return app
 
 
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """Get this process's event loop, starting its thread on first use."""
+    global _worker_loop
+    with _worker_loop_lock:
+        if _worker_loop is None or _worker_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="celery-event-loop", daemon=True
+            ).start()
+            _worker_loop = loop
+        return _worker_loop
+
+
+def run_async(coro: Awaitable[T], timeout: Optional[float] = TASK_TIME_LIMIT) -> T:
+    """Run a coroutine on the worker's event loop and wait for its result.
+
+    If the wait ends early (timeout, or Celery's soft time limit raised in
+    the task thread) the coroutine is cancelled.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_worker_loop())
+    try:
+        return future.result(timeout=timeout)
+    except BaseException:
+        future.cancel()
+        raise
+
+
+@worker_process_init.connect
+def _start_worker_loop(**kwargs: Any) -> None:
+    """Start the event loop in each worker process (threads do not survive fork)."""
+    global _worker_loop
+    # A loop inherited from the parent process has no thread running it
+    _worker_loop = None
+    get_worker_loop()
+
+
+@worker_process_init.connect
+def _warm_broker_connection(**kwargs: Any) -> None:
+    """Open a pooled broker connection so the first publish skips TCP setup and AUTH."""
+    try:
+        with celery_app.pool.acquire(block=True) as connection:
+            connection.ensure_connection(max_retries=3)
+    except Exception as e:
+        logger.warning(f"Could not warm broker connection: {e}")
+
+
+@worker_process_shutdown.connect
+def _stop_worker_loop(**kwargs: Any) -> None:
+    """Close the shared clients and pools, then stop the event loop."""
+    global _worker_loop
+    loop = _worker_loop
+    if loop is None or loop.is_closed():
+        return
+
+    from app.core.http_client import close_http_client
+    from app.db.session import engine
+
+    async def close() -> None:
+        await close_http_client()
+        await engine.dispose()
+
+    try:
+        run_async(close(), timeout=10)
+    except Exception as e:
+        logger.warning(f"Could not close worker connections: {e}")
+    loop.call_soon_threadsafe(loop.stop)
+    _worker_loop = None
+
+
 # Create the Celery app instance
 celery_app = create_celery_app()
@@ -1,18 +1,67 @@
 """Content Scheduler service for managing scheduled content generation."""
 
+import asyncio
+import heapq
 import logging
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
-from uuid import UUID
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+import numpy as np
 
 from app.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Celery message priority per job priority (Redis transport: 0 is highest)
+CELERY_PRIORITIES = {"high": 0, "medium": 3, "low": 6}
+
+# Order of jobs due at the same time
+PRIORITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+
+# Default publishing hours per weekday (0=Monday) when a workspace has no
+# traffic data, based on general best practices
+DEFAULT_PUBLISHING_HOURS = {
+    0: (9, 10, 14),
+    1: (9, 11, 15),
+    2: (9, 10, 14),
+    3: (10, 14, 16),
+    4: (9, 11, 13),
+    5: (10, 11),
+    6: (10, 11),
+}
+
+
+def _default_slots(day_of_week: int, hours: Tuple[int, ...]) -> Tuple[Tuple[int, float, bool], ...]:
+    """(hour, engagement score, recommended) per default slot of a weekday."""
+    score = 0.85 if day_of_week < 5 else 0.65  # Higher score on weekdays
+    return tuple((hour, score, score >= 0.8) for hour in hours)
+
+
+# Built once: only the dates depend on the call
+_DEFAULT_SLOTS_BY_DAY = {
+    day_of_week: _default_slots(day_of_week, hours)
+    for day_of_week, hours in DEFAULT_PUBLISHING_HOURS.items()
+}
+
+# Column dtypes of stored traffic patterns; scores stay float64 so they are
+# returned exactly as given
+TRAFFIC_PATTERN_COLUMNS = {
+    "dow": np.int8,
+    "hour": np.int8,
+    "score": np.float64,
+    "page_views": np.int64,
+    "avg_session_duration": np.float64,
+}
+
+# Jobs sent to Celery remembered for revoking on cancel; older ones have run
+MAX_DISPATCHED_JOBS = 1000
 
-@dataclass
+
+@dataclass(slots=True)
 class ScheduledJob:
     """Represents a scheduled content generation job."""
 
@@ -26,17 +75,6 @@ class ScheduledJob:
     metadata: Dict[str, Any]
 
 
-@dataclass
-class TrafficPattern:
-    """Represents a traffic pattern for smart scheduling."""
-
-    day_of_week: int  # 0=Monday, 6=Sunday
-    hour: int  # 0-23
-    engagement_score: float  # 0.0-1.0
-    page_views: int
-    avg_session_duration: float
-
-
 class ContentScheduler:
     """Service for scheduling and managing content generation.
 
@@ -45,6 +83,15 @@ class ContentScheduler:
     - Smart scheduling based on traffic patterns
     - Priority-based queue management
     - Retry logic for failed generations
+
+    Jobs are held here until they are due and only then sent to Celery,
+    without an ETA: Redis redelivers unacknowledged messages after the
+    broker visibility timeout, so a task waiting days for its ETA would
+    run more than once. start() runs the dispatch loop.
+
+    Pending jobs sit in a min-heap ordered by (scheduled_at, priority), so
+    finding due jobs reads only those jobs instead of sorting every job on
+    each poll. Cancelled jobs leave the heap lazily, when they reach the top.
     """
 
     def __init__(self, mock_mode: bool = False):
@@ -54,8 +101,14 @@ class ContentScheduler:
             mock_mode: If True, operates in mock mode for testing
         """
         self._mock_mode = mock_mode
-        self._scheduled_jobs: List[ScheduledJob] = []
-        self._traffic_patterns: Dict[str, List[TrafficPattern]] = {}
+        # Job ID -> pending job; the heap holds (scheduled_at, priority, ID)
+        self._jobs_by_id: Dict[str, ScheduledJob] = {}
+        self._pending_heap: List[Tuple[datetime, int, str]] = []
+        # Workspace ID -> traffic patterns as columns (TRAFFIC_PATTERN_COLUMNS)
+        self._traffic_patterns: Dict[str, Dict[str, np.ndarray]] = {}
+        # Job ID -> job for jobs handed to Celery, oldest first
+        self._dispatched: "OrderedDict[str, ScheduledJob]" = OrderedDict()
+        self._dispatcher: Optional[asyncio.Task] = None
 
     @property
     def mock_mode(self) -> bool:
@@ -82,7 +135,7 @@ class ContentScheduler:
         """
         now = datetime.now(timezone.utc)
         job = ScheduledJob(
-            id=f"job-{len(self._scheduled_jobs) + 1}",
+            id=str(uuid4()),
             plan_id=plan_id,
             workspace_id=workspace_id,
             scheduled_at=scheduled_at or now,
@@ -92,15 +145,106 @@ class ContentScheduler:
             metadata={},
         )
 
-        self._scheduled_jobs.append(job)
+        self._jobs_by_id[job.id] = job
+        heapq.heappush(
+            self._pending_heap,
+            (job.scheduled_at, PRIORITY_ORDER.get(priority, PRIORITY_ORDER["medium"]), job.id),
+        )
         logger.info(f"Scheduled job {job.id} for plan {plan_id} at {job.scheduled_at}")
 
-        # In a real implementation, this would:
-        # 1. Save to database
-        # 2. If using Celery, schedule the task with eta
+        if job.scheduled_at <= now:
+            await self.dispatch_due_jobs()
 
         return job
 
+    async def _enqueue(self, job: ScheduledJob) -> bool:
+        """Send the generation task to Celery, fire-and-forget.
+
+        The result is ignored, so publishing the message is the only round
+        trip; nothing waits on the result backend. The job ID is used as the
+        Celery task ID so the task can be revoked.
+
+        Args:
+            job: The job to enqueue
+
+        Returns:
+            True if the task was published, False if Celery is unavailable
+        """
+        if self._mock_mode:
+            return False
+
+        from app.scheduler import CELERY_AVAILABLE, generate_article_task
+
+        if not CELERY_AVAILABLE:
+            return False
+
+        try:
+            # apply_async publishes with blocking I/O; keep it off the event loop
+            await asyncio.to_thread(
+                generate_article_task.apply_async,
+                args=[str(job.plan_id)],
+                task_id=job.id,
+                priority=CELERY_PRIORITIES.get(job.priority, CELERY_PRIORITIES["medium"]),
+                ignore_result=True,
+                retry=False,
+            )
+            return True
+        except Exception as e:
+            logger.warning(f"Could not enqueue job for plan {job.plan_id}: {e}")
+            return False
+
+    async def dispatch_due_jobs(self) -> int:
+        """Send every pending job that is due to Celery.
+
+        Sent jobs leave the pending list; jobs that could not be sent stay
+        pending and are retried on the next dispatch.
+
+        Returns:
+            Number of jobs sent
+        """
+        now = datetime.now(timezone.utc)
+        due = list(self._iter_due(now))
+
+        dispatched = 0
+        for job in due:
+            if not await self._enqueue(job):
+                continue
+            job.status = "queued"
+            del self._jobs_by_id[job.id]
+            self._dispatched[job.id] = job
+            if len(self._dispatched) > MAX_DISPATCHED_JOBS:
+                self._dispatched.popitem(last=False)
+            dispatched += 1
+        self._discard_stale()
+
+        if dispatched:
+            logger.info(f"Dispatched {dispatched} scheduled jobs to Celery")
+        return dispatched
+
+    async def _dispatch_loop(self, interval: float) -> None:
+        """Dispatch due jobs every interval seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.dispatch_due_jobs()
+            except Exception as e:
+                logger.error(f"Dispatching scheduled jobs failed: {e}")
+
+    def start(self, interval: float = settings.SCHEDULER_DISPATCH_INTERVAL) -> None:
+        """Start the background dispatch loop (inside the running loop)."""
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch_loop(interval))
+
+    async def stop(self) -> None:
+        """Stop the background dispatch loop."""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+
     async def get_pending_jobs(
         self,
         workspace_id: Optional[UUID] = None,
@@ -115,23 +259,45 @@ class ContentScheduler:
         Returns:
             List of pending jobs
         """
-        now = datetime.now(timezone.utc)
-        pending = [
-            job
-            for job in self._scheduled_jobs
-            if job.status == "pending" and job.scheduled_at <= now
-        ]
-
-        if workspace_id:
-            pending = [job for job in pending if job.workspace_id == workspace_id]
-
-        # Sort by scheduled time and priority
-        priority_order = {"high": 0, "medium": 1, "low": 2}
-        pending.sort(
-            key=lambda x: (x.scheduled_at, priority_order.get(x.priority, 1))
-        )
-
-        return pending[:limit]
+        pending = []
+        for job in self._iter_due(datetime.now(timezone.utc)):
+            if len(pending) >= limit:
+                break
+            if workspace_id is None or job.workspace_id == workspace_id:
+                pending.append(job)
+        return pending
+
+    def _iter_due(self, now: datetime) -> Iterator[ScheduledJob]:
+        """Yield pending jobs due by now in (scheduled_at, priority) order.
+
+        Walks the heap without modifying it: a small frontier heap of heap
+        positions yields the k earliest jobs in O(k log k).
+        """
+        heap = self._pending_heap
+        frontier = [(heap[0], 0)] if heap else []
+        while frontier:
+            (scheduled_at, _, job_id), position = heapq.heappop(frontier)
+            if scheduled_at > now:
+                return
+            job = self._jobs_by_id.get(job_id)
+            if job is not None and job.status == "pending":
+                yield job
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+
+    def _discard_stale(self) -> None:
+        """Drop heap entries of jobs that are no longer pending.
+
+        Entries at the top are popped; the heap is rebuilt once stale entries
+        make up more than half of it.
+        """
+        heap = self._pending_heap
+        while heap and heap[0][2] not in self._jobs_by_id:
+            heapq.heappop(heap)
+        if len(heap) > 2 * len(self._jobs_by_id):
+            self._pending_heap = [entry for entry in heap if entry[2] in self._jobs_by_id]
+            heapq.heapify(self._pending_heap)
 
     async def get_optimal_times(
         self,
@@ -147,37 +313,51 @@ class ContentScheduler:
         Returns:
             List of optimal time slots with scores
         """
-        patterns = self._traffic_patterns.get(str(workspace_id), [])
+        patterns = self._traffic_patterns.get(str(workspace_id))
 
-        if not patterns:
+        if not patterns or not len(patterns["score"]):
             # Return default optimal times if no data
             return self._get_default_optimal_times(days_ahead)
 
-        # Calculate optimal times from patterns
         optimal_times = []
         now = datetime.now(timezone.utc)
+        best_by_day: Dict[int, List[Tuple[int, float]]] = {}
 
         for day_offset in range(days_ahead):
             target_date = now + timedelta(days=day_offset)
             day_of_week = target_date.weekday()
+            if day_of_week not in best_by_day:
+                best_by_day[day_of_week] = self._best_hours(patterns, day_of_week)
 
-            # Find best hours for this day
-            day_patterns = [p for p in patterns if p.day_of_week == day_of_week]
-            day_patterns.sort(key=lambda x: x.engagement_score, reverse=True)
-
-            for pattern in day_patterns[:3]:  # Top 3 hours per day
+            for hour, score in best_by_day[day_of_week]:
                 optimal_times.append({
                     "datetime": target_date.replace(
-                        hour=pattern.hour, minute=0, second=0, microsecond=0
+                        hour=hour, minute=0, second=0, microsecond=0
                     ).isoformat(),
                     "day_of_week": day_of_week,
-                    "hour": pattern.hour,
-                    "engagement_score": pattern.engagement_score,
-                    "recommended": pattern.engagement_score >= 0.8,
+                    "hour": hour,
+                    "engagement_score": score,
+                    "recommended": score >= 0.8,
                 })
 
         return optimal_times
 
+    @staticmethod
+    def _best_hours(
+        patterns: Dict[str, np.ndarray], day_of_week: int, count: int = 3
+    ) -> List[Tuple[int, float]]:
+        """(hour, engagement score) of a weekday's most engaging hours, best first."""
+        rows = np.flatnonzero(patterns["dow"] == day_of_week)
+        scores = patterns["score"][rows]
+        if count < len(rows):
+            # Top-count in linear time; only those are sorted below
+            top = np.sort(np.argpartition(-scores, count - 1)[:count])
+        else:
+            top = np.arange(len(rows))
+        # Stable, so equal scores keep the order they were given in
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(patterns["hour"][rows[i]]), float(scores[i])) for i in top]
+
     def _get_default_optimal_times(self, days_ahead: int) -> List[Dict[str, Any]]:
         """Get default optimal times when no traffic data is available.
 
@@ -187,37 +367,20 @@ class ContentScheduler:
         Returns:
             List of default optimal time slots
         """
-        # Default optimal publishing times (based on general best practices)
-        default_hours = {
-            0: [9, 10, 14],   # Monday
-            1: [9, 11, 15],   # Tuesday
-            2: [9, 10, 14],   # Wednesday
-            3: [10, 14, 16],  # Thursday
-            4: [9, 11, 13],   # Friday
-            5: [10, 11],      # Saturday
-            6: [10, 11],      # Sunday
-        }
-
-        optimal_times = []
-        now = datetime.now(timezone.utc)
-
-        for day_offset in range(days_ahead):
-            target_date = now + timedelta(days=day_offset)
-            day_of_week = target_date.weekday()
-
-            for hour in default_hours.get(day_of_week, [10]):
-                score = 0.85 if day_of_week < 5 else 0.65  # Higher score on weekdays
-                optimal_times.append({
-                    "datetime": target_date.replace(
-                        hour=hour, minute=0, second=0, microsecond=0
-                    ).isoformat(),
-                    "day_of_week": day_of_week,
-                    "hour": hour,
-                    "engagement_score": score,
-                    "recommended": score >= 0.8,
-                })
-
-        return optimal_times
+        start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        days = [start + timedelta(days=day_offset) for day_offset in range(days_ahead)]
+
+        return [
+            {
+                "datetime": day.replace(hour=hour).isoformat(),
+                "day_of_week": day.weekday(),
+                "hour": hour,
+                "engagement_score": score,
+                "recommended": recommended,
+            }
+            for day in days
+            for hour, score, recommended in _DEFAULT_SLOTS_BY_DAY[day.weekday()]
+        ]
 
     async def update_traffic_patterns(
         self,
@@ -233,25 +396,33 @@ class ContentScheduler:
         Returns:
             Number of patterns updated
         """
-        parsed_patterns = []
+        rows = []
         for p in patterns:
             try:
-                parsed_patterns.append(
-                    TrafficPattern(
-                        day_of_week=p.get("day_of_week", 0),
-                        hour=p.get("hour", 0),
-                        engagement_score=p.get("engagement_score", 0.5),
-                        page_views=p.get("page_views", 0),
-                        avg_session_duration=p.get("avg_session_duration", 0.0),
-                    )
-                )
-            except (KeyError, TypeError) as e:
+                day_of_week = int(p.get("day_of_week", 0))
+                hour = int(p.get("hour", 0))
+                # Out-of-range values would not fit the int8 columns, or
+                # would later fail as datetime hours
+                if not (0 <= day_of_week <= 6 and 0 <= hour <= 23):
+                    raise ValueError(f"day_of_week={day_of_week}, hour={hour} out of range")
+                rows.append((
+                    day_of_week,
+                    hour,
+                    float(p.get("engagement_score", 0.5)),
+                    int(p.get("page_views", 0)),
+                    float(p.get("avg_session_duration", 0.0)),
+                ))
+            except (KeyError, TypeError, ValueError) as e:
                 logger.warning(f"Invalid traffic pattern data: {e}")
 
-        self._traffic_patterns[str(workspace_id)] = parsed_patterns
-        logger.info(f"Updated {len(parsed_patterns)} traffic patterns for workspace {workspace_id}")
+        # One array per field (struct of arrays), filled in one pass each
+        self._traffic_patterns[str(workspace_id)] = {
+            name: np.fromiter((row[i] for row in rows), dtype=dtype, count=len(rows))
+            for i, (name, dtype) in enumerate(TRAFFIC_PATTERN_COLUMNS.items())
+        }
+        logger.info(f"Updated {len(rows)} traffic patterns for workspace {workspace_id}")
 
-        return len(parsed_patterns)
+        return len(rows)
 
     async def cancel_job(self, job_id: str) -> bool:
         """Cancel a scheduled job.
@@ -262,22 +433,51 @@ class ContentScheduler:
         Returns:
             True if cancelled successfully
         """
-        for job in self._scheduled_jobs:
-            if job.id == job_id and job.status == "pending":
-                job.status = "cancelled"
-                logger.info(f"Cancelled job {job_id}")
-                return True
+        job = self._jobs_by_id.get(job_id)
+        if job is not None and job.status == "pending":
+            job.status = "cancelled"
+            del self._jobs_by_id[job_id]
+            self._discard_stale()
+            logger.info(f"Cancelled job {job_id}")
+            return True
+
+        job = self._dispatched.pop(job_id, None)
+        if job is not None:
+            # Already sent: workers discard the task when it is delivered
+            from app.scheduler import celery_app
+
+            try:
+                await asyncio.to_thread(celery_app.control.revoke, job_id)
+            except Exception as e:
+                logger.warning(f"Could not revoke job {job_id}: {e}")
+                self._dispatched[job_id] = job
+                return False
+            job.status = "cancelled"
+            logger.info(f"Revoked job {job_id}")
+            return True
 
         return False
 
     def clear_jobs(self):
         """Clear all scheduled jobs (for testing)."""
-        self._scheduled_jobs = []
+        self._jobs_by_id = {}
+        self._pending_heap = []
+        self._dispatched.clear()
 
     def clear_patterns(self):
         """Clear all traffic patterns (for testing)."""
         self._traffic_patterns = {}
 
 
-# Global scheduler instance
-content_scheduler = ContentScheduler()
+# Global scheduler instance, created on first access of ``content_scheduler``
+_content_scheduler: Optional[ContentScheduler] = None
+
+
+def __getattr__(name: str) -> Any:
+    """Create the global ``content_scheduler`` lazily (PEP 562)."""
+    global _content_scheduler
+    if name == "content_scheduler":
+        if _content_scheduler is None:
+            _content_scheduler = ContentScheduler()
+        return _content_scheduler
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
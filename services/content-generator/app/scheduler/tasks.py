@@ -1,6 +1,5 @@
 """Celery tasks for scheduled content generation."""
 
-import asyncio
 import logging
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
@@ -13,21 +12,11 @@ settings = get_settings()
 
 # Import celery app - handle case where it might not be configured
 try:
-    from app.scheduler.celery_app import celery_app
+    from app.scheduler.celery_app import celery_app, run_async
 except Exception:
     celery_app = None
 
 
-def run_async(coro):
-    """Run async coroutine in sync context."""
-    try:
-        loop = asyncio.get_event_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-    return loop.run_until_complete(coro)
-
-
 async def _get_pending_content_plans() -> List[Dict[str, Any]]:
     """Get content plans that are scheduled for generation.
 
@@ -52,7 +41,7 @@ async def _generate_article_for_plan(plan_id: UUID) -> Optional[Dict[str, Any]]:
         Generated article data or None if failed
     """
     from app.llm_gateway import LLMGateway, CostRouter
-    from app.rag import RAGEngine
+    from app.rag.engine import rag_engine
 
     logger.info(f"Generating article for plan: {plan_id}")
 
@@ -65,7 +54,6 @@ async def _generate_article_for_plan(plan_id: UUID) -> Optional[Dict[str, Any]]:
 
         gateway = LLMGateway()
         cost_router = CostRouter()
-        rag_engine = RAGEngine()
 
         # Placeholder for plan data
         plan_data = {
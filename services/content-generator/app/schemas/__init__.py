@@ -6,6 +6,7 @@ from app.schemas.article import (
     ArticleImageResponse,
     ArticleListResponse,
     ArticleResponse,
+    ArticleStatusResponse,
     ArticleUpdate,
     GenerationResult,
     PaginatedArticleResponse,
@@ -22,6 +23,7 @@ __all__ = [
     "ArticleImageResponse",
     "ArticleListResponse",
     "ArticleResponse",
+    "ArticleStatusResponse",
     "ArticleUpdate",
     "GenerationResult",
     "PaginatedArticleResponse",
@@ -5,7 +5,7 @@ from decimal import Decimal
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, model_validator
 
 
 # Article Schemas
@@ -24,9 +24,16 @@ class ArticleCreate(BaseModel):
     content: Optional[str] = None
     status: str = Field(default="draft", pattern="^(draft|published|archived)$")
     ai_model_used: str = Field(default="gpt-3.5-turbo")
-    word_count: Optional[int] = Field(None, ge=0)
     metadata: Optional[Dict[str, Any]] = None
 
+    @model_validator(mode="before")
+    @classmethod
+    def reject_word_count(cls, data: Any) -> Any:
+        """Reject word_count, which the database computes from the content."""
+        if isinstance(data, dict) and "word_count" in data:
+            raise ValueError("word_count is computed from content and cannot be set")
+        return data
+
 
 class ArticleUpdate(BaseModel):
     """Schema for updating an article."""
@@ -40,6 +47,8 @@ class ArticleUpdate(BaseModel):
 class ArticleImageResponse(BaseModel):
     """Schema for article image response."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     id: UUID
     article_id: UUID
     filename: str
@@ -47,15 +56,15 @@ class ArticleImageResponse(BaseModel):
     content_type: Optional[str] = None
     size_bytes: Optional[int] = None
     storage_path: str
+    content_hash: Optional[str] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 class ArticleResponse(BaseModel):
     """Schema for article response."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     id: UUID
     workspace_id: UUID
     plan_id: Optional[UUID] = None
@@ -65,18 +74,33 @@ class ArticleResponse(BaseModel):
     ai_model_used: str
     cost_usd: Optional[Decimal] = None
     word_count: Optional[int] = None
-    metadata: Optional[Dict[str, Any]] = None
+    cached_input_tokens: Optional[int] = None
+    cache_creation_tokens: Optional[int] = None
+    # The ORM attribute is generation_metadata (metadata is reserved by SQLAlchemy)
+    metadata: Optional[Dict[str, Any]] = Field(
+        default=None,
+        validation_alias=AliasChoices("generation_metadata", "metadata"),
+    )
     images: List[ArticleImageResponse] = []
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+
+class ArticleStatusResponse(BaseModel):
+    """Schema for article status (polling asynchronous generation)."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    status: str
+    updated_at: Optional[datetime] = None
 
 
 class ArticleListResponse(BaseModel):
     """Schema for article response in list (without content for performance)."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     id: UUID
     workspace_id: UUID
     plan_id: Optional[UUID] = None
@@ -89,9 +113,6 @@ class ArticleListResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 class PaginatedArticleResponse(BaseModel):
     """Schema for paginated article response."""
@@ -110,3 +131,6 @@ class GenerationResult(BaseModel):
     model: str
     word_count: int
     tokens_used: Dict[str, int]
+    # Prompt tokens served from / written to the provider's prompt cache
+    cached_input_tokens: int = 0
+    cache_creation_tokens: int = 0
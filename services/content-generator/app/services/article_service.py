@@ -1,19 +1,26 @@
 """Article service for business logic."""
 
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from decimal import Decimal
-from typing import List, Optional, Tuple
+from typing import AsyncIterator, List, Optional, Tuple
 from uuid import UUID
+from weakref import WeakValueDictionary
 
-from sqlalchemy import func, select
+from sqlalchemy import delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload, with_expression
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.models.article import Article, ArticleImage
 from app.schemas.article import ArticleCreate, ArticleUpdate
 
 logger = logging.getLogger(__name__)
 
+# Per-process locks on stored objects; held only while someone uses them
+_storage_path_locks: "WeakValueDictionary[str, asyncio.Lock]" = WeakValueDictionary()
+
 
 class ArticleService:
     """Service for article operations."""
@@ -30,12 +37,14 @@ class ArticleService:
             content=data.content,
             status=data.status,
             ai_model_used=data.ai_model_used,
-            word_count=data.word_count,
             generation_metadata=data.metadata or {},
         )
         self.db.add(article)
         await self.db.commit()
         await self.db.refresh(article)
+        # A new article has no images; mark the relationship as loaded so
+        # response mapping never triggers a lazy load
+        set_committed_value(article, "images", [])
         logger.info(f"Created article: {article.id}")
         return article
 
@@ -47,8 +56,9 @@ class ArticleService:
         content: str,
         model: str,
         cost_usd: Decimal,
-        word_count: int,
         metadata: Optional[dict] = None,
+        cached_input_tokens: Optional[int] = None,
+        cache_creation_tokens: Optional[int] = None,
     ) -> Article:
         """Create an article from generation results."""
         article = Article(
@@ -59,20 +69,90 @@ class ArticleService:
             status="draft",
             ai_model_used=model,
             cost_usd=cost_usd,
-            word_count=word_count,
+            cached_input_tokens=cached_input_tokens,
+            cache_creation_tokens=cache_creation_tokens,
             generation_metadata=metadata or {},
         )
         self.db.add(article)
         await self.db.commit()
         await self.db.refresh(article)
+        set_committed_value(article, "images", [])
         logger.info(f"Created generated article: {article.id}")
         return article
 
+    async def create_pending(
+        self,
+        workspace_id: UUID,
+        plan_id: Optional[UUID],
+        title: str,
+        metadata: Optional[dict] = None,
+    ) -> Article:
+        """Create a placeholder article while its content is generated."""
+        article = Article(
+            workspace_id=workspace_id,
+            plan_id=plan_id,
+            title=title,
+            status="generating",
+            generation_metadata=metadata or {},
+        )
+        self.db.add(article)
+        await self.db.commit()
+        await self.db.refresh(article)
+        set_committed_value(article, "images", [])
+        logger.info(f"Created pending article: {article.id}")
+        return article
+
+    async def complete_generation(
+        self,
+        article_id: UUID,
+        content: str,
+        model: str,
+        cost_usd: Decimal,
+        metadata: Optional[dict] = None,
+        cached_input_tokens: Optional[int] = None,
+        cache_creation_tokens: Optional[int] = None,
+    ) -> Optional[Article]:
+        """Fill in a pending article with generation results."""
+        article = await self.db.get(Article, article_id)
+        if not article:
+            return None
+
+        article.content = content
+        article.status = "draft"
+        article.ai_model_used = model
+        article.cost_usd = cost_usd
+        article.cached_input_tokens = cached_input_tokens
+        article.cache_creation_tokens = cache_creation_tokens
+        article.generation_metadata = {**(article.generation_metadata or {}), **(metadata or {})}
+
+        await self.db.commit()
+        await self.db.refresh(article)
+        logger.info(f"Completed generated article: {article_id}")
+        return article
+
+    async def fail_generation(self, article_id: UUID, error: str) -> None:
+        """Mark a pending article as failed, keeping the error in its metadata."""
+        article = await self.db.get(Article, article_id, options=[raiseload(Article.images)])
+        if not article:
+            return
+
+        article.status = "failed"
+        article.generation_metadata = {**(article.generation_metadata or {}), "error": error}
+        await self.db.commit()
+        logger.info(f"Article generation failed: {article_id}")
+
+    async def get_status(self, article_id: UUID):
+        """Get an article's id, status and updated_at without loading its content."""
+        result = await self.db.execute(
+            select(Article.id, Article.status, Article.updated_at)
+            .where(Article.id == article_id)
+        )
+        return result.one_or_none()
+
     async def get_by_id(self, article_id: UUID) -> Optional[Article]:
         """Get an article by ID with images."""
         result = await self.db.execute(
             select(Article)
-            .options(selectinload(Article.images))
             .where(Article.id == article_id)
         )
         return result.scalar_one_or_none()
@@ -84,26 +164,45 @@ class ArticleService:
         page: int = 1,
         page_size: int = 20,
     ) -> Tuple[List[Article], int]:
-        """Get articles for a workspace with pagination."""
-        query = select(Article).where(Article.workspace_id == workspace_id)
+        """Get articles for a workspace with pagination.
 
+        Image counts come from a LEFT JOIN + GROUP BY and the total from a
+        count(*) OVER () window, so one query returns the page, each
+        article's image_count and the total.
+        """
+        filters = [Article.workspace_id == workspace_id]
         if status:
-            query = query.where(Article.status == status)
-
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar() or 0
+            filters.append(Article.status == status)
 
-        # Apply pagination and order
-        query = query.order_by(Article.created_at.desc())
-        query = query.offset((page - 1) * page_size).limit(page_size)
-        query = query.options(selectinload(Article.images))
+        query = (
+            select(Article, func.count().over().label("total"))
+            .outerjoin(ArticleImage, ArticleImage.article_id == Article.id)
+            .where(*filters)
+            .group_by(Article.id)
+            .options(
+                raiseload(Article.images),
+                with_expression(Article.image_count, func.count(ArticleImage.id)),
+            )
+            .order_by(Article.created_at.desc())
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+            # Fill image_count even for articles already in the session
+            .execution_options(populate_existing=True)
+        )
 
         result = await self.db.execute(query)
-        articles = result.scalars().all()
+        rows = result.all()
+
+        if rows:
+            total = rows[0].total
+        elif page > 1:
+            # Past the last page: no rows to carry the window total
+            count_query = select(func.count()).select_from(Article).where(*filters)
+            total = (await self.db.execute(count_query)).scalar() or 0
+        else:
+            total = 0
 
-        return list(articles), total
+        return [row.Article for row in rows], total
 
     async def update(
         self, article_id: UUID, data: ArticleUpdate
@@ -141,8 +240,15 @@ class ArticleService:
         content_type: str,
         size_bytes: int,
         storage_path: str,
+        content_hash: Optional[str] = None,
+        commit: bool = True,
     ) -> Optional[ArticleImage]:
-        """Add an image to an article."""
+        """Add an image to an article.
+
+        With commit=False the record is only flushed, so it commits (or
+        rolls back) with the caller's transaction, e.g. under
+        lock_storage_path.
+        """
         article = await self.get_by_id(article_id)
         if not article:
             return None
@@ -154,9 +260,13 @@ class ArticleService:
             content_type=content_type,
             size_bytes=size_bytes,
             storage_path=storage_path,
+            content_hash=content_hash,
         )
         self.db.add(image)
-        await self.db.commit()
+        if commit:
+            await self.db.commit()
+        else:
+            await self.db.flush()
         await self.db.refresh(image)
         logger.info(f"Added image {image.id} to article {article_id}")
         return image
@@ -168,6 +278,42 @@ class ArticleService:
         )
         return list(result.scalars().all())
 
+    @asynccontextmanager
+    async def lock_storage_path(self, storage_path: str) -> AsyncIterator[None]:
+        """Hold a lock on a stored object for one transaction.
+
+        Adding a reference and storing the object, or counting references
+        and deleting the object, must not interleave for the same path.
+        On PostgreSQL a transaction-scoped advisory lock keyed on the path
+        serializes them across processes; a per-process asyncio lock does
+        the same on other databases (and spares the database contention
+        between requests of one process). The transaction commits on exit,
+        releasing the advisory lock, or rolls back if the block raised.
+        """
+        lock = _storage_path_locks.get(storage_path)
+        if lock is None:
+            lock = _storage_path_locks[storage_path] = asyncio.Lock()
+        async with lock:
+            try:
+                if self.db.get_bind().dialect.name == "postgresql":
+                    await self.db.execute(
+                        select(func.pg_advisory_xact_lock(func.hashtext(storage_path)))
+                    )
+                yield
+            except BaseException:
+                await self.db.rollback()
+                raise
+            await self.db.commit()
+
+    async def count_images_by_path(self, storage_path: str) -> int:
+        """Count image records referencing a stored object."""
+        result = await self.db.execute(
+            select(func.count())
+            .select_from(ArticleImage)
+            .where(ArticleImage.storage_path == storage_path)
+        )
+        return result.scalar() or 0
+
     async def delete_image(self, image_id: UUID) -> bool:
         """Delete an image."""
         result = await self.db.execute(
@@ -181,3 +327,21 @@ class ArticleService:
         await self.db.commit()
         logger.info(f"Deleted image: {image_id}")
         return True
+
+    async def pop_image(self, article_id: UUID, image_id: UUID) -> Optional[str]:
+        """Delete an article's image in one statement.
+
+        Returns:
+            The deleted image's storage path, or None if the image does not
+            exist or belongs to another article.
+        """
+        result = await self.db.execute(
+            delete(ArticleImage)
+            .where(ArticleImage.id == image_id, ArticleImage.article_id == article_id)
+            .returning(ArticleImage.storage_path)
+        )
+        storage_path = result.scalar_one_or_none()
+        await self.db.commit()
+        if storage_path is not None:
+            logger.info(f"Deleted image {image_id} from article {article_id}")
+        return storage_path
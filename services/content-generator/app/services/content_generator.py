@@ -5,9 +5,9 @@ import re
 from decimal import Decimal
 from typing import Any, Dict, List, Optional
 
-from openai import AsyncOpenAI
-
 from app.core.config import get_settings
+from app.core.http_client import get_openai_client
+from app.llm_gateway.limits import get_limiter
 from app.schemas.article import GenerationResult
 
 logger = logging.getLogger(__name__)
@@ -35,7 +35,7 @@ class ContentGenerator:
         """
         self.api_key = api_key if api_key is not None else settings.OPENAI_API_KEY
         # Only create client if we have a non-empty API key
-        self.client = AsyncOpenAI(api_key=self.api_key) if self.api_key else None
+        self.client = get_openai_client(self.api_key) if self.api_key else None
         self.model = settings.OPENAI_MODEL
         self.max_tokens = settings.OPENAI_MAX_TOKENS
         self.temperature = settings.OPENAI_TEMPERATURE
@@ -66,22 +66,23 @@ class ContentGenerator:
 
         prompt = self._build_prompt(title, target_keywords, estimated_word_count)
 
-        response = await self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are an expert SEO content writer. "
-                        "You write comprehensive, engaging, and well-structured articles "
-                        "that rank well in search engines while providing value to readers."
-                    ),
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=self.temperature,
-            max_tokens=self.max_tokens,
-        )
+        async with get_limiter("openai").slot():
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": (
+                            "You are an expert SEO content writer. "
+                            "You write comprehensive, engaging, and well-structured articles "
+                            "that rank well in search engines while providing value to readers."
+                        ),
+                    },
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=self.temperature,
+                max_tokens=self.max_tokens,
+            )
 
         content = response.choices[0].message.content or ""
         usage = response.usage
@@ -89,6 +90,8 @@ class ContentGenerator:
         # Calculate cost
         input_tokens = usage.prompt_tokens if usage else 0
         output_tokens = usage.completion_tokens if usage else 0
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = (getattr(details, "cached_tokens", None) or 0) if details else 0
         cost = self._calculate_cost(input_tokens, output_tokens)
 
         # Count words
@@ -104,6 +107,7 @@ class ContentGenerator:
                 "completion_tokens": output_tokens,
                 "total_tokens": input_tokens + output_tokens,
             },
+            cached_input_tokens=cached_tokens,
         )
 
     def _generate_mock_article(
@@ -5,7 +5,6 @@ When RABBITMQ_URL is set to 'mock://' or connection fails gracefully,
 events are logged but not actually published.
 """
 
-import json
 import logging
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
@@ -13,6 +12,7 @@ from uuid import UUID, uuid4
 from decimal import Decimal
 
 import aio_pika
+import orjson
 from aio_pika import Message, ExchangeType
 
 from app.core.config import get_settings
@@ -128,7 +128,7 @@ class EventPublisher:
             return
 
         message = Message(
-            json.dumps(event).encode(),
+            orjson.dumps(event),
             content_type="application/json",
             delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
         )
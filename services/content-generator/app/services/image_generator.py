@@ -9,6 +9,8 @@ from urllib.parse import quote_plus
 import httpx
 
 from app.core.config import get_settings
+from app.core.http_client import LLM_TIMEOUT, get_http_client
+from app.llm_gateway.limits import get_limiter
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -40,13 +42,15 @@ class ImageService:
     - Stable Diffusion for AI image generation (via API)
     """
 
-    def __init__(self, mock_mode: bool = False):
+    def __init__(self, mock_mode: bool = False, http_client: Optional[httpx.AsyncClient] = None):
         """Initialize the image service.
 
         Args:
             mock_mode: If True, returns mock images for testing
+            http_client: HTTP client for stock image APIs (default: the shared client)
         """
         self._mock_mode = mock_mode
+        self._http_client = http_client
         self.pexels_api_key = getattr(settings, "PEXELS_API_KEY", "")
         self.unsplash_access_key = getattr(settings, "UNSPLASH_ACCESS_KEY", "")
         self.openai_api_key = settings.OPENAI_API_KEY
@@ -57,7 +61,11 @@ class ImageService:
             try:
                 from openai import AsyncOpenAI
 
-                self._openai_client = AsyncOpenAI(api_key=self.openai_api_key)
+                self._openai_client = AsyncOpenAI(
+                    api_key=self.openai_api_key,
+                    http_client=self.http_client,
+                    timeout=LLM_TIMEOUT,
+                )
             except ImportError:
                 logger.warning("OpenAI package not installed for image generation")
 
@@ -66,6 +74,11 @@ class ImageService:
         """Check if service is in mock mode."""
         return self._mock_mode
 
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Get the HTTP client (injected, or the shared process-wide one)."""
+        return self._http_client or get_http_client()
+
     async def get_free_images(
         self,
         query: str,
@@ -134,10 +147,9 @@ class ImageService:
             "orientation": orientation,
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            data = response.json()
+        response = await self.http_client.get(url, headers=headers, params=params)
+        response.raise_for_status()
+        data = response.json()
 
         results = []
         for photo in data.get("photos", []):
@@ -182,10 +194,9 @@ class ImageService:
             "orientation": orientation,
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            data = response.json()
+        response = await self.http_client.get(url, headers=headers, params=params)
+        response.raise_for_status()
+        data = response.json()
 
         results = []
         for photo in data.get("results", []):
@@ -228,13 +239,14 @@ class ImageService:
             return self._generate_mock_ai_image(prompt, size)
 
         try:
-            response = await self._openai_client.images.generate(
-                model=model,
-                prompt=prompt,
-                size=size,
-                quality=quality,
-                n=1,
-            )
+            async with get_limiter("openai").slot():
+                response = await self._openai_client.images.generate(
+                    model=model,
+                    prompt=prompt,
+                    size=size,
+                    quality=quality,
+                    n=1,
+                )
 
             image_data = response.data[0]
             width, height = map(int, size.split("x"))
@@ -4,18 +4,50 @@ Supports both real S3/MinIO connections and mock mode for testing.
 In mock mode, images are stored in memory instead of real object storage.
 """
 
+import base64
+import hashlib
 import logging
 import uuid
-from typing import BinaryIO, Dict, Optional
+from typing import AsyncIterator, BinaryIO, Dict, Optional
 
 import aioboto3
 from botocore.config import Config
+from botocore.exceptions import ClientError
 
 from app.core.config import get_settings
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# S3 requires every multipart part except the last to be at least 5 MiB
+MULTIPART_PART_SIZE = 5 * 1024 * 1024
+
+# BLAKE3 is several times faster than SHA-256 on CPUs without SHA extensions;
+# fall back to SHA-256 when the optional blake3 package is not installed.
+try:
+    from blake3 import blake3 as _blake3
+
+    CONTENT_HASH_ALGORITHM = "blake3"
+except ImportError:
+    _blake3 = None
+    CONTENT_HASH_ALGORITHM = "sha256"
+
+
+def new_content_hasher():
+    """Create a hasher for image content deduplication.
+
+    The returned object supports update() and hexdigest(). Use
+    format_content_hash() to turn the digest into the stored value.
+    """
+    if _blake3 is not None:
+        return _blake3()
+    return hashlib.sha256()
+
+
+def format_content_hash(hasher) -> str:
+    """Format a digest as '<algorithm>:<hex>' so mixed algorithms never collide."""
+    return f"{CONTENT_HASH_ALGORITHM}:{hasher.hexdigest()}"
+
 
 class ImageStorageService:
     """Service for storing and retrieving images from S3/MinIO.
@@ -96,10 +128,7 @@ class ImageStorageService:
         Returns:
             The storage path of the uploaded image
         """
-        # Generate unique filename
-        extension = original_filename.rsplit(".", 1)[-1] if "." in original_filename else "jpg"
-        unique_filename = f"{uuid.uuid4()}.{extension}"
-        storage_path = f"articles/{article_id}/{unique_filename}"
+        storage_path = self._build_storage_path(article_id, original_filename)
 
         if self._mock_mode:
             # In mock mode, store in memory
@@ -118,6 +147,170 @@ class ImageStorageService:
 
         return storage_path
 
+    async def upload_stream(
+        self,
+        article_id: uuid.UUID,
+        chunks: AsyncIterator[bytes],
+        original_filename: str,
+        content_type: str,
+        storage_path: Optional[str] = None,
+    ) -> str:
+        """Upload an image to S3/MinIO from an async stream of chunks.
+
+        Chunks are buffered only up to one multipart part, so peak memory
+        stays bounded regardless of the image size. Images that fit in a
+        single part are sent with a plain PUT; larger ones use a multipart
+        upload with a SHA-256 checksum verified by the server for each part.
+        If the stream raises (e.g. the size limit is exceeded), any
+        in-progress multipart upload is aborted and the error re-raised.
+
+        In mock mode, the chunks are joined and stored in memory.
+
+        Args:
+            article_id: The article ID to associate the image with
+            chunks: Async iterator yielding the image content
+            original_filename: Original filename from upload
+            content_type: MIME type of the image
+            storage_path: Explicit storage path (e.g. from build_content_path);
+                         a unique per-article path is generated when omitted
+
+        Returns:
+            The storage path of the uploaded image
+        """
+        if storage_path is None:
+            storage_path = self._build_storage_path(article_id, original_filename)
+
+        if self._mock_mode:
+            self._mock_storage[storage_path] = b"".join([chunk async for chunk in chunks])
+            logger.info(f"Mock uploaded image to {storage_path}")
+            return storage_path
+
+        async with self.session.client("s3", **self._get_client_config()) as s3:
+            buffer = bytearray()
+            upload_id: Optional[str] = None
+            parts = []
+
+            async def flush_part() -> None:
+                nonlocal upload_id
+                if upload_id is None:
+                    created = await s3.create_multipart_upload(
+                        Bucket=self.bucket,
+                        Key=storage_path,
+                        ContentType=content_type,
+                        ChecksumAlgorithm="SHA256",
+                    )
+                    upload_id = created["UploadId"]
+                part_number = len(parts) + 1
+                body = bytes(buffer)
+                checksum = base64.b64encode(hashlib.sha256(body).digest()).decode()
+                response = await s3.upload_part(
+                    Bucket=self.bucket,
+                    Key=storage_path,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=body,
+                    ChecksumSHA256=checksum,
+                )
+                parts.append({
+                    "PartNumber": part_number,
+                    "ETag": response["ETag"],
+                    "ChecksumSHA256": checksum,
+                })
+                buffer.clear()
+
+            try:
+                async for chunk in chunks:
+                    buffer.extend(chunk)
+                    if len(buffer) >= MULTIPART_PART_SIZE:
+                        await flush_part()
+
+                if upload_id is None:
+                    # Small image: a single PUT is cheaper than a multipart upload
+                    await s3.put_object(
+                        Bucket=self.bucket,
+                        Key=storage_path,
+                        Body=bytes(buffer),
+                        ContentType=content_type,
+                    )
+                else:
+                    if buffer:
+                        await flush_part()
+                    await s3.complete_multipart_upload(
+                        Bucket=self.bucket,
+                        Key=storage_path,
+                        UploadId=upload_id,
+                        MultipartUpload={"Parts": parts},
+                    )
+            except BaseException:
+                if upload_id is not None:
+                    try:
+                        await s3.abort_multipart_upload(
+                            Bucket=self.bucket,
+                            Key=storage_path,
+                            UploadId=upload_id,
+                        )
+                    except Exception as e:
+                        logger.warning(f"Failed to abort multipart upload {upload_id}: {e}")
+                raise
+
+            logger.info(f"Uploaded image to {storage_path}")
+
+        return storage_path
+
+    def _build_storage_path(self, article_id: uuid.UUID, original_filename: str) -> str:
+        """Build a unique storage path for an article image.
+
+        Args:
+            article_id: The article ID the image belongs to
+            original_filename: Original filename from upload
+
+        Returns:
+            The storage path for the image
+        """
+        extension = original_filename.rsplit(".", 1)[-1] if "." in original_filename else "jpg"
+        unique_filename = f"{uuid.uuid4()}.{extension}"
+        return f"articles/{article_id}/{unique_filename}"
+
+    def build_content_path(self, content_hash: str, original_filename: str) -> str:
+        """Build a content-addressed storage path for an image.
+
+        Identical images map to the same path, so they are stored once no
+        matter how many articles reference them.
+
+        Args:
+            content_hash: Hash from format_content_hash ('<algorithm>:<hex>')
+            original_filename: Original filename from upload (for the extension)
+
+        Returns:
+            The storage path for the image
+        """
+        digest = content_hash.rsplit(":", 1)[-1]
+        extension = original_filename.rsplit(".", 1)[-1] if "." in original_filename else "jpg"
+        return f"articles/{digest[:2]}/{digest}.{extension}"
+
+    async def exists(self, storage_path: str) -> bool:
+        """Check whether an object exists in S3/MinIO.
+
+        In mock mode, checks the in-memory storage.
+
+        Args:
+            storage_path: The storage path to check
+
+        Returns:
+            True if the object exists
+        """
+        if self._mock_mode:
+            return storage_path in self._mock_storage
+
+        async with self.session.client("s3", **self._get_client_config()) as s3:
+            try:
+                await s3.head_object(Bucket=self.bucket, Key=storage_path)
+                return True
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                    return False
+                raise
+
     async def delete_image(self, storage_path: str) -> bool:
         """Delete an image from S3/MinIO.
 
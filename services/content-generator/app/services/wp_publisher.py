@@ -5,8 +5,7 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
-import httpx
-
+from app.core.http_client import get_http_client
 from app.models.article import Article
 from app.models.published_post import PublishedPost
 from app.services.event_publisher import event_publisher
@@ -125,20 +124,20 @@ class WordPressPublisher:
             url = mock_response["link"]
         else:
             # Real API call
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{site.wp_api_endpoint}/wp-json/wp/v2/posts",
-                    json=payload,
-                    auth=(site.wp_username, site.wp_app_password),
-                    timeout=30.0,
-                )
-                response.raise_for_status()
+            client = get_http_client()
+            response = await client.post(
+                f"{site.wp_api_endpoint}/wp-json/wp/v2/posts",
+                json=payload,
+                auth=(site.wp_username, site.wp_app_password),
+                timeout=30.0,
+            )
+            response.raise_for_status()
 
-                data = response.json()
-                wp_post_id = data["id"]
-                url = data["link"]
+            data = response.json()
+            wp_post_id = data["id"]
+            url = data["link"]
 
-                logger.info(f"Published article {article.id} to WordPress: {url}")
+            logger.info(f"Published article {article.id} to WordPress: {url}")
 
         # Save to database if session available
         if self.db:
@@ -235,15 +234,15 @@ class WordPressPublisher:
             logger.info(f"Mock updated WordPress post {wp_post_id}")
             return mock_response
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{site.wp_api_endpoint}/wp-json/wp/v2/posts/{wp_post_id}",
-                json=payload,
-                auth=(site.wp_username, site.wp_app_password),
-                timeout=30.0,
-            )
-            response.raise_for_status()
-            return response.json()
+        client = get_http_client()
+        response = await client.post(
+            f"{site.wp_api_endpoint}/wp-json/wp/v2/posts/{wp_post_id}",
+            json=payload,
+            auth=(site.wp_username, site.wp_app_password),
+            timeout=30.0,
+        )
+        response.raise_for_status()
+        return response.json()
 
     async def delete_post(
         self,
@@ -265,15 +264,15 @@ class WordPressPublisher:
             logger.info(f"Mock deleted WordPress post {wp_post_id}")
             return {"deleted": True, "id": wp_post_id}
 
-        async with httpx.AsyncClient() as client:
-            response = await client.delete(
-                f"{site.wp_api_endpoint}/wp-json/wp/v2/posts/{wp_post_id}",
-                params={"force": force},
-                auth=(site.wp_username, site.wp_app_password),
-                timeout=30.0,
-            )
-            response.raise_for_status()
-            return response.json()
+        client = get_http_client()
+        response = await client.delete(
+            f"{site.wp_api_endpoint}/wp-json/wp/v2/posts/{wp_post_id}",
+            params={"force": force},
+            auth=(site.wp_username, site.wp_app_password),
+            timeout=30.0,
+        )
+        response.raise_for_status()
+        return response.json()
 
     async def get_categories(self, site: Site) -> List[Dict[str, Any]]:
         """Get available categories from WordPress.
@@ -290,14 +289,14 @@ class WordPressPublisher:
                 {"id": 2, "name": "SEO", "slug": "seo"},
             ]
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{site.wp_api_endpoint}/wp-json/wp/v2/categories",
-                auth=(site.wp_username, site.wp_app_password),
-                timeout=30.0,
-            )
-            response.raise_for_status()
-            return response.json()
+        client = get_http_client()
+        response = await client.get(
+            f"{site.wp_api_endpoint}/wp-json/wp/v2/categories",
+            auth=(site.wp_username, site.wp_app_password),
+            timeout=30.0,
+        )
+        response.raise_for_status()
+        return response.json()
 
     async def get_tags(self, site: Site) -> List[Dict[str, Any]]:
         """Get available tags from WordPress.
@@ -314,11 +313,11 @@ class WordPressPublisher:
                 {"id": 2, "name": "marketing", "slug": "marketing"},
             ]
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{site.wp_api_endpoint}/wp-json/wp/v2/tags",
-                auth=(site.wp_username, site.wp_app_password),
-                timeout=30.0,
-            )
-            response.raise_for_status()
-            return response.json()
+        client = get_http_client()
+        response = await client.get(
+            f"{site.wp_api_endpoint}/wp-json/wp/v2/tags",
+            auth=(site.wp_username, site.wp_app_password),
+            timeout=30.0,
+        )
+        response.raise_for_status()
+        return response.json()
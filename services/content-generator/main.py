@@ -5,10 +5,19 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from prometheus_client import make_asgi_app
 
+from app.api.v1.articles import MAX_IMAGE_SIZE
 from app.api.v1.router import api_router
 from app.core.config import get_settings
+from app.core.http_client import close_http_client
+from app.core.middleware import ContentLengthLimitMiddleware
+from app.db.session import warm_up_pool
+from app.internal_linker.basic_linker import shutdown_scan_pool
+from app.rag.buffered_indexer import close_rag_indexer
+from app.rag.engine import close_rag_engine
+from app.scheduler.scheduler import content_scheduler
 from app.services.event_publisher import event_publisher
 
 settings = get_settings()
@@ -27,17 +36,27 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting Content Generator Service...")
 
+    await warm_up_pool()
+
     # Connect to RabbitMQ
     try:
         await event_publisher.connect()
     except Exception as e:
         logger.warning(f"Could not connect to RabbitMQ: {e}")
 
+    content_scheduler.start()
+
     yield
 
     # Shutdown
     logger.info("Shutting down Content Generator Service...")
+    await content_scheduler.stop()
     await event_publisher.disconnect()
+    # No-ops unless RAG was used: its globals are created on first access
+    await close_rag_indexer()
+    close_rag_engine()
+    shutdown_scan_pool()
+    await close_http_client()
 
 
 app = FastAPI(
@@ -48,6 +67,16 @@ app = FastAPI(
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+
+# Reject oversized image uploads before the multipart body is parsed
+# (allowance on top of the image limit covers the multipart framing).
+# Added before CORS so CORS wraps it and the 413 carries CORS headers
+app.add_middleware(
+    ContentLengthLimitMiddleware,
+    max_body_size=MAX_IMAGE_SIZE + 64 * 1024,
+    path_pattern=r"^/api/v1/articles/[^/]+/images$",
 )
 
 # CORS middleware
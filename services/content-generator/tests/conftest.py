@@ -31,7 +31,7 @@ from sqlalchemy.pool import StaticPool
 from app.core.config import Settings, get_settings
 from app.core.security import create_access_token
 from app.db.base import Base
-from app.db.session import get_db
+from app.db.session import get_db, get_schema_translate_map
 from main import app
 
 
@@ -64,6 +64,9 @@ test_engine = create_async_engine(
     "sqlite+aiosqlite:///:memory:",
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
+    execution_options={
+        "schema_translate_map": get_schema_translate_map("sqlite+aiosqlite:///:memory:")
+    },
 )
 
 TestSessionLocal = sessionmaker(
@@ -49,6 +49,27 @@ class TestArticleEndpoints:
         assert data["ai_model_used"] == "gpt-3.5-turbo"
         assert data["content"] == "# Test Content\n\nThis is a test article."
 
+    @pytest.mark.asyncio
+    async def test_create_article_rejects_word_count(
+        self,
+        async_client: AsyncClient,
+        auth_headers,
+        test_workspace_id,
+    ):
+        """Test word_count, computed from the content, cannot be sent."""
+        response = await async_client.post(
+            "/api/v1/articles",
+            json={
+                "title": "Test SEO Article",
+                "workspace_id": str(test_workspace_id),
+                "content": "Some content",
+                "word_count": 500,
+            },
+            headers=auth_headers,
+        )
+        assert response.status_code == 422
+        assert "word_count is computed" in response.text
+
     @pytest.mark.asyncio
     async def test_list_articles_unauthorized(self, async_client: AsyncClient):
         """Test listing articles without auth fails."""
@@ -181,6 +202,34 @@ class TestArticleEndpoints:
         assert data["title"] == "My Article"
         assert data["content"] == "Article content here"
 
+    @pytest.mark.asyncio
+    async def test_get_article_returns_metadata(
+        self,
+        async_client: AsyncClient,
+        auth_headers,
+        test_workspace_id,
+    ):
+        """Test article metadata is mapped from the ORM generation_metadata column."""
+        create_response = await async_client.post(
+            "/api/v1/articles",
+            json={
+                "title": "Article With Metadata",
+                "workspace_id": str(test_workspace_id),
+                "metadata": {"source": "manual"},
+            },
+            headers=auth_headers,
+        )
+        assert create_response.status_code == 201
+        assert create_response.json()["metadata"] == {"source": "manual"}
+        assert create_response.json()["images"] == []
+
+        response = await async_client.get(
+            f"/api/v1/articles/{create_response.json()['id']}",
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        assert response.json()["metadata"] == {"source": "manual"}
+
     @pytest.mark.asyncio
     async def test_update_article_not_found(
         self, async_client: AsyncClient, auth_headers
@@ -311,8 +360,10 @@ class TestImageUpload:
         assert data["original_filename"] == "test-image.jpg"
         assert data["content_type"] == "image/jpeg"
         assert data["size_bytes"] == len(image_content)
+        assert data["content_hash"].split(":")[0] in ("blake3", "sha256")
         assert "storage_path" in data
-        assert data["storage_path"].startswith(f"articles/{article_id}/")
+        digest = data["content_hash"].split(":")[1]
+        assert data["storage_path"] == f"articles/{digest[:2]}/{digest}.jpg"
 
     @pytest.mark.asyncio
     async def test_upload_image_article_not_found(
@@ -359,6 +410,56 @@ class TestImageUpload:
         assert response.status_code == 400
         assert "Invalid image type" in response.json()["detail"]
 
+    @pytest.mark.asyncio
+    async def test_upload_image_too_large(
+        self,
+        async_client: AsyncClient,
+        auth_headers,
+        test_workspace_id,
+    ):
+        """Test uploading an image over the size limit returns 400."""
+        create_response = await async_client.post(
+            "/api/v1/articles",
+            json={
+                "title": "Article",
+                "workspace_id": str(test_workspace_id),
+            },
+            headers=auth_headers,
+        )
+        article_id = create_response.json()["id"]
+
+        files = {"file": ("big.jpg", b"x" * 2048, "image/jpeg")}
+        with patch("app.api.v1.articles.MAX_IMAGE_SIZE", 1024):
+            response = await async_client.post(
+                f"/api/v1/articles/{article_id}/images",
+                files=files,
+                headers=auth_headers,
+            )
+
+        assert response.status_code == 400
+        assert "Image too large" in response.json()["detail"]
+
+    @pytest.mark.asyncio
+    async def test_upload_rejected_by_content_length(
+        self,
+        async_client: AsyncClient,
+        auth_headers,
+    ):
+        """Test oversized uploads get 413 before routing, with CORS headers."""
+        from app.api.v1.articles import MAX_IMAGE_SIZE
+        from app.core.config import get_settings
+
+        origin = get_settings().CORS_ORIGINS[0]
+        files = {"file": ("big.jpg", b"x" * (MAX_IMAGE_SIZE + 64 * 1024 + 1), "image/jpeg")}
+        response = await async_client.post(
+            f"/api/v1/articles/{uuid4()}/images",
+            files=files,
+            headers={**auth_headers, "Origin": origin},
+        )
+
+        assert response.status_code == 413
+        assert response.headers["access-control-allow-origin"] == origin
+
     @pytest.mark.asyncio
     async def test_delete_image(
         self,
@@ -401,6 +502,171 @@ class TestImageUpload:
         )
         assert len(get_response.json()["images"]) == 0
 
+    @pytest.mark.asyncio
+    async def test_upload_duplicate_image_shares_storage(
+        self,
+        async_client: AsyncClient,
+        auth_headers,
+        test_workspace_id,
+    ):
+        """Test identical images share one stored object until the last reference is deleted."""
+        from app.services.image_storage import image_storage
+
+        image_content = b"shared image bytes"
+        uploads = []
+        for i in range(2):
+            create_response = await async_client.post(
+                "/api/v1/articles",
+                json={
+                    "title": f"Article Sharing Image {i}",
+                    "workspace_id": str(test_workspace_id),
+                },
+                headers=auth_headers,
+            )
+            article_id = create_response.json()["id"]
+            response = await async_client.post(
+                f"/api/v1/articles/{article_id}/images",
+                files={"file": ("shared.png", image_content, "image/png")},
+                headers=auth_headers,
+            )
+            assert response.status_code == 201
+            uploads.append((article_id, response.json()))
+
+        storage_path = uploads[0][1]["storage_path"]
+        assert uploads[1][1]["storage_path"] == storage_path
+        assert image_storage.mock_storage[storage_path] == image_content
+
+        # Still referenced by the second article
+        await async_client.delete(
+            f"/api/v1/articles/{uploads[0][0]}/images/{uploads[0][1]['id']}",
+            headers=auth_headers,
+        )
+        assert storage_path in image_storage.mock_storage
+
+        # Last reference gone
+        await async_client.delete(
+            f"/api/v1/articles/{uploads[1][0]}",
+            headers=auth_headers,
+        )
+        assert storage_path not in image_storage.mock_storage
+
+    @pytest.mark.asyncio
+    async def test_upload_reuse_survives_concurrent_delete(
+        self,
+        async_client: AsyncClient,
+        auth_headers,
+        test_workspace_id,
+    ):
+        """Test a delete racing an upload that reuses the object keeps the object."""
+        import asyncio
+        from uuid import UUID
+
+        from app.api.v1 import articles as articles_api
+        from app.services.article_service import ArticleService
+        from app.services.image_storage import image_storage
+        from tests.conftest import TestSessionLocal
+
+        create_response = await async_client.post(
+            "/api/v1/articles",
+            json={"title": "Racing Upload", "workspace_id": str(test_workspace_id)},
+            headers=auth_headers,
+        )
+        article_id = create_response.json()["id"]
+        image_content = b"raced image bytes"
+        response = await async_client.post(
+            f"/api/v1/articles/{article_id}/images",
+            files={"file": ("raced.png", image_content, "image/png")},
+            headers=auth_headers,
+        )
+        first = response.json()
+        storage_path = first["storage_path"]
+
+        original_exists = image_storage.exists
+        releases = []
+
+        async def release(path):
+            async with TestSessionLocal() as session:
+                service = ArticleService(session)
+                await service.pop_image(UUID(article_id), UUID(first["id"]))
+                await articles_api._release_stored_image(service, path)
+
+        async def exists_during_concurrent_delete(path):
+            # The other request deletes the last existing reference while
+            # this upload holds the object's lock; it must wait its turn
+            releases.append(asyncio.create_task(release(path)))
+            done, _ = await asyncio.wait(releases, timeout=0.1)
+            assert not done
+            return await original_exists(path)
+
+        with patch.object(image_storage, "exists", exists_during_concurrent_delete):
+            response = await async_client.post(
+                f"/api/v1/articles/{article_id}/images",
+                files={"file": ("raced.png", image_content, "image/png")},
+                headers=auth_headers,
+            )
+        await asyncio.gather(*releases)
+
+        assert response.status_code == 201
+        assert response.json()["storage_path"] == storage_path
+        assert image_storage.mock_storage[storage_path] == image_content
+
+    @pytest.mark.asyncio
+    async def test_upload_during_release_stores_object_again(
+        self,
+        async_client: AsyncClient,
+        auth_headers,
+        test_workspace_id,
+    ):
+        """Test an upload of the same content racing a release waits and stores it again."""
+        import asyncio
+
+        from app.services.image_storage import image_storage
+
+        create_response = await async_client.post(
+            "/api/v1/articles",
+            json={"title": "Released Upload", "workspace_id": str(test_workspace_id)},
+            headers=auth_headers,
+        )
+        article_id = create_response.json()["id"]
+        image_content = b"released image bytes"
+        response = await async_client.post(
+            f"/api/v1/articles/{article_id}/images",
+            files={"file": ("released.png", image_content, "image/png")},
+            headers=auth_headers,
+        )
+        first = response.json()
+        storage_path = first["storage_path"]
+
+        original_delete = image_storage.delete_image
+        uploads = []
+
+        async def delete_during_upload(path):
+            # The release has counted no references; a same-content upload
+            # starts now, and must not reuse the object about to be deleted
+            uploads.append(
+                asyncio.create_task(
+                    async_client.post(
+                        f"/api/v1/articles/{article_id}/images",
+                        files={"file": ("released.png", image_content, "image/png")},
+                        headers=auth_headers,
+                    )
+                )
+            )
+            done, _ = await asyncio.wait(uploads, timeout=0.1)
+            assert not done
+            return await original_delete(path)
+
+        with patch.object(image_storage, "delete_image", delete_during_upload):
+            await async_client.delete(
+                f"/api/v1/articles/{article_id}/images/{first['id']}",
+                headers=auth_headers,
+            )
+            (response,) = await asyncio.gather(*uploads)
+
+        assert response.status_code == 201
+        assert response.json()["storage_path"] == storage_path
+        assert image_storage.mock_storage[storage_path] == image_content
+
     @pytest.mark.asyncio
     async def test_get_article_with_images(
         self,
@@ -438,6 +704,40 @@ class TestImageUpload:
         data = response.json()
         assert len(data["images"]) == 2
 
+    @pytest.mark.asyncio
+    async def test_list_articles_image_count(
+        self,
+        async_client: AsyncClient,
+        auth_headers,
+        test_workspace_id,
+    ):
+        """Test article listing reports the image count for each article."""
+        create_response = await async_client.post(
+            "/api/v1/articles",
+            json={
+                "title": "Article to Count Images",
+                "workspace_id": str(test_workspace_id),
+            },
+            headers=auth_headers,
+        )
+        article_id = create_response.json()["id"]
+
+        for i in range(3):
+            files = {"file": (f"image{i}.png", b"image content", "image/png")}
+            await async_client.post(
+                f"/api/v1/articles/{article_id}/images",
+                files=files,
+                headers=auth_headers,
+            )
+
+        response = await async_client.get(
+            f"/api/v1/articles?workspace_id={test_workspace_id}",
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        counts = {item["id"]: item["image_count"] for item in response.json()["data"]}
+        assert counts[article_id] == 3
+
 
 class TestContentGeneration:
     """Tests for content generation functionality."""
@@ -529,6 +829,98 @@ class TestContentGeneration:
         assert "generated_from_plan" in data["metadata"]
         assert data["metadata"]["generated_from_plan"] == str(plan_id)
 
+    @pytest.mark.asyncio
+    async def test_generate_article_respond_async(
+        self,
+        async_client: AsyncClient,
+        auth_headers,
+        db_session,
+        test_workspace_id,
+    ):
+        """Test Prefer: respond-async returns 202 and generates in the background."""
+        from sqlalchemy import text
+
+        from tests.conftest import TestSessionLocal
+
+        plan_id = uuid4()
+        await db_session.execute(
+            text("""
+                CREATE TABLE IF NOT EXISTS content_plans (
+                    id TEXT PRIMARY KEY,
+                    workspace_id TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    target_keywords TEXT,
+                    estimated_word_count INTEGER
+                )
+            """)
+        )
+        await db_session.execute(
+            text("""
+                INSERT INTO content_plans (id, workspace_id, title, target_keywords, estimated_word_count)
+                VALUES (:id, :workspace_id, :title, :keywords, :word_count)
+            """),
+            {
+                "id": str(plan_id),
+                "workspace_id": str(test_workspace_id),
+                "title": "Async Generated Guide",
+                "keywords": '["seo"]',
+                "word_count": 800,
+            }
+        )
+        await db_session.commit()
+
+        # Background job opens its own session; point it at the test database
+        with patch("app.api.v1.articles.AsyncSessionLocal", TestSessionLocal):
+            response = await async_client.post(
+                "/api/v1/articles/generate",
+                json={"plan_id": str(plan_id)},
+                headers={**auth_headers, "Prefer": "respond-async"},
+            )
+
+        assert response.status_code == 202
+        data = response.json()
+        assert data["status"] == "generating"
+        assert response.headers["Location"] == f"/api/v1/articles/{data['id']}"
+
+        # The background task has run by the time the ASGI call returns
+        status_response = await async_client.get(
+            f"/api/v1/articles/{data['id']}/status",
+            headers=auth_headers,
+        )
+        assert status_response.status_code == 200
+        assert status_response.json()["status"] == "draft"
+
+        article = (await async_client.get(response.headers["Location"], headers=auth_headers)).json()
+        assert article["content"] is not None
+        assert article["metadata"]["generated_from_plan"] == str(plan_id)
+
+    @pytest.mark.asyncio
+    async def test_generation_job_marks_article_failed_after_generation(
+        self,
+        db_session,
+        test_workspace_id,
+    ):
+        """Test a failure after the content is generated still marks the article failed."""
+        from app.api.v1.articles import _run_generation_job
+        from app.services.article_service import ArticleService
+        from tests.conftest import TestSessionLocal
+
+        article = await ArticleService(db_session).create_pending(
+            workspace_id=test_workspace_id,
+            plan_id=None,
+            title="Doomed Guide",
+        )
+
+        with patch("app.api.v1.articles.AsyncSessionLocal", TestSessionLocal), \
+                patch.object(ArticleService, "complete_generation", side_effect=RuntimeError("db down")):
+            await _run_generation_job(article.id, uuid4(), "Doomed Guide", ["seo"], 800)
+
+        async with TestSessionLocal() as db:
+            row = await ArticleService(db).get_status(article.id)
+            failed = await ArticleService(db).get_by_id(article.id)
+        assert row.status == "failed"
+        assert failed.generation_metadata["error"] == "db down"
+
 
 class TestHealthEndpoints:
     """Tests for health check endpoints."""
@@ -106,6 +106,7 @@ class TestContentGenerator:
         mock_usage = MagicMock()
         mock_usage.prompt_tokens = 100
         mock_usage.completion_tokens = 500
+        mock_usage.prompt_tokens_details.cached_tokens = 80
 
         mock_message = MagicMock()
         mock_message.content = "# Test Article\n\nThis is generated content."
@@ -138,6 +139,7 @@ class TestContentGenerator:
             assert result.model == "gpt-3.5-turbo"
             assert result.tokens_used["prompt_tokens"] == 100
             assert result.tokens_used["completion_tokens"] == 500
+            assert result.cached_input_tokens == 80
             assert result.word_count == 6  # "Test Article This is generated content"
 
 
@@ -224,6 +226,48 @@ class TestImageStorageMock:
         assert path.endswith(".jpg")
         assert storage.mock_storage[path] == content
 
+    @pytest.mark.asyncio
+    async def test_mock_upload_stream_stores_image(self):
+        """Test that streamed upload joins chunks in mock mode."""
+        storage = ImageStorageService(mock_mode=True)
+        article_id = uuid4()
+
+        async def chunks():
+            yield b"fake "
+            yield b"image "
+            yield b"content"
+
+        path = await storage.upload_stream(
+            article_id=article_id,
+            chunks=chunks(),
+            original_filename="test.png",
+            content_type="image/png",
+        )
+
+        assert path.startswith(f"articles/{article_id}/")
+        assert path.endswith(".png")
+        assert storage.mock_storage[path] == b"fake image content"
+
+    @pytest.mark.asyncio
+    async def test_content_path_and_exists(self):
+        """Test content-addressed paths and existence checks in mock mode."""
+        storage = ImageStorageService(mock_mode=True)
+        path = storage.build_content_path("sha256:abcdef0123", "photo.webp")
+        assert path == "articles/ab/abcdef0123.webp"
+        assert await storage.exists(path) is False
+
+        async def chunks():
+            yield b"content"
+
+        await storage.upload_stream(
+            article_id=uuid4(),
+            chunks=chunks(),
+            original_filename="photo.webp",
+            content_type="image/webp",
+            storage_path=path,
+        )
+        assert await storage.exists(path) is True
+
     @pytest.mark.asyncio
     async def test_mock_delete_removes_image(self):
         """Test that delete removes image in mock mode."""
@@ -149,6 +149,42 @@ class TestImageService:
         )
         assert ai_image.download_url is not None
 
+    @pytest.mark.asyncio
+    async def test_pexels_search_uses_injected_client(self):
+        """Test stock image searches go through the injected HTTP client."""
+        import httpx
+
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"photos": [{
+                "id": 1,
+                "width": 800,
+                "height": 600,
+                "alt": "mountain",
+                "photographer": "Jane",
+                "photographer_url": "https://pexels.com/@jane",
+                "src": {"large": "https://img/large.jpg", "original": "https://img/original.jpg"},
+            }]})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            service = ImageService(mock_mode=False, http_client=client)
+            service.pexels_api_key = "test-key"
+            images = await service._search_pexels("mountain", 1, "landscape")
+
+        assert len(requests) == 1
+        assert requests[0].headers["Authorization"] == "test-key"
+        assert images[0].source == "pexels"
+        assert images[0].download_url == "https://img/original.jpg"
+
+    def test_shared_client_is_default(self):
+        """Test the service falls back to the process-wide HTTP client."""
+        from app.core.http_client import get_http_client
+
+        service = ImageService(mock_mode=True)
+        assert service.http_client is get_http_client()
+
 
 class TestImageResult:
     """Tests for ImageResult dataclass."""
@@ -203,3 +239,40 @@ class TestImageResult:
         )
 
         assert result.cost_usd == Decimal("0.04")
+
+    def test_image_response_serializes_cost_as_string(self):
+        """Test the API response model keeps the Decimal cost and dumps it as a string."""
+        from app.api.v1.images import ImageResponse
+
+        result = ImageResult(
+            url="https://dalle.com/image.jpg",
+            source="dalle",
+            width=1024,
+            height=1024,
+            alt_text="AI generated image",
+            cost_usd=Decimal("0.04"),
+        )
+
+        response = ImageResponse.model_validate(result)
+
+        assert response.cost_usd == Decimal("0.04")
+        assert response.model_dump(mode="json")["cost_usd"] == "0.04"
+
+
+class TestImageEndpoints:
+    """Tests for image API endpoints."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("field,value", [("size", "512x512"), ("quality", "ultra")])
+    async def test_generate_rejects_invalid_options(
+        self, async_client, auth_headers, field, value
+    ):
+        """Test unsupported DALL-E size or quality is rejected with 422."""
+        response = await async_client.post(
+            "/api/v1/images/generate",
+            json={"prompt": "A mountain at sunrise", field: value},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", field]
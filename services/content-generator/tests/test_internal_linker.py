@@ -65,7 +65,129 @@ class TestBasicInternalLinker:
         assert len(matches) == 3
         for match in matches:
             assert "position" in match
-            assert "context" in match
+            assert content[match["context_start"]:match["context_end"]]
+
+    def test_find_keyword_matches_ignores_case(self):
+        """Test matching is case-insensitive and positions index the original content."""
+        linker = BasicInternalLinker(mock_mode=True)
+
+        content = "Keyword Research matters. keyword research is step one."
+        matches = linker._find_keyword_matches(content, "KEYWORD RESEARCH")
+
+        assert [m["position"] for m in matches] == [0, 26]
+        assert content[matches[0]["context_start"]:].startswith("Keyword Research")
+
+    def test_find_all_matches_without_automaton(self):
+        """Test the per-keyword regex path, including case folds lowercasing misses."""
+        linker = BasicInternalLinker(mock_mode=True)
+
+        matches = linker._find_all_matches(
+            "All about SEO audits in İstanbul.", ["seo", "Backlinks", "istanbul"]
+        )
+
+        assert matches["backlinks"] == []
+        assert [m["position"] for m in matches["seo"]] == [10]
+        assert [m["position"] for m in matches["istanbul"]] == [24]
+
+    def test_keyword_patterns_are_cached(self):
+        """Test each keyword is compiled once regardless of case."""
+        linker = BasicInternalLinker(mock_mode=True)
+
+        linker._find_keyword_matches("SEO tips", "SEO")
+        linker._find_keyword_matches("More seo tips", "seo")
+
+        assert list(linker._pattern_cache) == ["seo"]
+
+    def test_find_all_matches_single_pass(self):
+        """Test the Aho-Corasick sweep matches the per-keyword regex scan."""
+        pytest.importorskip("ahocorasick")
+        linker = BasicInternalLinker(mock_mode=True)
+
+        content = "SEO tips: seo-friendly URLs, seosearch and a a a keyword SEO."
+        keywords = ["SEO", "a a", "friendly urls"]
+        automaton = linker._build_automaton(keywords)
+
+        matches = linker._find_all_matches(content, keywords, automaton)
+
+        for keyword in keywords:
+            expected = linker._find_keyword_matches(content, keyword)
+            assert matches.get(keyword.lower(), []) == expected
+
+    def test_find_all_matches_length_changing_lowercase(self):
+        """Test content whose lowercase changes length is scanned by offsets into the original."""
+        linker = BasicInternalLinker(mock_mode=True)
+
+        content = "İstanbul trip: SEO tips for İzmir and more SEO."
+        keywords = ["SEO", "tips"]
+
+        # The automaton is never consulted for such content
+        matches = linker._find_all_matches(content, keywords, automaton=object())
+
+        for keyword in keywords:
+            assert matches[keyword.lower()] == linker._find_keyword_matches(content, keyword)
+        assert [content[m["position"]:m["position"] + 3] for m in matches["seo"]] == ["SEO", "SEO"]
+
+    @pytest.mark.asyncio
+    async def test_find_link_opportunities_process_pool(self):
+        """Test large workspaces are scanned in the process pool, in order."""
+        from app.internal_linker.basic_linker import (
+            PARALLEL_SCAN_MIN_ARTICLES,
+            shutdown_scan_pool,
+        )
+
+        linker = BasicInternalLinker(mock_mode=True)
+        mock_articles = [
+            {
+                "id": uuid4(),
+                "title": f"Article {i}",
+                "content": f"Post {i} covers SEO audits and more SEO.",
+                "target_keywords": [],
+            }
+            for i in range(PARALLEL_SCAN_MIN_ARTICLES + 5)
+        ]
+        linker.set_mock_articles(mock_articles)
+
+        try:
+            opportunities = await linker.find_link_opportunities(
+                new_article_id=uuid4(),
+                new_article_content="New article",
+                target_keywords=["SEO"],
+                workspace_id=uuid4(),
+            )
+        finally:
+            shutdown_scan_pool()
+
+        assert len(opportunities) == 2 * len(mock_articles)
+        assert [opp.from_article_id for opp in opportunities[::2]] == [
+            article["id"] for article in mock_articles
+        ]
+
+    @pytest.mark.asyncio
+    async def test_scan_articles_stops_early(self):
+        """Test a scan stopped after its first chunk leaves later chunks unscanned."""
+        from concurrent.futures import ThreadPoolExecutor
+        from unittest.mock import patch
+
+        from app.internal_linker import basic_linker
+
+        linker = BasicInternalLinker(mock_mode=True)
+        articles = [(i, f"Post {i} covers SEO.") for i in range(100)]
+        pool = ThreadPoolExecutor(max_workers=1)
+
+        with patch.object(basic_linker, "get_scan_pool", return_value=pool), \
+                patch.object(basic_linker.os, "cpu_count", return_value=1), \
+                patch.object(
+                    basic_linker, "_scan_article_chunk", wraps=basic_linker._scan_article_chunk
+                ) as scan_chunk:
+            scan = linker._scan_articles(articles, ["SEO"])
+            first_id, matches = await scan.__anext__()
+            await scan.aclose()
+            pool.shutdown(wait=True)
+
+        assert first_id == 0
+        assert [m["position"] for m in matches["seo"]] == [14]
+        # 4 chunks of 25; the first was scanned and at most the next started
+        assert len(scan_chunk.call_args_list) <= 2
 
     @pytest.mark.asyncio
     async def test_find_reverse_link_opportunities(self):
@@ -119,6 +241,118 @@ class TestBasicInternalLinker:
         assert isinstance(to_opps, list)
         assert isinstance(from_opps, list)
 
+    @pytest.mark.asyncio
+    async def test_get_all_link_opportunities_fetches_articles_once(self):
+        """Test both directions share one published-articles lookup."""
+        from unittest.mock import AsyncMock
+
+        linker = BasicInternalLinker(mock_mode=True)
+        linker.get_published_articles = AsyncMock(return_value=[
+            {
+                "id": uuid4(),
+                "title": "Old Article",
+                "content": "Content about marketing and SEO",
+                "target_keywords": ["marketing"],
+            },
+        ])
+
+        to_opps, from_opps = await linker.get_all_link_opportunities(
+            new_article_id=uuid4(),
+            new_article_content="This is about marketing strategies",
+            target_keywords=["SEO"],
+            workspace_id=uuid4(),
+        )
+
+        assert linker.get_published_articles.await_count == 1
+        assert len(to_opps) == 1
+        assert len(from_opps) == 1
+
+    @pytest.mark.asyncio
+    async def test_get_published_articles_from_db(self, db_session, test_workspace_id):
+        """Test published articles are loaded as plain dicts from the database."""
+        from app.models.article import Article
+        from app.models.published_post import PublishedPost
+
+        published = Article(
+            workspace_id=test_workspace_id,
+            title="Published",
+            content="Published content",
+            status="published",
+            generation_metadata={"target_keywords": ["seo"]},
+        )
+        draft = Article(
+            workspace_id=test_workspace_id,
+            title="Draft",
+            content="Draft content",
+            status="draft",
+        )
+        db_session.add_all([published, draft])
+        await db_session.flush()
+        db_session.add(PublishedPost(article_id=published.id))
+        await db_session.commit()
+
+        linker = BasicInternalLinker(db=db_session)
+        articles = await linker.get_published_articles(test_workspace_id)
+
+        assert articles == [
+            {
+                "id": published.id,
+                "title": "Published",
+                "content": "Published content",
+                "target_keywords": ["seo"],
+            }
+        ]
+
+    @pytest.mark.asyncio
+    async def test_link_opportunities_limit(self):
+        """Test opportunity collection stops at the limit."""
+        linker = BasicInternalLinker(mock_mode=True)
+        linker.set_mock_articles([
+            {
+                "id": uuid4(),
+                "title": f"Article {i}",
+                "content": "SEO here, SEO there.",
+                "target_keywords": ["strategies"],
+            }
+            for i in range(3)
+        ])
+
+        to_opps, from_opps = await linker.get_all_link_opportunities(
+            new_article_id=uuid4(),
+            new_article_content="SEO strategies and more strategies",
+            target_keywords=["SEO"],
+            workspace_id=uuid4(),
+            limit=4,
+        )
+        unlimited = await linker.find_link_opportunities(
+            new_article_id=uuid4(),
+            new_article_content="",
+            target_keywords=["SEO"],
+            workspace_id=uuid4(),
+        )
+
+        assert len(to_opps) == 4
+        assert len(from_opps) == 4
+        assert len(unlimited) == 6
+
+    @pytest.mark.asyncio
+    async def test_iter_link_opportunities(self):
+        """Test opportunities can be consumed lazily."""
+        linker = BasicInternalLinker(mock_mode=True)
+        old_id = uuid4()
+
+        opportunities = [
+            opp
+            async for opp in linker.iter_link_opportunities(
+                new_article_id=uuid4(),
+                target_keywords=["SEO"],
+                old_articles=[{"id": old_id, "content": "SEO and SEO"}],
+            )
+        ]
+
+        assert [opp.position for opp in opportunities] == [0, 8]
+        assert all(opp.from_article_id == old_id for opp in opportunities)
+
 
 class TestSemanticInternalLinker:
     """Tests for Semantic Internal Linker using embeddings."""
@@ -126,13 +360,74 @@ class TestSemanticInternalLinker:
     @pytest.mark.asyncio
     async def test_encode_text(self):
         """Test encoding text to embeddings in mock mode."""
+        import numpy as np
+
         linker = SemanticInternalLinker(mock_mode=True)
         
         embedding = linker.encode("This is test content about SEO")
         
         assert embedding is not None
-        assert len(embedding) == 384  # Standard embedding size
-        assert all(isinstance(v, float) for v in embedding)
+        assert embedding.shape == (384,)  # Standard embedding size
+        assert embedding.dtype == np.float32
+
+    def test_encode_returns_normalized_vectors(self):
+        """Test embeddings are unit length, so dot product equals cosine."""
+        from app.internal_linker.semantic_linker import cosine_similarity, dot_similarity
+
+        linker = SemanticInternalLinker(mock_mode=True)
+        vec1 = linker.encode("SEO optimization content")
+        vec2 = linker.encode("Link building strategies")
+
+        assert dot_similarity(vec1, vec1) == pytest.approx(1.0, abs=1e-5)
+        assert dot_similarity(vec1, vec2) == pytest.approx(cosine_similarity(vec1, vec2), abs=1e-5)
+
+    def test_encode_is_cached(self):
+        """Test repeat encodes of the same text skip the model."""
+        from unittest.mock import MagicMock
+
+        import numpy as np
+
+        from app.internal_linker.semantic_linker import _embedding_cache
+
+        _embedding_cache.clear()
+        model = MagicMock()
+        model.encode.side_effect = lambda texts, **kwargs: np.array(
+            [[0.5, 0.25]] * len(texts), dtype=np.float32
+        )
+        linker = SemanticInternalLinker()
+        linker._model = model
+
+        assert linker.encode("Same content").tolist() == [0.5, 0.25]
+        assert linker.encode("Same content").tolist() == [0.5, 0.25]
+        linker.encode("Other content")
+
+        assert model.encode.call_count == 2
+        _embedding_cache.clear()
+
+    def test_encode_batch_single_model_call(self):
+        """Test several texts are encoded with one model call, skipping cached ones."""
+        from unittest.mock import MagicMock
+
+        import numpy as np
+
+        from app.internal_linker.semantic_linker import _embedding_cache
+
+        _embedding_cache.clear()
+        model = MagicMock()
+        model.encode.side_effect = lambda texts, **kwargs: np.array(
+            [[float(len(text)), 1.0] for text in texts], dtype=np.float32
+        )
+        linker = SemanticInternalLinker()
+        linker._model = model
+
+        linker.encode("ab")
+        embeddings = linker.encode_batch(["a", "ab", "abc"])
+
+        assert embeddings.tolist() == [[1.0, 1.0], [2.0, 1.0], [3.0, 1.0]]
+        assert model.encode.call_count == 2
+        assert model.encode.call_args.args[0] == ["a", "abc"]
+        assert model.encode.call_args.kwargs["batch_size"] == 32
+        _embedding_cache.clear()
 
     @pytest.mark.asyncio
     async def test_find_related_articles(self):
@@ -169,6 +464,101 @@ class TestSemanticInternalLinker:
         
         assert isinstance(related, list)
 
+    @pytest.mark.asyncio
+    async def test_find_related_articles_ranking(self):
+        """Test related articles are thresholded, ranked and capped."""
+        from unittest.mock import patch
+
+        linker = SemanticInternalLinker(mock_mode=True)
+        new_article_id = uuid4()
+        ids = [uuid4() for _ in range(4)]
+        linker.set_mock_articles([
+            {"id": ids[0], "title": "Close", "embedding": [0.9, 0.1, 0.0]},
+            {"id": ids[1], "title": "Unrelated", "embedding": [0.0, 0.0, 1.0]},
+            {"id": ids[2], "title": "Exact", "embedding": [2.0, 0.0, 0.0]},
+            {"id": ids[3], "title": "Near", "embedding": [0.8, 0.3, 0.0]},
+            {"id": new_article_id, "title": "Self", "embedding": [1.0, 0.0, 0.0]},
+            {"id": uuid4(), "title": "No embedding", "embedding": None},
+        ])
+
+        with patch.object(linker, "encode", return_value=[1.0, 0.0, 0.0]):
+            related = await linker.find_related_articles(
+                new_article_id=new_article_id,
+                new_article_content="New article",
+                workspace_id=uuid4(),
+                threshold=0.5,
+                max_results=2,
+            )
+
+        assert [r.article_id for r in related] == [ids[2], ids[0]]
+        assert related[0].similarity == pytest.approx(1.0, abs=1e-6)
+
+    def test_build_embedding_index(self):
+        """Test embeddings are stacked, normalized and mismatched sizes skipped."""
+        import numpy as np
+
+        ids = [uuid4() for _ in range(3)]
+        index = SemanticInternalLinker.build_embedding_index([
+            {"id": ids[0], "embedding": [3.0, 4.0]},
+            {"id": ids[1], "embedding": [1.0, 0.0, 0.0]},
+            {"id": ids[2], "embedding": [0.0, 2.0]},
+        ])
+
+        assert index.matrix.shape == (2, 2)
+        assert np.allclose(np.linalg.norm(index.matrix, axis=1), 1.0)
+        assert list(index.ids) == [str(ids[0]), str(ids[2])]
+        assert [a["id"] for a in index.articles] == [ids[0], ids[2]]
+        assert index.bits is None
+
+    @pytest.mark.asyncio
+    async def test_find_related_articles_binary_prefilter(self):
+        """Test large indexes are pre-filtered by Hamming distance, then ranked exactly."""
+        from unittest.mock import patch
+
+        import numpy as np
+
+        from app.internal_linker import semantic_linker
+
+        rng = np.random.default_rng(7)
+        query = rng.standard_normal(64).astype(np.float32)
+        linker = SemanticInternalLinker(mock_mode=True)
+        articles = [
+            {"id": uuid4(), "title": f"Noise {i}", "embedding": rng.standard_normal(64).tolist()}
+            for i in range(40)
+        ]
+        near = {"id": uuid4(), "title": "Near", "embedding": (query + 0.1 * rng.standard_normal(64)).tolist()}
+        articles.insert(17, near)
+        linker.set_mock_articles(articles)
+
+        with patch.object(semantic_linker, "BINARY_PREFILTER_MIN_ARTICLES", 10), \
+                patch.object(linker, "encode", return_value=query.tolist()):
+            assert linker.build_embedding_index(articles).bits.shape == (41, 8)
+            related = await linker.find_related_articles(
+                new_article_id=uuid4(),
+                new_article_content="New article",
+                workspace_id=uuid4(),
+                threshold=0.5,
+                max_results=1,
+            )
+
+        assert [r.article_id for r in related] == [near["id"]]
+
+    def test_hamming_distances(self):
+        """Test packed sign-bit codes and their Hamming distances."""
+        import numpy as np
+
+        from app.internal_linker import quantize
+        from app.internal_linker.semantic_linker import hamming_distances
+
+        codes = quantize.pack_binary(np.array([
+            [1.0, -1.0, 1.0, -1.0, 1.0, -1.0, 1.0, -1.0, 1.0],
+            [-1.0, 1.0, 1.0, -1.0, 1.0, -1.0, 1.0, -1.0, -1.0],
+        ]))
+        query = quantize.pack_binary([1.0, -1.0, 1.0, -1.0, 1.0, -1.0, 1.0, -1.0, 1.0])
+
+        assert codes.shape == (2, 2)
+        assert list(hamming_distances(codes, query)) == [0, 3]
+
     @pytest.mark.asyncio
     async def test_find_semantic_link_opportunities(self):
         """Test finding semantic link opportunities."""
@@ -229,6 +619,92 @@ class TestSemanticInternalLinker:
         assert "articles_processed" in result
         assert result["articles_processed"] == 2
 
+    @pytest.mark.asyncio
+    async def test_process_workspace_fetches_articles_once(self):
+        """Test every article search reuses one workspace fetch."""
+        from unittest.mock import AsyncMock
+
+        linker = SemanticInternalLinker(mock_mode=True)
+        contents = ["SEO basics", "SEO basics guide", "Cooking pasta"]
+        articles = [
+            {"id": uuid4(), "title": c, "content": c, "embedding": linker.encode(c)}
+            for c in contents
+        ]
+        linker.get_published_articles_with_embeddings = AsyncMock(return_value=articles)
+
+        result = await linker.process_workspace(workspace_id=uuid4(), threshold=0.0)
+
+        assert linker.get_published_articles_with_embeddings.await_count == 1
+        assert result["articles_processed"] == 3
+        assert result["opportunities_found"] == 6
+
+    @pytest.mark.asyncio
+    async def test_process_workspace_encodes_unindexed_once(self):
+        """Test articles without embeddings are encoded in one batch and searched against the index."""
+        from unittest.mock import patch
+
+        linker = SemanticInternalLinker(mock_mode=True)
+        contents = ["SEO basics", "SEO basics guide", "Cooking pasta"]
+        articles = [
+            {"id": uuid4(), "title": c, "content": c, "embedding": linker.encode(c)}
+            for c in contents
+        ]
+        articles.append({"id": uuid4(), "title": "New", "content": "SEO basics", "embedding": None})
+        linker.set_mock_articles(articles)
+
+        with patch.object(linker, "encode_batch", wraps=linker.encode_batch) as encode_batch, \
+                patch.object(linker, "build_embedding_index", wraps=linker.build_embedding_index) as build:
+            result = await linker.process_workspace(workspace_id=uuid4(), threshold=0.0)
+
+        assert encode_batch.call_count == 1
+        assert encode_batch.call_args.args[0] == ["SEO basics"]
+        assert build.call_count == 1
+        assert result["articles_processed"] == 4
+        assert result["opportunities_found"] == 9
+
+    @pytest.mark.asyncio
+    async def test_precomputed_matches_find_related_articles(self):
+        """Test searching a prebuilt index matches encoding and fetching per call."""
+        linker = SemanticInternalLinker(mock_mode=True)
+        contents = ["SEO basics", "SEO basics guide", "Cooking pasta", "Link building"]
+        articles = [
+            {"id": uuid4(), "title": c, "content": c, "embedding": linker.encode(c)}
+            for c in contents
+        ]
+        linker.set_mock_articles(articles)
+        index = linker.build_embedding_index(articles)
+
+        for article in articles:
+            expected = await linker.find_related_articles(
+                article["id"], article["content"], uuid4(), threshold=0.0, max_results=2
+            )
+            related = linker.find_related_articles_precomputed(
+                article["id"], article["embedding"], index, threshold=0.0, max_results=2
+            )
+            assert [r.article_id for r in related] == [r.article_id for r in expected]
+            assert article["id"] not in [r.article_id for r in related]
+
+    def test_top_k_related_articles(self):
+        """Test the partial top-K selection returns the best matches in order."""
+        from app.internal_linker.semantic_linker import cosine_similarity
+
+        linker = SemanticInternalLinker(mock_mode=True)
+        articles = [
+            {"id": uuid4(), "title": f"Article {i}", "embedding": linker.encode(f"Article {i}")}
+            for i in range(20)
+        ]
+        index = linker.build_embedding_index(articles)
+        query = linker.encode("Query article")
+
+        related = linker.find_related_articles_precomputed(
+            uuid4(), query, index, threshold=0.0, max_results=3
+        )
+
+        expected = sorted(
+            articles, key=lambda a: cosine_similarity(a["embedding"], query), reverse=True
+        )[:3]
+        assert [r.article_id for r in related] == [a["id"] for a in expected]
+
     def test_cosine_similarity(self):
         """Test cosine similarity calculation."""
         from app.internal_linker.semantic_linker import cosine_similarity
@@ -250,6 +726,146 @@ class TestSemanticInternalLinker:
         assert cosine_similarity([], [1.0, 0.0]) == 0.0
         assert cosine_similarity([1.0], []) == 0.0
 
+    def test_cosine_similarity_arrays(self):
+        """Test cosine similarity accepts float32 arrays and mixed inputs."""
+        import numpy as np
+
+        from app.internal_linker.semantic_linker import cosine_similarity
+
+        vec1 = np.array([1.0, 2.0, 3.0], dtype=np.float32)
+
+        assert cosine_similarity(vec1, [2.0, 4.0, 6.0]) == pytest.approx(1.0, abs=1e-6)
+        assert cosine_similarity(vec1, [-1.0, -2.0, -3.0]) == pytest.approx(-1.0, abs=1e-6)
+        assert cosine_similarity(vec1, np.zeros(3, dtype=np.float32)) == 0.0
+        assert cosine_similarity(None, vec1) == 0.0
+
+    def test_cosine_similarity_simsimd_matches_numpy(self):
+        """Test the SimSIMD kernel agrees with the NumPy fallback."""
+        pytest.importorskip("simsimd")
+        from unittest.mock import patch
+
+        from app.internal_linker import semantic_linker
+
+        vec1 = [0.3, -1.2, 0.8, 2.0]
+        vec2 = [1.1, 0.4, -0.5, 1.7]
+
+        with_simsimd = semantic_linker.cosine_similarity(vec1, vec2)
+        with patch.object(semantic_linker, "simsimd", None):
+            with_numpy = semantic_linker.cosine_similarity(vec1, vec2)
+
+        assert with_simsimd == pytest.approx(with_numpy, abs=1e-4)
+
+    def test_quantize_int8_round_trip(self):
+        """Test int8 quantization survives metadata storage and keeps cosine."""
+        import numpy as np
+
+        from app.internal_linker import quantize
+        from app.internal_linker.semantic_linker import cosine_similarity
+
+        vector = np.array([0.12, -0.5, 0.33, 0.9, -0.07], dtype=np.float32)
+        values, scale = quantize.quantize_int8(vector)
+
+        assert values.dtype == np.int8
+        assert int(np.max(np.abs(values))) == 127
+
+        stored = quantize.to_metadata(vector)
+        restored, restored_scale = quantize.from_metadata(stored)
+        assert np.array_equal(restored, values)
+        assert restored_scale == pytest.approx(scale)
+        assert np.allclose(quantize.dequantize_int8(restored, restored_scale), vector, atol=0.01)
+        assert cosine_similarity(restored, vector) == pytest.approx(1.0, abs=1e-3)
+
+    def test_float32_base64_round_trip(self):
+        """Test float32 embeddings survive base64 storage and index as arrays."""
+        import numpy as np
+
+        from app.internal_linker import quantize
+
+        vector = np.array([0.6, -0.8, 0.0], dtype=np.float32)
+        stored = quantize.to_base64(vector)
+        restored = quantize.from_base64(stored)
+
+        assert isinstance(stored, str)
+        assert restored.dtype == np.float32
+        assert np.array_equal(restored, vector)
+
+        index = SemanticInternalLinker.build_embedding_index([{"id": uuid4(), "embedding": restored}])
+        assert np.allclose(index.matrix[0], vector)
+
+    @pytest.mark.parametrize(
+        "precision,key",
+        [("fp32", "embedding_f32"), ("fp16", "embedding_f16"), ("bf16", "embedding_bf16")],
+    )
+    def test_float_storage_precision(self, precision, key):
+        """Test half precision storage is upcast to float32 on read."""
+        import numpy as np
+
+        from app.internal_linker import quantize
+
+        if precision == "bf16" and quantize.ml_dtypes is None:
+            pytest.skip("ml_dtypes not installed")
+
+        vector = np.array([0.6, -0.8, 0.0], dtype=np.float32)
+        stored = quantize.to_storage(vector, precision)
+        restored = quantize.from_storage(stored)
+
+        assert set(stored) == {key}
+        assert restored.dtype == np.float32
+        assert np.allclose(restored, vector, atol=1e-2)
+
+    def test_encode_for_storage(self):
+        """Test quantized embeddings for article metadata."""
+        from app.internal_linker import quantize
+        from app.internal_linker.semantic_linker import cosine_similarity
+
+        linker = SemanticInternalLinker(mock_mode=True, precision="int8")
+        stored = linker.encode_for_storage("Test content for embedding")
+
+        assert set(stored) == {"embedding_i8"}
+        values = quantize.from_storage(stored)
+        assert len(values) == 384
+        assert cosine_similarity(
+            values, linker.encode("Test content for embedding")
+        ) == pytest.approx(1.0, abs=1e-3)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("use_simsimd", [True, False])
+    async def test_find_related_articles_int8_ranking(self, use_simsimd):
+        """Test related articles are ranked from int8 quantized embeddings."""
+        from unittest.mock import patch
+
+        import numpy as np
+
+        from app.internal_linker import quantize, semantic_linker
+
+        if use_simsimd and semantic_linker.simsimd is None:
+            pytest.skip("simsimd not installed")
+
+        linker = SemanticInternalLinker(mock_mode=True)
+        new_article_id = uuid4()
+        ids = [uuid4() for _ in range(3)]
+        linker.set_mock_articles([
+            {"id": ids[0], "title": "Close", "embedding_i8": quantize.quantize_int8([0.9, 0.1, 0.0])[0]},
+            {"id": ids[1], "title": "Unrelated", "embedding_i8": quantize.quantize_int8([0.0, 0.0, 1.0])[0]},
+            {"id": ids[2], "title": "Exact", "embedding_i8": quantize.quantize_int8([2.0, 0.0, 0.0])[0]},
+            {"id": new_article_id, "title": "Self", "embedding_i8": quantize.quantize_int8([1.0, 0.0, 0.0])[0]},
+        ])
+
+        simsimd = semantic_linker.simsimd if use_simsimd else None
+        with patch.object(semantic_linker, "simsimd", simsimd), \
+                patch.object(linker, "encode", return_value=[1.0, 0.0, 0.0]):
+            matrix = linker.build_embedding_index(linker._mock_articles).matrix
+            related = await linker.find_related_articles(
+                new_article_id=new_article_id,
+                new_article_content="New article",
+                workspace_id=uuid4(),
+                threshold=0.5,
+            )
+
+        assert matrix.dtype == (np.int8 if use_simsimd else np.float32)
+        assert [r.article_id for r in related] == [ids[2], ids[0]]
+        assert related[0].similarity == pytest.approx(1.0, abs=1e-2)
+
 
 class TestAnchorTextRewriter:
     """Tests for AI Anchor Text Rewriter."""
@@ -302,6 +918,62 @@ class TestAnchorTextRewriter:
             assert "rewritten" in result
             assert "<a href=" in result["rewritten"]
 
+    @pytest.mark.asyncio
+    async def test_rewrite_multiple_sentences_single_llm_call(self):
+        """Test sentences are rewritten with one batched LLM call."""
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock
+
+        from app.internal_linker.anchor_rewriter import BATCH_REWRITE_SYSTEM_PROMPT
+
+        gateway = AsyncMock()
+        gateway.generate.return_value = SimpleNamespace(content=(
+            '```json\n["<a href=\\"url\\">SEO</a> helps with visibility", '
+            '"Try <a href=\\"https://example.com/content\\">content marketing</a>"]\n```'
+        ))
+        rewriter = AnchorTextRewriter(llm_gateway=gateway)
+
+        results = await rewriter.rewrite_multiple_sentences([
+            {
+                "sentence": "SEO helps with visibility",
+                "keyword": "SEO",
+                "target_url": "https://example.com/seo",
+            },
+            {
+                "sentence": "Content marketing is effective",
+                "keyword": "content marketing",
+                "target_url": "https://example.com/content",
+            },
+        ])
+
+        assert gateway.generate.await_count == 1
+        call = gateway.generate.await_args.kwargs
+        assert call["system_prompt"] == BATCH_REWRITE_SYSTEM_PROMPT
+        assert "SEO helps with visibility" in call["prompt"]
+        assert results[0]["rewritten"] == (
+            '<a href="https://example.com/seo">SEO</a> helps with visibility'
+        )
+        assert results[1]["keyword"] == "content marketing"
+
+    @pytest.mark.asyncio
+    async def test_rewrite_multiple_sentences_batch_fallback(self):
+        """Test an unusable batch response falls back to per-sentence calls."""
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock
+
+        gateway = AsyncMock()
+        gateway.generate.return_value = SimpleNamespace(content="not json")
+        rewriter = AnchorTextRewriter(llm_gateway=gateway)
+
+        results = await rewriter.rewrite_multiple_sentences([
+            {"sentence": "SEO helps", "keyword": "SEO", "target_url": "https://a"},
+            {"sentence": "Links matter", "keyword": "Links", "target_url": "https://b"},
+        ])
+
+        # One failed batch call, then one call per sentence
+        assert gateway.generate.await_count == 3
+        assert [r["rewritten"] for r in results] == ["not json", "not json"]
+
     @pytest.mark.asyncio
     async def test_suggest_anchor_text_mock_mode(self):
         """Test suggesting anchor text in mock mode."""
@@ -316,6 +988,81 @@ class TestAnchorTextRewriter:
         assert len(suggestions) >= 1
         assert "Complete SEO Guide" in suggestions or "SEO guide" in suggestions
 
+    @pytest.mark.asyncio
+    async def test_suggest_anchor_text_is_cached(self):
+        """Test repeat suggestions for the same article skip the LLM."""
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock
+
+        from app.internal_linker.anchor_rewriter import SUGGEST_SYSTEM_PROMPT, _llm_cache
+
+        _llm_cache.clear()
+        gateway = AsyncMock()
+        gateway.generate.return_value = SimpleNamespace(content="- SEO guide\n- SEO tips")
+        rewriter = AnchorTextRewriter(llm_gateway=gateway)
+
+        kwargs = dict(
+            article_title="Complete SEO Guide",
+            article_content="This is a comprehensive guide to SEO...",
+            target_keywords=["SEO guide"],
+        )
+        first = await rewriter.suggest_anchor_text(**kwargs)
+        second = await rewriter.suggest_anchor_text(**kwargs)
+        await rewriter.suggest_anchor_text(**{**kwargs, "article_title": "Other"})
+
+        assert first == second == ["SEO guide", "SEO tips"]
+        assert gateway.generate.await_count == 2
+        assert gateway.generate.await_args.kwargs["system_prompt"] == SUGGEST_SYSTEM_PROMPT
+        _llm_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_empty_suggestions_are_not_cached(self):
+        """Test a reply without suggestions is asked again, not cached."""
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock
+
+        from app.internal_linker.anchor_rewriter import _llm_cache
+
+        _llm_cache.clear()
+        gateway = AsyncMock()
+        gateway.generate.return_value = SimpleNamespace(content="\n  \n")
+        rewriter = AnchorTextRewriter(llm_gateway=gateway)
+
+        kwargs = dict(article_title="Complete SEO Guide", article_content="SEO...", target_keywords=[])
+        assert await rewriter.suggest_anchor_text(**kwargs) == []
+
+        gateway.generate.return_value = SimpleNamespace(content="- SEO guide")
+        assert await rewriter.suggest_anchor_text(**kwargs) == ["SEO guide"]
+        assert await rewriter.suggest_anchor_text(**kwargs) == ["SEO guide"]
+        assert gateway.generate.await_count == 2
+        _llm_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_rewrite_without_link_is_not_cached(self):
+        """Test only rewrites that contain the link are cached."""
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock
+
+        from app.internal_linker.anchor_rewriter import _llm_cache
+
+        _llm_cache.clear()
+        gateway = AsyncMock()
+        gateway.generate.return_value = SimpleNamespace(content="no link here")
+        rewriter = AnchorTextRewriter(llm_gateway=gateway)
+
+        args = ("SEO helps", "SEO", "https://a")
+        await rewriter.rewrite_sentence_with_link(*args)
+        await rewriter.rewrite_sentence_with_link(*args)
+        assert gateway.generate.await_count == 2
+
+        gateway.generate.return_value = SimpleNamespace(
+            content='<a href="https://a">SEO</a> helps'
+        )
+        await rewriter.rewrite_sentence_with_link(*args)
+        assert await rewriter.rewrite_sentence_with_link(*args) == '<a href="https://a">SEO</a> helps'
+        assert gateway.generate.await_count == 3
+        _llm_cache.clear()
+
     def test_simple_link_insertion(self):
         """Test simple fallback link insertion."""
         rewriter = AnchorTextRewriter(mock_mode=True)
@@ -341,6 +1088,27 @@ class TestAnchorTextRewriter:
         # Should replace only first occurrence
         assert result.count('<a href=') == 1
 
+    def test_fix_link_url(self):
+        """Test the first link is pointed at the target URL when the model got it wrong."""
+        fix = AnchorTextRewriter._fix_link_url
+        url = "https://example.com/seo"
+
+        assert fix('Read <a href="url">SEO</a> tips', url) == f'Read <a href="{url}">SEO</a> tips'
+        assert fix(f'Read <a href="{url}">SEO</a>', url) == f'Read <a href="{url}">SEO</a>'
+        assert fix("No link here", url) == "No link here"
+
+    def test_fix_link_url_matches_any_link_tag(self):
+        """Test links with other attributes first, single quotes or uppercase tags are fixed."""
+        fix = AnchorTextRewriter._fix_link_url
+        url = "https://example.com/seo"
+
+        assert fix('<a class="x" href="url">SEO</a>', url) == f'<a class="x" href="{url}">SEO</a>'
+        assert fix("<a href='url'>SEO</a>", url) == f"<a href='{url}'>SEO</a>"
+        assert fix('<A HREF="url" rel="nofollow">SEO</A>', url) == (
+            f'<A HREF="{url}" rel="nofollow">SEO</A>'
+        )
+        assert fix('<abbr title="x">SEO</abbr>', url) == '<abbr title="x">SEO</abbr>'
+
     def test_clear_mock_responses(self):
         """Test clearing mock responses."""
         rewriter = AnchorTextRewriter(mock_mode=True)
@@ -361,13 +1129,29 @@ class TestInternalLinkModels:
             to_article_id=uuid4(),
             keyword="SEO",
             position=100,
-            context="...about SEO optimization...",
             similarity_score=0.85,
         )
         
         assert opp.keyword == "SEO"
         assert opp.position == 100
         assert opp.similarity_score == 0.85
+        assert opp.context is None
+
+    def test_internal_link_opportunity_lazy_context(self):
+        """Test context is sliced from the source content on demand."""
+        content = "Intro text. All about SEO optimization here."
+        opp = InternalLinkOpportunity(
+            from_article_id=uuid4(),
+            to_article_id=uuid4(),
+            keyword="SEO",
+            position=22,
+            context_start=12,
+            context_end=38,
+            source_content=content,
+        )
+
+        assert opp.context == "All about SEO optimization"
+        assert "source_content" not in repr(opp)
 
     def test_related_article(self):
         """Test RelatedArticle dataclass."""
@@ -16,13 +16,13 @@ class TestLLMGateway:
     """Tests for LLMGateway class."""
 
     def test_gateway_initialization(self):
-        """Test LLM Gateway initializes with all providers."""
+        """Test LLM Gateway creates providers lazily and reuses them."""
         gateway = LLMGateway()
 
-        assert "openai" in gateway.providers
-        assert "anthropic" in gateway.providers
-        assert "google" in gateway.providers
-        assert "xai" in gateway.providers
+        assert gateway._providers == {}
+        openai = gateway.get_provider("openai")
+        assert list(gateway._providers) == ["openai"]
+        assert gateway.get_provider("openai") is openai
 
     def test_get_all_providers(self):
         """Test getting all provider names."""
@@ -128,6 +128,40 @@ class TestCostRouter:
         # Should find a cheaper model
         assert selection.estimated_cost_per_1k_tokens <= 0.01
 
+    def test_cached_selection_matches_uncached_across_budget_edges(self):
+        """Test cached selections route exactly as uncached ones, near any rounding edge."""
+        from app.llm_gateway.cost_router import Priority, _select
+
+        router = CostRouter()
+        for priority in Priority:
+            for word_count in (1, 100, 499, 500, 501, 999, 1000, 1001):
+                for budget in (0.0009, 0.001, 0.0015, 0.00225, 0.003, 0.0031, 0.0149):
+                    uncached = _select.__wrapped__(priority, word_count, budget, -1)
+                    for _ in range(2):
+                        assert router.get_model_selection(
+                            priority.value, word_count, budget
+                        ) == uncached
+
+        # Fits the default route's estimate (150 tokens at $0.015/1K)
+        assert router.select_model("medium", 100, 0.003) == (
+            "anthropic",
+            "claude-3-5-sonnet-20241022",
+        )
+
+    def test_selection_cache_tracks_provider_availability(self):
+        """Test cached selections are keyed on which providers are available."""
+        from unittest.mock import MagicMock
+
+        gateway = MagicMock()
+        gateway.get_available_providers.return_value = ["anthropic"]
+        assert CostRouter(gateway).select_model(priority="high") == (
+            "anthropic",
+            "claude-3-opus-20240229",
+        )
+
+        gateway.get_available_providers.return_value = ["openai", "anthropic"]
+        assert CostRouter(gateway).select_model(priority="high") == ("openai", "gpt-4o")
+
     def test_get_model_selection_details(self):
         """Test getting detailed model selection."""
         router = CostRouter()
@@ -190,6 +224,66 @@ class TestOpenAIProvider:
 
         assert cost > Decimal("0")
 
+    def test_calculate_cost_cached_tokens(self):
+        """Test prompt tokens served from the cache are billed at the cached rate."""
+        provider = OpenAIProvider(api_key="test")
+
+        full = provider.calculate_cost(2000, 0, "gpt-4o")
+        cached = provider.calculate_cost(2000, 0, "gpt-4o", cached_tokens=1000)
+
+        assert full == Decimal("0.005")
+        assert cached == Decimal("0.00375")
+
+    def test_calculate_cost_micro(self):
+        """Test costs are integer microcents (10^-8 USD) that convert exactly to USD."""
+        provider = OpenAIProvider(api_key="test")
+
+        micro = provider.calculate_cost_micro(1000, 1000, "gpt-4o")
+
+        assert micro == 1_250_000
+        assert isinstance(micro, int)
+        assert provider.calculate_cost(1000, 1000, "gpt-4o") == Decimal("0.0125")
+        assert provider.calculate_cost_micro(1, 0, "gpt-4o-mini", cached_tokens=1) == 7
+
+    def test_build_messages_reuses_system_message(self):
+        """Test the system message and its prompt cache key are built once per prompt."""
+        provider = OpenAIProvider(api_key="test")
+
+        first, extra = provider._build_messages("First", "You are an SEO writer.\n")
+        second, _ = provider._build_messages("Second", "You are an SEO writer.\n")
+
+        assert first[0] is second[0]
+        assert first[0] == {"role": "system", "content": "You are an SEO writer."}
+        assert second[1] == {"role": "user", "content": "Second"}
+        assert len(extra["prompt_cache_key"]) == 64
+        _, xai_extra = XAIProvider(api_key="test")._build_messages("First", "You are an SEO writer.")
+        assert xai_extra == {}
+        assert provider._build_messages("Only user", None) == (
+            ({"role": "user", "content": "Only user"},),
+            {},
+        )
+
+    def test_client_shared_between_instances(self):
+        """Test providers with the same API key reuse one SDK client."""
+        first = OpenAIProvider(api_key="test")
+        second = OpenAIProvider(api_key="test")
+
+        assert first.client is second.client
+        assert OpenAIProvider(api_key="other").client is not first.client
+        assert XAIProvider(api_key="test").client is not first.client
+
+    @pytest.mark.asyncio
+    async def test_generate_many(self):
+        """Test several prompts are generated concurrently, results in order."""
+        provider = OpenAIProvider(api_key="")
+
+        responses = await provider.generate_many(["First prompt", "Second prompt"], concurrency=2)
+
+        assert [r.content for r in responses] == [
+            "Mock OpenAI response for: First prompt...",
+            "Mock OpenAI response for: Second prompt...",
+        ]
+
     @pytest.mark.asyncio
     async def test_generate_mock_without_api_key(self):
         """Test mock generation without API key."""
@@ -202,6 +296,86 @@ class TestOpenAIProvider:
         assert "-mock" in response.model
         assert response.provider == "openai"
 
+    @pytest.mark.asyncio
+    async def test_stream(self):
+        """Test streamed deltas are yielded and the usage chunk sets the cost."""
+        provider = OpenAIProvider(api_key="")
+
+        def chunk(content=None, finish_reason=None, usage=None):
+            choices = [] if usage else [
+                MagicMock(delta=MagicMock(content=content), finish_reason=finish_reason)
+            ]
+            return MagicMock(choices=choices, usage=usage)
+
+        async def chunks():
+            yield chunk("Hello")
+            yield chunk(", world")
+            yield chunk(finish_reason="stop")
+            yield chunk(usage=MagicMock(
+                prompt_tokens=1000, completion_tokens=1000, prompt_tokens_details=None
+            ))
+
+        provider.client = MagicMock()
+        provider.client.chat.completions.create = AsyncMock(return_value=chunks())
+
+        stream = provider.stream(prompt="Say hello", model="gpt-4o")
+        parts = [part async for part in stream]
+
+        assert parts == ["Hello", ", world"]
+        assert stream.time_to_first_token is not None
+        assert stream.response.content == "Hello, world"
+        assert stream.response.total_tokens == 2000
+        assert stream.response.cost_microcents == 1_250_000
+        assert stream.response.cost_usd == Decimal("0.0125")
+        assert stream.response.metadata["finish_reason"] == "stop"
+        kwargs = provider.client.chat.completions.create.call_args.kwargs
+        assert kwargs["stream"] is True
+        assert kwargs["stream_options"] == {"include_usage": True}
+
+    @pytest.mark.asyncio
+    async def test_stream_mock_without_api_key(self):
+        """Test providers without streaming yield the whole response at once."""
+        provider = AnthropicProvider(api_key="")
+
+        stream = provider.stream(prompt="Test prompt")
+        parts = [part async for part in stream]
+
+        assert parts == [stream.response.content]
+        assert stream.response.metadata["mock"] is True
+
+    @pytest.mark.asyncio
+    async def test_stream_holds_limiter_slot(self):
+        """Test a stream holds a limiter slot until it ends and backs off on 429s."""
+        from unittest.mock import patch
+
+        from app.llm_gateway.limits import get_limiter
+
+        class RateLimited(Exception):
+            status_code = 429
+
+        provider = OpenAIProvider(api_key="")
+        provider.client = MagicMock()
+
+        async def chunks():
+            yield MagicMock(
+                choices=[MagicMock(delta=MagicMock(content="Hi"), finish_reason="stop")],
+                usage=None,
+            )
+
+        with patch("app.llm_gateway.limits._limiters", {}):
+            limiter = get_limiter("openai")
+            provider.client.chat.completions.create = AsyncMock(return_value=chunks())
+            in_flight = [limiter.in_flight async for _ in provider.stream(prompt="Hi")]
+            assert in_flight == [1]
+            assert limiter.in_flight == 0
+
+            limit = limiter.limit
+            provider.client.chat.completions.create = AsyncMock(side_effect=RateLimited())
+            with pytest.raises(RateLimited):
+                [part async for part in provider.stream(prompt="Hi")]
+            assert limiter.limit == limit // 2
+            assert limiter.in_flight == 0
+
 
 class TestAnthropicProvider:
     """Tests for Anthropic provider."""
@@ -224,7 +398,16 @@ class TestAnthropicProvider:
             model="claude-3-5-sonnet-20241022",
         )
 
-        assert cost > Decimal("0")
+        assert cost == Decimal("0.018")
+        assert provider.calculate_cost(1, 0, "claude-3-haiku-20240307") == Decimal("0.00000025")
+
+    def test_calculate_cost_prompt_cache(self):
+        """Test prompt-cache reads and writes are billed at 10% and 125% of input."""
+        provider = AnthropicProvider(api_key="")
+        model = "claude-3-5-sonnet-20241022"
+
+        assert provider.calculate_cost(1000, 0, model, cache_read_tokens=1000) == Decimal("0.0003")
+        assert provider.calculate_cost(1000, 0, model, cache_write_tokens=1000) == Decimal("0.00375")
 
     @pytest.mark.asyncio
     async def test_generate_mock_without_api_key(self):
@@ -262,6 +445,141 @@ class TestGoogleProvider:
         assert "-mock" in response.model
         assert response.provider == "google"
 
+    @pytest.mark.asyncio
+    async def test_generate_reuses_model_and_config(self):
+        """Test the model handle and generation config are built once."""
+        from unittest.mock import AsyncMock, MagicMock
+
+        provider = GoogleProvider(api_key="")
+        provider.client = True
+        provider.genai = MagicMock()
+        gen_model = provider.genai.GenerativeModel.return_value
+        gen_model.generate_content_async = AsyncMock(
+            return_value=MagicMock(
+                text="Gemini output",
+                usage_metadata=MagicMock(prompt_token_count=10, candidates_token_count=5),
+            )
+        )
+
+        for i in range(2):
+            response = await provider.generate(prompt=f"Test prompt {i}", temperature=0.5)
+
+        assert response.content == "Gemini output"
+        assert response.total_tokens == 15
+        assert provider.genai.GenerativeModel.call_count == 1
+        assert provider.genai.GenerationConfig.call_count == 1
+        assert gen_model.generate_content_async.await_count == 2
+
+
+class TestResponseCache:
+    """Tests for the in-process LLM response cache."""
+
+    @staticmethod
+    def _provider():
+        provider = OpenAIProvider(api_key="")
+        provider.client = MagicMock()
+        provider.client.chat.completions.create = AsyncMock(
+            return_value=MagicMock(
+                choices=[MagicMock(message=MagicMock(content="Cached title"))],
+                usage=MagicMock(
+                    prompt_tokens=100, completion_tokens=10, prompt_tokens_details=None
+                ),
+            )
+        )
+        return provider
+
+    @pytest.mark.asyncio
+    async def test_low_temperature_calls_are_cached(self):
+        """Test a repeated deterministic call is served from the cache for free."""
+        from app.llm_gateway.response_cache import response_cache
+
+        response_cache.clear()
+        provider = self._provider()
+
+        first = await provider.generate(prompt="Rewrite title", temperature=0.0)
+        second = await provider.generate(prompt="Rewrite title ", temperature=0.0)
+
+        assert provider.client.chat.completions.create.await_count == 1
+        assert second.content == first.content == "Cached title"
+        assert second.cost_usd == Decimal(0)
+        assert second.metadata["cache_hit"] is True
+        assert "cache_hit" not in first.metadata
+
+    @pytest.mark.asyncio
+    async def test_high_temperature_calls_are_not_cached(self):
+        """Test calls at the default temperature always reach the provider."""
+        from app.llm_gateway.response_cache import response_cache
+
+        response_cache.clear()
+        provider = self._provider()
+
+        for _ in range(2):
+            await provider.generate(prompt="Write an intro", temperature=0.7)
+
+        assert provider.client.chat.completions.create.await_count == 2
+        assert len(response_cache) == 0
+
+    def test_lru_eviction_and_ttl(self):
+        """Test the least recently used entry is evicted and expired entries dropped."""
+        from app.llm_gateway.response_cache import ResponseCache
+
+        cache = ResponseCache(maxsize=2, ttl=60)
+        responses = [MagicMock(name=f"response-{i}") for i in range(3)]
+        cache.set(b"a", responses[0])
+        cache.set(b"b", responses[1])
+        assert cache.get(b"a") is responses[0]
+        cache.set(b"c", responses[2])
+
+        assert cache.get(b"b") is None
+        assert cache.get(b"a") is responses[0]
+
+        expired = ResponseCache(ttl=0)
+        expired.set(b"a", responses[0])
+        assert expired.get(b"a") is None
+
+
+class TestProviderMetrics:
+    """Tests for per-provider Prometheus metrics."""
+
+    @pytest.mark.asyncio
+    async def test_generate_records_metrics(self):
+        """Test every provider's generate records latency, tokens and cost."""
+        from prometheus_client import REGISTRY
+
+        def sample(name, **labels):
+            return REGISTRY.get_sample_value(name, labels) or 0
+
+        labels = {"provider": "anthropic", "model": "claude-3-5-sonnet-20241022-mock"}
+        before_count = sample("llm_request_duration_seconds_count", **labels)
+        before_input = sample("llm_tokens_total", kind="input", **labels)
+        before_ok = sample("llm_requests_total", provider="anthropic", outcome="success")
+
+        response = await AnthropicProvider(api_key="").generate(prompt="Test prompt")
+
+        assert sample("llm_request_duration_seconds_count", **labels) == before_count + 1
+        assert sample("llm_tokens_total", kind="input", **labels) == (
+            before_input + response.input_tokens
+        )
+        assert sample("llm_requests_total", provider="anthropic", outcome="success") == (
+            before_ok + 1
+        )
+
+    @pytest.mark.asyncio
+    async def test_errors_are_counted(self):
+        """Test failed calls count as errors."""
+        from prometheus_client import REGISTRY
+
+        provider = OpenAIProvider(api_key="")
+        provider.client = MagicMock()
+        provider.client.chat.completions.create = AsyncMock(side_effect=RuntimeError("boom"))
+        labels = {"provider": "openai", "outcome": "error"}
+        before = REGISTRY.get_sample_value("llm_requests_total", labels) or 0
+
+        with pytest.raises(RuntimeError):
+            await provider.generate(prompt="Test prompt")
+
+        assert REGISTRY.get_sample_value("llm_requests_total", labels) == before + 1
+
 
 class TestXAIProvider:
     """Tests for XAI/Grok provider."""
@@ -285,3 +603,118 @@ class TestXAIProvider:
 
         assert "-mock" in response.model
         assert response.provider == "xai"
+
+
+class TestTokenizers:
+    """Tests for token counting."""
+
+    def test_count_tokens(self):
+        """Test token counts for known and unknown models."""
+        from app.llm_gateway.tokenizers import count_tokens
+
+        assert count_tokens("") == 0
+        assert count_tokens("Write an SEO article about coffee", "gpt-4o") > 0
+        assert count_tokens("Write an SEO article", "gemini-1.5-flash") > 0
+
+    def test_count_tokens_without_tiktoken(self):
+        """Test the word-based estimate when no encoder is available."""
+        from unittest.mock import patch
+
+        from app.llm_gateway import tokenizers
+
+        with patch.object(tokenizers, "get_encoder", return_value=None):
+            assert tokenizers.count_tokens("three word prompt") == 6
+
+    def test_count_tokens_batch_matches_single_counts(self):
+        """Test batch counts equal per-text counts, with and without tiktoken."""
+        from unittest.mock import patch
+
+        from app.llm_gateway import tokenizers
+
+        texts = ["Write an SEO article about coffee", "", "three word prompt"]
+
+        assert tokenizers.count_tokens_batch(texts) == [
+            tokenizers.count_tokens(text) for text in texts
+        ]
+        with patch.object(tokenizers, "get_encoder", return_value=None):
+            assert tokenizers.count_tokens_batch(texts) == [12, 0, 6]
+
+
+class TestAdaptiveLimiter:
+    """Tests for per-provider concurrency limits."""
+
+    @pytest.mark.asyncio
+    async def test_caps_concurrent_calls(self):
+        """Test no more than the limit of calls run at once."""
+        import asyncio
+
+        from app.llm_gateway.limits import AdaptiveLimiter
+
+        limiter = AdaptiveLimiter(max_limit=2)
+        peak = 0
+
+        async def call():
+            nonlocal peak
+            async with limiter.slot():
+                peak = max(peak, limiter.in_flight)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(call() for _ in range(6)))
+
+        assert peak == 2
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_halves_limit(self):
+        """Test a 429 error halves the limit and successes grow it back."""
+        from app.llm_gateway.limits import AdaptiveLimiter
+
+        class RateLimitError(Exception):
+            status_code = 429
+
+        limiter = AdaptiveLimiter(max_limit=8)
+        with pytest.raises(RateLimitError):
+            async with limiter.slot():
+                raise RateLimitError()
+        assert limiter.limit == 4
+
+        for _ in range(20):
+            async with limiter.slot():
+                pass
+        assert limiter.limit > 4
+        assert limiter.limit <= 8
+
+    def test_get_limiter_is_shared_per_provider(self):
+        """Test each provider gets one shared limiter with its configured cap."""
+        from app.llm_gateway.limits import PROVIDER_CONCURRENCY, get_limiter
+
+        assert get_limiter("openai") is get_limiter("openai")
+        assert get_limiter("anthropic").max_limit == PROVIDER_CONCURRENCY["anthropic"]
+
+
+class TestLLMEndpoints:
+    """Tests for cached LLM Gateway endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_list_providers_is_cacheable(self, async_client, auth_headers):
+        """Test the providers listing is served with a Cache-Control header."""
+        response = await async_client.get("/api/v1/llm/providers", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.headers["Cache-Control"] == "private, max-age=300"
+        names = [provider["name"] for provider in response.json()]
+        assert {"openai", "anthropic", "google", "xai"} <= set(names)
+
+    @pytest.mark.asyncio
+    async def test_select_model_reuses_cached_result(self, async_client, auth_headers):
+        """Test identical model selection inputs are served from the cache."""
+        from app.api.v1.llm import _select_model
+
+        payload = {"priority": "high", "word_count": 1000, "max_budget_usd": 1.0}
+        first = await async_client.post("/api/v1/llm/select-model", json=payload, headers=auth_headers)
+        hits = _select_model.cache_info().hits
+        second = await async_client.post("/api/v1/llm/select-model", json=payload, headers=auth_headers)
+
+        assert first.status_code == 200
+        assert second.json() == first.json()
+        assert _select_model.cache_info().hits == hits + 1
@@ -2,6 +2,7 @@
 
 from decimal import Decimal
 
+import numpy as np
 import pytest
 
 from app.rag import RAGEngine
@@ -146,3 +147,407 @@ class TestRAGEngine:
         )
 
         assert len(enriched.context_snippets) <= 2
+
+    def test_global_engine_is_created_lazily(self):
+        """Test the global engine is created on first access, reused until closed."""
+        from app.rag import engine as engine_module
+
+        engine = engine_module.rag_engine
+
+        assert isinstance(engine, RAGEngine)
+        assert engine_module.rag_engine is engine
+        with pytest.raises(AttributeError):
+            engine_module.missing_attribute
+
+        engine_module.close_rag_engine()
+        assert engine_module._rag_engine is None
+        assert engine_module.rag_engine is not engine
+
+    def test_enriched_prompt_prefix_is_stable(self):
+        """Test snippets are listed by doc_id first, so equal snippets give equal prefixes."""
+        from app.rag.engine import RetrievedContext, snippet_id
+
+        engine = RAGEngine(mock_mode=True)
+        contexts = [
+            RetrievedContext(content=text, source=text, relevance_score=score, metadata={})
+            for text, score in (("Alpha", 0.9), ("Beta", 0.8), ("Gamma", 0.7))
+        ]
+
+        first = engine._build_enriched_prompt("query one", contexts)
+        second = engine._build_enriched_prompt("another query", contexts[::-1])
+        prefix = first[: first.index("---")]
+
+        assert contexts[0].doc_id == snippet_id("Alpha")
+        assert second.startswith(prefix)
+        assert first.endswith(
+            "Use the context above to provide more accurate and comprehensive content."
+        )
+
+
+class TestVectorRetrieval:
+    """Tests for embedding-based retrieval."""
+
+    @staticmethod
+    def _engine(embeddings):
+        """Engine outside mock mode whose embeddings API returns fixed vectors."""
+        from unittest.mock import AsyncMock, MagicMock
+
+        engine = RAGEngine(mock_mode=True)
+        engine._mock_mode = False
+        engine._openai_client = MagicMock()
+
+        async def create(model, input):
+            return MagicMock(data=[MagicMock(embedding=embeddings[text]) for text in input])
+
+        engine._openai_client.embeddings.create = AsyncMock(side_effect=create)
+        return engine
+
+    @pytest.mark.asyncio
+    async def test_retrieves_most_similar_documents(self):
+        """Test documents are ranked by cosine similarity to the query."""
+        engine = self._engine({
+            "SEO basics": [1.0, 0.0, 0.0],
+            "Baking bread": [0.0, 1.0, 0.0],
+            "Link building": [0.8, 0.0, 0.6],
+            "seo": [1.0, 0.1, 0.0],
+        })
+
+        count = await engine.index_batch([
+            {"content": "SEO basics", "source": "a"},
+            {"content": "Baking bread", "source": "b"},
+            {"content": "Link building", "source": "c"},
+        ])
+        contexts = await engine._retrieve_relevant_context("seo", None, max_context=2)
+
+        assert count == 3
+        assert engine._openai_client.embeddings.create.await_count == 2
+        assert [c.source for c in contexts] == ["a", "c"]
+        assert contexts[0].relevance_score > contexts[1].relevance_score
+        assert all(0 <= c.relevance_score <= 1 for c in contexts)
+
+    @pytest.mark.asyncio
+    async def test_large_inputs_are_split_into_concurrent_requests(self, monkeypatch):
+        """Test embeddings over the batch limit are split and returned in input order."""
+        from app.rag import engine as engine_module
+
+        monkeypatch.setattr(engine_module, "EMBEDDING_BATCH_SIZE", 2)
+        texts = ["ccc", "a", "bbbb", "dd", "e"]
+        engine = self._engine({text: [float(len(text)), float(i)] for i, text in enumerate(texts)})
+
+        embeddings = await engine._embed(texts)
+
+        assert engine._openai_client.embeddings.create.await_count == 3
+        assert embeddings.tolist() == [[len(text), i] for i, text in enumerate(texts)]
+
+    @pytest.mark.asyncio
+    async def test_embeddings_share_openai_limiter(self):
+        """Test embeddings requests take a slot of the shared OpenAI limiter."""
+        from unittest.mock import patch
+
+        from app.llm_gateway.limits import get_limiter
+
+        engine = self._engine({"a": [1.0, 0.0]})
+        create = engine._openai_client.embeddings.create.side_effect
+        in_flight = []
+
+        async def create_in_slot(model, input):
+            in_flight.append(get_limiter("openai").in_flight)
+            return await create(model, input)
+
+        engine._openai_client.embeddings.create.side_effect = create_in_slot
+        with patch("app.llm_gateway.limits._limiters", {}):
+            await engine._embed(["a"])
+            assert get_limiter("openai").in_flight == 0
+
+        assert in_flight == [1]
+
+    @pytest.mark.asyncio
+    async def test_enrich_context_cache(self):
+        """Test repeated and near-identical queries reuse earlier retrieval."""
+        from unittest.mock import AsyncMock
+
+        engine = self._engine({
+            "SEO basics": [1.0, 0.0],
+            "Baking bread": [0.0, 1.0],
+            "seo tips": [1.0, 0.05],
+            "seo tip": [1.0, 0.06],
+            "bread": [0.1, 1.0],
+        })
+        await engine.index_batch([
+            {"content": "SEO basics", "source": "a"},
+            {"content": "Baking bread", "source": "b"},
+        ])
+        engine._retrieve_relevant_context = AsyncMock(
+            wraps=engine._retrieve_relevant_context
+        )
+
+        first = await engine.enrich_context("seo tips", max_context=1)
+        repeat = await engine.enrich_context(" SEO tips ", max_context=1)
+        similar = await engine.enrich_context("seo tip", max_context=1)
+        other = await engine.enrich_context("bread", max_context=1)
+
+        same = await engine.enrich_context("seo tips", max_context=1)
+
+        assert same is first
+        assert repeat.original_prompt == " SEO tips "
+        assert "\n\n SEO tips \n\n" in repeat.enriched_prompt
+        assert repeat.context_snippets == first.context_snippets
+        assert similar.original_prompt == "seo tip"
+        assert similar.context_snippets == first.context_snippets
+        assert other.context_snippets[0].source == "b"
+        assert engine._retrieve_relevant_context.await_count == 2
+        stats = engine.cache_stats()["query"]
+        assert (stats["exact_hits"], stats["semantic_hits"], stats["misses"]) == (2, 1, 2)
+
+        await engine.index_batch([{"content": "SEO basics", "source": "c"}])
+        await engine.enrich_context("seo tips", max_context=1)
+        assert engine._retrieve_relevant_context.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_embeddings_are_cached(self):
+        """Test repeated texts are embedded once, across and within calls."""
+        engine = self._engine({"a": [1.0, 0.0], "b": [0.0, 1.0], "c": [1.0, 1.0]})
+
+        first = await engine._embed_with_cache(["a", "b"])
+        second = await engine._embed_with_cache(["b", "c", "c", "a"])
+
+        create = engine._openai_client.embeddings.create
+        assert create.await_count == 2
+        assert create.await_args.kwargs["input"] == ["c"]
+        assert first.tolist() == [[1.0, 0.0], [0.0, 1.0]]
+        assert second.tolist() == [[0.0, 1.0], [1.0, 1.0], [1.0, 1.0], [1.0, 0.0]]
+        stats = engine.cache_stats()["embedding"]
+        assert (stats["hits"], stats["misses"], stats["size"]) == (2, 4, 3)
+
+    def test_vector_index_top_k(self):
+        """Test the index returns the top-k in order and scores zero vectors as 0."""
+        from app.rag.vector_index import VectorIndex
+
+        index = VectorIndex()
+        index.add(
+            np.array([[0, 1], [1, 0], [1, 1], [0, 0]], dtype=np.float32),
+            [{"id": i} for i in range(4)],
+        )
+
+        hits = index.search(np.array([1.0, 0.2], dtype=np.float32), k=3)
+
+        assert [doc["id"] for doc, _ in hits] == [1, 2, 0]
+        # Stored normalized, so scores are plain dot products
+        assert np.allclose(np.linalg.norm(index._matrix, axis=1), [1, 1, 1, 0])
+        assert hits[1][1] == pytest.approx(1.2 / np.sqrt(2 * 1.04), rel=1e-5)
+        assert len(index.search(np.array([1.0, 0.0]), k=10)) == 4
+        index.clear()
+        assert index.search(np.array([1.0, 0.0]), k=3) == []
+
+    def test_vector_index_fp16(self):
+        """Test a float16 index stores half the bytes and ranks like float32."""
+        from app.rag.vector_index import VectorIndex
+
+        rng = np.random.default_rng(0)
+        embeddings = rng.standard_normal((50, 64)).astype(np.float32)
+        query = rng.standard_normal(64).astype(np.float32)
+        docs = [{"id": i} for i in range(50)]
+        full, half = VectorIndex(), VectorIndex(np.float16)
+        full.add(embeddings, docs)
+        half.add(embeddings, docs)
+
+        assert half._matrix.dtype == np.float16
+        assert half._matrix.nbytes * 2 == full._matrix.nbytes
+        full_hits, half_hits = full.search(query, k=5), half.search(query, k=5)
+        assert [doc["id"] for doc, _ in half_hits] == [doc["id"] for doc, _ in full_hits]
+        assert np.allclose(
+            [score for _, score in half_hits], [score for _, score in full_hits], atol=1e-2
+        )
+
+    def test_vector_index_int8(self):
+        """Test an int8 index stores a quarter of the bytes and scores close to float32."""
+        from app.rag.vector_index import VectorIndex
+
+        rng = np.random.default_rng(0)
+        embeddings = rng.standard_normal((50, 64)).astype(np.float32)
+        query = rng.standard_normal(64).astype(np.float32)
+        docs = [{"id": i} for i in range(50)]
+        full, quantized = VectorIndex(), VectorIndex(np.int8)
+        full.add(embeddings, docs)
+        quantized.add(embeddings, docs)
+
+        assert quantized._matrix.dtype == np.int8
+        assert quantized._matrix.nbytes * 4 == full._matrix.nbytes
+        full_scores = dict((doc["id"], score) for doc, score in full.search(query, k=50))
+        quantized_hits = quantized.search(query, k=5)
+        assert quantized_hits[0][0] == full.search(query, k=1)[0][0]
+        for doc, score in quantized_hits:
+            assert score == pytest.approx(full_scores[doc["id"]], abs=2e-2)
+
+    def test_faiss_index_round_trip(self, tmp_path):
+        """Test the FAISS index finds nearest documents and survives save/load."""
+        pytest.importorskip("faiss")
+        from app.rag.faiss_index import FaissVectorIndex
+
+        path = str(tmp_path / "rag.index")
+        rng = np.random.default_rng(0)
+        embeddings = rng.standard_normal((100, 16)).astype(np.float32)
+        index = FaissVectorIndex(path)
+        index.add(embeddings, [{"id": i} for i in range(100)])
+
+        hits = index.search(embeddings[42], k=3)
+        index.save()
+        reloaded = FaissVectorIndex(path)
+
+        assert hits[0][0] == {"id": 42}
+        assert hits[0][1] == pytest.approx(1.0, abs=1e-5)
+        assert len(reloaded) == 100
+        assert reloaded.search(embeddings[42], k=3) == hits
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["rag.index"]
+
+    def test_faiss_reader_reloads_after_writer_saves(self, tmp_path):
+        """Test a read-only FAISS index picks up the writer's saves and never writes."""
+        pytest.importorskip("faiss")
+        import os
+
+        from app.rag.faiss_index import FaissVectorIndex
+
+        path = str(tmp_path / "rag.index")
+        rng = np.random.default_rng(0)
+        embeddings = rng.standard_normal((20, 16)).astype(np.float32)
+        writer = FaissVectorIndex(path)
+        writer.add(embeddings[:10], [{"id": i} for i in range(10)])
+        writer.save()
+        reader = FaissVectorIndex(path, writer=False)
+
+        assert reader.reload_if_changed() is False
+        writer.add(embeddings[10:], [{"id": i} for i in range(10, 20)])
+        writer.save()
+        # Make the replaced file's modification time differ on coarse clocks
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+        assert reader.reload_if_changed() is True
+        assert len(reader) == 20
+
+        reader.add(embeddings[:1], [{"id": "local"}])
+        reader.save()
+        assert len(FaissVectorIndex(path)) == 20
+
+    @pytest.mark.asyncio
+    async def test_index_batch_saves_faiss_index(self, tmp_path):
+        """Test the writer persists the FAISS index after each indexed batch."""
+        pytest.importorskip("faiss")
+        from unittest.mock import AsyncMock
+
+        from app.rag.faiss_index import FaissVectorIndex
+
+        path = str(tmp_path / "rag.index")
+        engine = RAGEngine(mock_mode=True)
+        engine._mock_mode = False
+        engine._index = FaissVectorIndex(path)
+        rng = np.random.default_rng(0)
+        embeddings = rng.standard_normal((3, 16)).astype(np.float32)
+        engine._embed_with_cache = AsyncMock(return_value=embeddings)
+
+        await engine.index_batch([{"content": f"doc {i}", "source": "test"} for i in range(3)])
+
+        assert len(FaissVectorIndex(path, writer=False)) == 3
+
+    @pytest.mark.asyncio
+    async def test_reader_engine_reloads_faiss_index_in_background(self, tmp_path):
+        """Test a reader engine swaps in the writer's saves without blocking queries."""
+        pytest.importorskip("faiss")
+        import os
+
+        from app.rag.faiss_index import FaissVectorIndex
+
+        path = str(tmp_path / "rag.index")
+        rng = np.random.default_rng(0)
+        embeddings = rng.standard_normal((4, 16)).astype(np.float32)
+        writer = FaissVectorIndex(path)
+        writer.add(embeddings[:2], [{"content": "a"}, {"content": "b"}])
+        writer.save()
+        engine = RAGEngine(mock_mode=True)
+        engine._index = FaissVectorIndex(path, writer=False)
+
+        writer.add(embeddings[2:], [{"content": "c"}, {"content": "d"}])
+        writer.save()
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+        engine._refresh_index()
+
+        assert len(engine._index) == 2
+        await engine._reload_task
+        assert len(engine._index) == 4
+        assert engine._index.changed() is False
+
+    def test_hnsw_params_grow_with_index(self):
+        """Test HNSW parameters widen as the number of vectors grows."""
+        from app.rag.pgvector_store import configure_hnsw_params, to_pgvector
+
+        small = configure_hnsw_params(10_000)
+        medium = configure_hnsw_params(500_000)
+        large = configure_hnsw_params(5_000_000)
+
+        assert small == {"m": 16, "ef_construction": 64, "ef_search": 40}
+        assert small["m"] < medium["m"] < large["m"]
+        assert small["ef_search"] < medium["ef_search"] < large["ef_search"]
+        assert to_pgvector(np.array([1, 0.5])) == "[1.0,0.5]"
+
+
+class TestBufferedRAGIndexer:
+    """Tests for BufferedRAGIndexer batching."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_a_batch(self):
+        """Test concurrent index calls are flushed as one batch."""
+        import asyncio
+        from unittest.mock import patch
+
+        from app.rag import BufferedRAGIndexer
+
+        engine = RAGEngine(mock_mode=True)
+        indexer = BufferedRAGIndexer(engine, max_batch_size=10, max_wait_seconds=0.05)
+
+        with patch.object(engine, "index_batch", wraps=engine.index_batch) as index_batch:
+            results = await asyncio.gather(*(
+                indexer.index_content(content=f"Document {i}", source=f"source-{i}")
+                for i in range(5)
+            ))
+        await indexer.close()
+
+        assert results == [True] * 5
+        assert index_batch.await_count == 1
+        assert len(engine._mock_storage) == 5
+
+    @pytest.mark.asyncio
+    async def test_batch_size_limit(self):
+        """Test batches are flushed once they reach the size limit."""
+        from app.rag import BufferedRAGIndexer
+
+        engine = RAGEngine(mock_mode=True)
+        indexer = BufferedRAGIndexer(engine, max_batch_size=2, max_wait_seconds=0.05)
+        batch_sizes = []
+        original = engine.index_batch
+
+        async def recording_index_batch(documents):
+            batch_sizes.append(len(documents))
+            return await original(documents)
+
+        engine.index_batch = recording_index_batch
+        count = await indexer.index_documents(
+            [{"content": f"Snippet {i}", "source": "serp"} for i in range(5)]
+        )
+        await indexer.close()
+
+        assert count == 5
+        assert batch_sizes == [2, 2, 1]
+
+    @pytest.mark.asyncio
+    async def test_batch_failure_propagates(self):
+        """Test an indexing error is raised to every caller in the batch."""
+        from app.rag import BufferedRAGIndexer
+
+        engine = RAGEngine(mock_mode=True)
+        indexer = BufferedRAGIndexer(engine, max_wait_seconds=0.01)
+
+        async def failing_index_batch(documents):
+            raise RuntimeError("vector store down")
+
+        engine.index_batch = failing_index_batch
+        with pytest.raises(RuntimeError, match="vector store down"):
+            await indexer.index_content(content="Doc", source="src")
+        await indexer.close()
@@ -5,7 +5,7 @@ from uuid import uuid4
 
 import pytest
 
-from app.scheduler.scheduler import ContentScheduler, ScheduledJob, TrafficPattern
+from app.scheduler.scheduler import ContentScheduler, ScheduledJob
 
 
 class TestContentScheduler:
@@ -15,7 +15,7 @@ class TestContentScheduler:
         """Test scheduler initialization."""
         scheduler = ContentScheduler(mock_mode=True)
         assert scheduler.mock_mode is True
-        assert len(scheduler._scheduled_jobs) == 0
+        assert len(scheduler._jobs_by_id) == 0
 
     @pytest.mark.asyncio
     async def test_schedule_generation(self):
@@ -109,6 +109,26 @@ class TestContentScheduler:
         priorities = [job.priority for job in pending]
         assert priorities[0] == "high"
 
+    @pytest.mark.asyncio
+    async def test_get_pending_jobs_skips_cancelled_and_limits(self):
+        """Test due jobs come in time order without cancelled jobs, up to the limit."""
+        scheduler = ContentScheduler(mock_mode=True)
+        now = datetime.now(timezone.utc)
+        jobs = [
+            await scheduler.schedule_generation(
+                plan_id=uuid4(),
+                workspace_id=uuid4(),
+                scheduled_at=now - timedelta(minutes=minutes),
+            )
+            for minutes in (5, 30, 10, 20, 1)
+        ]
+
+        assert await scheduler.cancel_job(jobs[1].id) is True
+        pending = await scheduler.get_pending_jobs(limit=3)
+
+        assert pending == [jobs[3], jobs[2], jobs[0]]
+        assert len(await scheduler.get_pending_jobs()) == 4
+
     @pytest.mark.asyncio
     async def test_get_optimal_times(self):
         """Test getting optimal publishing times."""
@@ -126,6 +146,19 @@ class TestContentScheduler:
             assert "engagement_score" in time
             assert 0 <= time["engagement_score"] <= 1.0
 
+    @pytest.mark.asyncio
+    async def test_default_optimal_times_cover_each_weekday(self):
+        """Test default slots cover a week, scoring weekdays above weekends."""
+        scheduler = ContentScheduler(mock_mode=True)
+
+        times = await scheduler.get_optimal_times(workspace_id=uuid4(), days_ahead=7)
+
+        assert len(times) == 19
+        for slot in times:
+            slot_time = datetime.fromisoformat(slot["datetime"])
+            assert (slot_time.weekday(), slot_time.hour) == (slot["day_of_week"], slot["hour"])
+            assert slot["recommended"] is (slot["day_of_week"] < 5)
+
     @pytest.mark.asyncio
     async def test_update_traffic_patterns(self):
         """Test updating traffic patterns."""
@@ -144,6 +177,29 @@ class TestContentScheduler:
 
         assert count == 2
 
+    @pytest.mark.asyncio
+    async def test_update_traffic_patterns_skips_invalid(self):
+        """Test invalid patterns are skipped and the rest stored as columns."""
+        scheduler = ContentScheduler(mock_mode=True)
+        workspace_id = uuid4()
+
+        count = await scheduler.update_traffic_patterns(
+            workspace_id,
+            [
+                {"day_of_week": 3, "hour": 9, "engagement_score": 0.9},
+                {"day_of_week": 3, "hour": "noon", "engagement_score": 0.7},
+                {"day_of_week": 4, "hour": None},
+                {"day_of_week": 300, "hour": 9},
+                {"day_of_week": 2, "hour": 24},
+                {"day_of_week": -1, "hour": 9},
+            ],
+        )
+
+        stored = scheduler._traffic_patterns[str(workspace_id)]
+        assert count == 1
+        assert stored["hour"].tolist() == [9]
+        assert stored["score"].tolist() == [0.9]
+
     @pytest.mark.asyncio
     async def test_optimal_times_with_patterns(self):
         """Test optimal times calculation with traffic patterns."""
@@ -165,6 +221,23 @@ class TestContentScheduler:
         # Should include times based on patterns
         assert len(times) > 0
 
+    @pytest.mark.asyncio
+    async def test_optimal_times_top_three_hours_per_day(self):
+        """Test only each weekday's three most engaging hours are returned, best first."""
+        scheduler = ContentScheduler(mock_mode=True)
+        workspace_id = uuid4()
+        scores = {8: 0.5, 9: 0.9, 12: 0.7, 15: 0.95, 18: 0.6}
+        await scheduler.update_traffic_patterns(
+            workspace_id,
+            [{"day_of_week": 2, "hour": hour, "engagement_score": score}
+             for hour, score in scores.items()],
+        )
+
+        times = await scheduler.get_optimal_times(workspace_id=workspace_id, days_ahead=7)
+
+        assert [slot["hour"] for slot in times] == [15, 9, 12]
+        assert {slot["day_of_week"] for slot in times} == {2}
+
     @pytest.mark.asyncio
     async def test_cancel_job(self):
         """Test cancelling a job."""
@@ -185,7 +258,7 @@ class TestContentScheduler:
     def test_clear_jobs(self):
         """Test clearing all jobs."""
         scheduler = ContentScheduler(mock_mode=True)
-        scheduler._scheduled_jobs = [ScheduledJob(
+        scheduler._jobs_by_id = {"test": ScheduledJob(
             id="test",
             plan_id=uuid4(),
             workspace_id=uuid4(),
@@ -194,11 +267,13 @@ class TestContentScheduler:
             status="pending",
             created_at=datetime.now(timezone.utc),
             metadata={},
-        )]
+        )}
+        scheduler._pending_heap = [(datetime.now(timezone.utc), 1, "test")]
 
         scheduler.clear_jobs()
 
-        assert len(scheduler._scheduled_jobs) == 0
+        assert len(scheduler._jobs_by_id) == 0
+        assert scheduler._pending_heap == []
 
     def test_clear_patterns(self):
         """Test clearing traffic patterns."""
@@ -209,6 +284,80 @@ class TestContentScheduler:
 
         assert len(scheduler._traffic_patterns) == 0
 
+    @pytest.mark.asyncio
+    async def test_schedule_generation_enqueues_celery_task(self):
+        """Test due jobs are sent to Celery fire-and-forget, without an ETA."""
+        from unittest.mock import MagicMock, patch
+
+        task = MagicMock()
+        scheduler = ContentScheduler()
+        plan_id = uuid4()
+
+        with patch("app.scheduler.CELERY_AVAILABLE", True), \
+                patch("app.scheduler.generate_article_task", task):
+            job = await scheduler.schedule_generation(
+                plan_id=plan_id,
+                workspace_id=uuid4(),
+                priority="high",
+            )
+
+        task.apply_async.assert_called_once_with(
+            args=[str(plan_id)],
+            task_id=job.id,
+            priority=0,
+            ignore_result=True,
+            retry=False,
+        )
+        assert job.status == "queued"
+        assert await scheduler.get_pending_jobs() == []
+
+    @pytest.mark.asyncio
+    async def test_future_job_dispatched_when_due(self):
+        """Test future jobs are held until due instead of sent with an ETA."""
+        from unittest.mock import MagicMock, patch
+
+        task = MagicMock()
+        scheduler = ContentScheduler()
+
+        with patch("app.scheduler.CELERY_AVAILABLE", True), \
+                patch("app.scheduler.generate_article_task", task):
+            job = await scheduler.schedule_generation(
+                plan_id=uuid4(),
+                workspace_id=uuid4(),
+                scheduled_at=datetime.now(timezone.utc) + timedelta(days=3),
+            )
+            assert await scheduler.dispatch_due_jobs() == 0
+            task.apply_async.assert_not_called()
+
+            later = datetime.now(timezone.utc) + timedelta(days=3, seconds=1)
+            with patch("app.scheduler.scheduler.datetime") as clock:
+                clock.now.return_value = later
+                assert await scheduler.dispatch_due_jobs() == 1
+
+        task.apply_async.assert_called_once()
+        assert job.status == "queued"
+        assert scheduler._jobs_by_id == {}
+        assert scheduler._pending_heap == []
+
+    @pytest.mark.asyncio
+    async def test_cancel_dispatched_job_revokes_task(self):
+        """Test cancelling a job already sent to Celery revokes its task."""
+        from unittest.mock import MagicMock, patch
+
+        task = MagicMock()
+        celery = MagicMock()
+        scheduler = ContentScheduler()
+
+        with patch("app.scheduler.CELERY_AVAILABLE", True), \
+                patch("app.scheduler.generate_article_task", task), \
+                patch("app.scheduler.celery_app", celery):
+            job = await scheduler.schedule_generation(plan_id=uuid4(), workspace_id=uuid4())
+            cancelled = await scheduler.cancel_job(job.id)
+
+        assert cancelled is True
+        celery.control.revoke.assert_called_once_with(job.id)
+        assert await scheduler.cancel_job(job.id) is False
+
 
 class TestScheduledJob:
     """Tests for ScheduledJob dataclass."""
@@ -233,20 +382,93 @@ class TestScheduledJob:
         assert job.metadata == {"key": "value"}
 
 
-class TestTrafficPattern:
-    """Tests for TrafficPattern dataclass."""
+class TestSchedulerEndpoints:
+    """Tests for scheduler API endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_scheduled_job_is_listed(self, async_client, auth_headers, test_workspace_id):
+        """Test endpoints share one scheduler, so a scheduled job can be listed."""
+        from unittest.mock import patch
+
+        from app.api.v1.scheduler import get_scheduler
+        from app.scheduler.scheduler import content_scheduler
+
+        assert await get_scheduler() is content_scheduler
+
+        # Keep the job pending instead of sending it to Celery
+        with patch("app.scheduler.CELERY_AVAILABLE", False):
+            response = await async_client.post(
+                "/api/v1/scheduler/jobs",
+                json={"plan_id": str(uuid4()), "workspace_id": str(test_workspace_id)},
+                headers=auth_headers,
+            )
+        assert response.status_code == 201
+        job_id = response.json()["id"]
+
+        response = await async_client.get(
+            "/api/v1/scheduler/jobs",
+            params={"workspace_id": str(test_workspace_id)},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        assert job_id in [job["id"] for job in response.json()]
+
+        response = await async_client.delete(
+            f"/api/v1/scheduler/jobs/{job_id}", headers=auth_headers
+        )
+        assert response.status_code == 204
 
-    def test_pattern_creation(self):
-        """Test creating a traffic pattern."""
-        pattern = TrafficPattern(
-            day_of_week=0,
-            hour=9,
-            engagement_score=0.95,
-            page_views=1000,
-            avg_session_duration=120.0,
+    @pytest.mark.asyncio
+    async def test_get_optimal_times(self, async_client, auth_headers, test_workspace_id):
+        """Test optimal times are returned as a validated list."""
+        response = await async_client.get(
+            "/api/v1/scheduler/optimal-times",
+            params={"workspace_id": str(test_workspace_id), "days_ahead": 2},
+            headers=auth_headers,
         )
 
-        assert pattern.day_of_week == 0
-        assert pattern.hour == 9
-        assert pattern.engagement_score == 0.95
-        assert pattern.page_views == 1000
+        assert response.status_code == 200
+        times = response.json()
+        assert len(times) > 0
+        assert set(times[0]) == {
+            "datetime", "day_of_week", "hour", "engagement_score", "recommended"
+        }
+
+
+class TestCeleryWorkerLoop:
+    """Tests for running task coroutines on the worker's event loop."""
+
+    def test_run_async_reuses_one_loop(self):
+        """Test every task coroutine runs on the same long-lived loop."""
+        import asyncio
+
+        from app.scheduler.celery_app import get_worker_loop, run_async
+
+        async def running_loop():
+            return asyncio.get_running_loop()
+
+        first = run_async(running_loop())
+
+        assert run_async(running_loop()) is first
+        assert first is get_worker_loop()
+        assert first.is_running()
+
+    def test_run_async_propagates_errors(self):
+        """Test exceptions raised by the coroutine reach the task."""
+        from app.scheduler.celery_app import run_async
+
+        async def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            run_async(fail())
+
+    def test_broker_connections_kept_alive(self):
+        """Test broker connections are pooled and kept alive, above the task time limit."""
+        from app.scheduler.celery_app import TASK_TIME_LIMIT, celery_app
+
+        options = celery_app.conf.broker_transport_options
+
+        assert celery_app.conf.broker_pool_limit == 10
+        assert options["socket_keepalive"] is True
+        assert options["visibility_timeout"] > TASK_TIME_LIMIT
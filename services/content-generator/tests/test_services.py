@@ -63,7 +63,6 @@ class TestArticleService:
             content="Generated content",
             model="gpt-3.5-turbo",
             cost_usd=Decimal("0.05"),
-            word_count=500,
             metadata={"tokens_used": {"prompt": 100, "completion": 400}},
         )
 
@@ -71,9 +70,28 @@ class TestArticleService:
         assert article.title == "Generated Article"
         assert article.plan_id == plan_id
         assert article.cost_usd == Decimal("0.05")
-        assert article.word_count == 500
+        assert article.word_count == 2
         assert article.ai_model_used == "gpt-3.5-turbo"
 
+    @pytest.mark.asyncio
+    async def test_word_count_follows_content(
+        self, article_service: ArticleService, test_workspace_id
+    ):
+        """Test word_count is derived from content, ignoring markdown markup."""
+        pending = await article_service.create_pending(
+            workspace_id=test_workspace_id, plan_id=None, title="Pending Article"
+        )
+        assert pending.word_count is None
+
+        article = await article_service.complete_generation(
+            article_id=pending.id,
+            content="## Heading\n\nSome **bold** text ( )",
+            model="gpt-3.5-turbo",
+            cost_usd=Decimal("0.01"),
+        )
+
+        assert article.word_count == 4
+
     @pytest.mark.asyncio
     async def test_get_by_id(
         self, article_service: ArticleService, sample_article: Article
@@ -111,6 +129,48 @@ class TestArticleService:
         assert total == 3
         assert len(articles) == 3
 
+    @pytest.mark.asyncio
+    async def test_get_by_workspace_pagination_and_image_count(
+        self, article_service: ArticleService, test_workspace_id
+    ):
+        """Test one page carries the total and per-article image counts."""
+        first = await article_service.create(
+            ArticleCreate(workspace_id=test_workspace_id, title="First")
+        )
+        for i in range(2):
+            await article_service.add_image(
+                article_id=first.id,
+                filename=f"img{i}.jpg",
+                original_filename=f"img{i}.jpg",
+                content_type="image/jpeg",
+                size_bytes=10,
+                storage_path=f"articles/test/img{i}.jpg",
+            )
+        for i in range(2):
+            await article_service.create(
+                ArticleCreate(workspace_id=test_workspace_id, title=f"Other {i}")
+            )
+
+        articles, total = await article_service.get_by_workspace(
+            workspace_id=test_workspace_id, page=1, page_size=2
+        )
+        assert total == 3
+        assert len(articles) == 2
+
+        all_articles, _ = await article_service.get_by_workspace(
+            workspace_id=test_workspace_id, page=1, page_size=10
+        )
+        counts = {a.id: a.image_count for a in all_articles}
+        assert counts[first.id] == 2
+        assert sorted(counts.values()) == [0, 0, 2]
+
+        # Past the last page the total still comes back
+        articles, total = await article_service.get_by_workspace(
+            workspace_id=test_workspace_id, page=5, page_size=2
+        )
+        assert articles == []
+        assert total == 3
+
     @pytest.mark.asyncio
     async def test_get_by_workspace_with_status_filter(
         self, article_service: ArticleService, test_workspace_id
@@ -286,3 +346,91 @@ class TestArticleService:
         """Test deleting non-existent image returns False."""
         deleted = await article_service.delete_image(uuid4())
         assert deleted is False
+
+    @pytest.mark.asyncio
+    async def test_pop_image(
+        self, article_service: ArticleService, sample_article: Article
+    ):
+        """Test popping an image returns its storage path and removes it."""
+        image = await article_service.add_image(
+            article_id=sample_article.id,
+            filename="to-pop.jpg",
+            original_filename="pop-me.jpg",
+            content_type="image/jpeg",
+            size_bytes=1024,
+            storage_path="articles/test/to-pop.jpg",
+        )
+
+        storage_path = await article_service.pop_image(sample_article.id, image.id)
+        assert storage_path == "articles/test/to-pop.jpg"
+
+        images = await article_service.get_images(sample_article.id)
+        assert len(images) == 0
+
+    @pytest.mark.asyncio
+    async def test_pop_image_wrong_article(
+        self, article_service: ArticleService, sample_article: Article
+    ):
+        """Test popping an image through another article's ID is a no-op."""
+        image = await article_service.add_image(
+            article_id=sample_article.id,
+            filename="keep.jpg",
+            original_filename="keep.jpg",
+            content_type="image/jpeg",
+            size_bytes=1024,
+            storage_path="articles/test/keep.jpg",
+        )
+
+        storage_path = await article_service.pop_image(uuid4(), image.id)
+        assert storage_path is None
+
+        images = await article_service.get_images(sample_article.id)
+        assert len(images) == 1
+
+
+class TestDatabaseUrl:
+    """Tests for database URL normalization."""
+
+    def test_plain_postgres_url_uses_asyncpg(self):
+        """Test plain PostgreSQL URLs are switched to the asyncpg driver."""
+        from app.db.session import get_async_database_url
+
+        assert (
+            get_async_database_url("postgresql://u:p@db:6432/autoseo")
+            == "postgresql+asyncpg://u:p@db:6432/autoseo"
+        )
+        assert (
+            get_async_database_url("postgres://u:p@db/autoseo")
+            == "postgresql+asyncpg://u:p@db/autoseo"
+        )
+
+    def test_other_urls_unchanged(self):
+        """Test URLs with an explicit driver are left as-is."""
+        from app.db.session import get_async_database_url
+
+        for url in (
+            "postgresql+asyncpg://u:p@db/autoseo",
+            "sqlite+aiosqlite:///:memory:",
+        ):
+            assert get_async_database_url(url) == url
+
+    def test_schema_translate_map(self):
+        """Test the autoseo schema is dropped on SQLite only."""
+        from app.db.session import get_schema_translate_map
+
+        assert get_schema_translate_map("sqlite+aiosqlite:///:memory:") == {"autoseo": None}
+        assert get_schema_translate_map("postgresql+asyncpg://u:p@db/autoseo") == {
+            "autoseo": "autoseo"
+        }
+
+    @pytest.mark.asyncio
+    async def test_warm_up_pool_skips_sqlite(self):
+        """Test pool warm-up is a no-op without a PostgreSQL pool."""
+        from unittest.mock import patch
+
+        from app.db import session
+
+        with patch.object(type(session.engine), "connect") as connect:
+            await session.warm_up_pool(5)
+
+        connect.assert_not_called()